@@ -20,6 +20,7 @@ class UpdateAgentRequest(BaseModel):
     """Request body for updating an agent"""
     name: str | None = None
     role: str | None = None
+    noise_patterns: list[str] | None = None  # lines containing these are dropped on store
 
 
 class StatusUpdateRequest(BaseModel):
@@ -128,6 +129,10 @@ def update_agent(
             updates['name'] = data.name
         if data.role is not None:
             updates['role'] = data.role
+        if data.noise_patterns is not None:
+            updates['noise_patterns'] = "\n".join(
+                p.strip() for p in data.noise_patterns if p.strip()
+            )
         
         agent.update(**updates)
         
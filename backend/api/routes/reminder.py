@@ -2,16 +2,29 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, HttpUrl, EmailStr
+from typing import Literal
 import asyncio
 import hashlib
 from datetime import datetime
 from backend.models.reminder import Reminder, ReminderHistory
-from backend.utils.playwright_scraper import scrape_website, extract_text_from_html
+from backend.utils.fetch_strategy import fetch_page_async
 from backend.core.scheduler import schedule_reminder
+from backend.utils.admission import (
+    get_admission, reminder_tenant, AdmissionRejected, PRIORITY_INTERACTIVE
+)
 
 router = APIRouter()
 
 
+def _admit_or_429(tenant: str):
+    """Turn the request away early if browser work is already backed up"""
+    try:
+        get_admission().reject_if_busy(tenant)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+
+
 class CreateReminderRequest(BaseModel):
     """Request body for creating a reminder"""
     url: HttpUrl
@@ -19,6 +32,9 @@ class CreateReminderRequest(BaseModel):
     interval_hours: int = 24
     css_selector: str | None = None
     xpath: str | None = None
+    js_only: bool = False
+    ready_policy: Literal["dom_quiet", "network_idle", "selector", "fixed"] | None = None
+    ready_selector: str | None = None
 
 
 class UpdateReminderRequest(BaseModel):
@@ -28,6 +44,9 @@ class UpdateReminderRequest(BaseModel):
     interval_hours: int | None = None
     css_selector: str | None = None
     xpath: str | None = None
+    js_only: bool | None = None
+    ready_policy: Literal["dom_quiet", "network_idle", "selector", "fixed"] | None = None
+    ready_selector: str | None = None
 
 
 @router.post("/reminders/create")
@@ -44,13 +63,18 @@ async def create_reminder(data: CreateReminderRequest):
                 detail="Interval must be at least 1 hour"
             )
         
+        _admit_or_429(reminder_tenant(data))
+        
         # Create reminder
         reminder = Reminder.create(
             url=str(data.url),
             email=data.email,
             interval_hours=data.interval_hours,
             css_selector=data.css_selector,
-            xpath=data.xpath
+            xpath=data.xpath,
+            js_only=data.js_only,
+            ready_policy=data.ready_policy,
+            ready_selector=data.ready_selector
         )
         
         print(f"✅ Created reminder: {reminder.reminder_id}")
@@ -60,12 +84,16 @@ async def create_reminder(data: CreateReminderRequest):
         
         # Do initial scrape and store baseline
         try:
-            html_content = await asyncio.to_thread(scrape_website, str(data.url))
-            text = extract_text_from_html(
-                html_content,
-                css_selector=data.css_selector,
-                xpath=data.xpath
-            )
+            async with get_admission().slot_async(reminder_tenant(reminder), PRIORITY_INTERACTIVE):
+                fetched = await fetch_page_async(
+                    str(data.url),
+                    css_selector=data.css_selector,
+                    xpath=data.xpath,
+                    js_only=data.js_only,
+                    ready_policy=data.ready_policy,
+                    ready_selector=data.ready_selector
+                )
+            text = fetched["text"]
             
             if text:
                 content_hash = hashlib.sha256(text.encode()).hexdigest()
@@ -80,6 +108,8 @@ async def create_reminder(data: CreateReminderRequest):
                 
                 reminder.update(
                     last_content_hash=content_hash,
+                    etag=fetched["etag"],
+                    last_modified=fetched["last_modified"],
                     last_scraped=datetime.now().isoformat()
                 )
                 print(f"✅ Initial scrape completed, baseline saved")
@@ -186,6 +216,17 @@ def update_reminder(reminder_id: str, data: UpdateReminderRequest):
             updates['css_selector'] = data.css_selector
         if data.xpath is not None:
             updates['xpath'] = data.xpath
+        if data.js_only is not None:
+            updates['js_only'] = 1 if data.js_only else 0
+        if data.ready_policy is not None:
+            updates['ready_policy'] = data.ready_policy
+        if data.ready_selector is not None:
+            updates['ready_selector'] = data.ready_selector
+        
+        # Validators belong to the old URL/selector, force a full fetch next time
+        if any(k in updates for k in ('url', 'css_selector', 'xpath')):
+            updates['etag'] = None
+            updates['last_modified'] = None
         
         reminder.update(**updates)
         
@@ -278,11 +319,13 @@ async def trigger_reminder_now(reminder_id: str):
         if not reminder:
             raise HTTPException(status_code=404, detail="Reminder not found")
         
+        _admit_or_429(reminder_tenant(reminder))
+        
         print(f"🔄 Manual trigger for reminder: {reminder_id}")
         
         # Scrape and check for changes
         from backend.core.scheduler import scrape_and_check_reminder
-        result = await asyncio.to_thread(scrape_and_check_reminder, reminder)
+        result = await asyncio.to_thread(scrape_and_check_reminder, reminder, PRIORITY_INTERACTIVE)
         
         print(f"✅ Trigger result: {result}")
         
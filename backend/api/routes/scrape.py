@@ -2,12 +2,35 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, HttpUrl
+from typing import Literal
 import asyncio
 import hashlib
-from backend.utils.playwright_scraper import scrape_website, extract_text_from_html
-from backend.utils.multi_page_scraper import scrape_multiple_pages
-from backend.core.vector_db import store_scraped_data
+import re
+from backend.utils.fetch_strategy import fetch_page_async, get_strategy_stats
+from backend.utils.browser_pool import get_browser_pool
+from backend.utils.browser_watchdog import get_watchdog_stats
+from backend.utils.browser_cache import get_disk_cache_stats
+from backend.utils.readiness import get_readiness_stats
+from backend.utils.rate_limiter import rate_limiter
+from backend.utils.robots import robots_cache, RobotsDisallowedError
+from backend.core.vector_db import (
+    store_scraped_data, store_page_stream, clear_url_data, count_chunks
+)
+from backend.utils.near_duplicates import get_dedup_stats
+from backend.utils.boilerplate import new_boilerplate_learner
+from backend.utils.request_blocking import get_blocking_stats
+from backend.utils.api_capture import get_api_capture_stats
+from backend.utils.admission import (
+    get_admission, agent_tenant, AdmissionRejected, PRIORITY_INTERACTIVE
+)
+from backend.utils.html_cache import latest_html, cache_stats
+from backend.utils.extraction_pool import get_extraction_pool
 from backend.models.agent import Agent, ScrapeConfig
+from backend.models.crawl_job import CrawlJob, PAGE_SEPARATOR
+from backend.core.crawler import (
+    run_crawl_async, params_for_config, CrawlInProgress, DEFAULT_MAX_PAGES
+)
+from backend.core.config import CRAWL_CONCURRENCY, EMBED_BATCH_SIZE
 from datetime import datetime
 
 router = APIRouter()
@@ -19,9 +42,21 @@ class ScrapeRequest(BaseModel):
     css_selector: str | None = None
     xpath: str | None = None
     multi_page: bool = False
-    max_pages: int = 20
+    max_pages: int = DEFAULT_MAX_PAGES
+    concurrency: int = CRAWL_CONCURRENCY
     auto_scrape: bool = False
     scrape_interval_hours: int = 24
+    js_only: bool = False
+    ready_policy: Literal["dom_quiet", "network_idle", "selector", "fixed"] | None = None
+    ready_selector: str | None = None
+    crawl_mode: Literal["links", "sitemap"] = "links"
+    allow_third_party: bool = False  # opt out of tracker / third-party request blocking
+    api_pattern: str | None = None  # regex for the page's JSON API, checked without a browser later
+    # Crawl budgets; None = server default (CRAWL_MAX_*), 0 = unlimited
+    max_crawl_seconds: int | None = None
+    max_crawl_bytes: int | None = None
+    max_depth: int | None = None
+    max_page_bytes: int | None = None
 
 
 @router.post("/scrape")
@@ -29,7 +64,28 @@ async def scrape_and_store(data: ScrapeRequest):
     """
     Scrape URL(s) and store in agent's knowledge base.
     Supports single page or multi-page crawling.
+    
+    Runs under the global admission controller: queued behind other
+    browser work, or turned away with 429 + Retry-After when too much
+    is already waiting.
     """
+    agent = Agent.get_by_id(data.agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail=f"Agent not found: {data.agent_id}")
+    
+    admission = get_admission()
+    tenant = agent_tenant(agent)
+    try:
+        admission.reject_if_busy(tenant)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
+    
+    async with admission.slot_async(tenant, PRIORITY_INTERACTIVE):
+        return await _scrape_and_store(data)
+
+
+async def _scrape_and_store(data: ScrapeRequest):
     try:
         agent = Agent.get_by_id(data.agent_id)
         
@@ -40,6 +96,12 @@ async def scrape_and_store(data: ScrapeRequest):
         print(f"🔗 URL: {data.url}")
         print(f"📄 Multi-page: {data.multi_page}")
         
+        if data.api_pattern:
+            try:
+                re.compile(data.api_pattern)
+            except re.error as e:
+                raise HTTPException(status_code=400, detail=f"Invalid api_pattern: {e}")
+        
         # Check if config exists
         existing_configs = ScrapeConfig.get_by_agent(data.agent_id)
         config_exists = any(c.url == str(data.url) for c in existing_configs)
@@ -53,43 +115,88 @@ async def scrape_and_store(data: ScrapeRequest):
                 xpath=data.xpath,
                 is_primary=is_primary,
                 auto_scrape=data.auto_scrape,
-                scrape_interval_hours=data.scrape_interval_hours
+                scrape_interval_hours=data.scrape_interval_hours,
+                js_only=data.js_only,
+                ready_policy=data.ready_policy,
+                ready_selector=data.ready_selector,
+                crawl_mode=data.crawl_mode,
+                allow_third_party=data.allow_third_party,
+                api_pattern=data.api_pattern,
+                max_crawl_seconds=data.max_crawl_seconds,
+                max_crawl_bytes=data.max_crawl_bytes,
+                max_depth=data.max_depth,
+                max_page_bytes=data.max_page_bytes
             )
             print(f"💾 Created scrape config (auto: {data.auto_scrape}, interval: {data.scrape_interval_hours}h)")
         else:
             # Update existing config
             config = next(c for c in existing_configs if c.url == str(data.url))
+            if data.api_pattern != config.api_pattern:
+                # A new pattern means the captured endpoint may be the wrong one
+                config.update(api_pattern=data.api_pattern, api_url=None, api_hash=None)
             config.update(
                 auto_scrape=data.auto_scrape,
-                scrape_interval_hours=data.scrape_interval_hours
+                scrape_interval_hours=data.scrape_interval_hours,
+                js_only=1 if data.js_only else 0,
+                ready_policy=data.ready_policy,
+                ready_selector=data.ready_selector,
+                crawl_mode=data.crawl_mode,
+                allow_third_party=1 if data.allow_third_party else 0,
+                max_crawl_seconds=data.max_crawl_seconds,
+                max_crawl_bytes=data.max_crawl_bytes,
+                max_depth=data.max_depth,
+                max_page_bytes=data.max_page_bytes
             )
         
         # Scrape content
         if data.multi_page:
             # Multi-page crawling
-            print(f"🕷️ Starting multi-page crawl (max: {data.max_pages} pages)")
-            result = await asyncio.to_thread(
-                scrape_multiple_pages,
-                str(data.url),
-                data.max_pages,
-                data.css_selector,
-                data.xpath
-            )
+            print(f"🕷️ Starting multi-page crawl (max: {data.max_pages} pages, "
+                  f"concurrency: {data.concurrency}, mode: {data.crawl_mode})")
             
-            combined_text = "\n\n=== PAGE SEPARATOR ===\n\n".join([
-                f"[{p['title']}]\n{p['text']}" for p in result['pages']
-            ])
+            try:
+                result = await run_crawl_async(agent, config, data.model_dump(mode="json"))
+            except CrawlInProgress as e:
+                raise HTTPException(status_code=409, detail=str(e))
             
-            print(f"✅ Scraped {result['total_pages']} pages, {result['total_chars']:,} chars")
-        else:
-            # Single page
-            html_content = await asyncio.to_thread(scrape_website, str(data.url))
-            combined_text = extract_text_from_html(
-                html_content,
-                css_selector=data.css_selector,
-                xpath=data.xpath
-            )
-            print(f"📄 Extracted {len(combined_text)} characters")
+            if not result['total_pages']:
+                if not result['skipped_unchanged']:
+                    raise HTTPException(status_code=400, detail="No text extracted")
+                return {
+                    "message": "No pages changed since the last crawl",
+                    "agent": agent.to_dict(),
+                    "vector_db_result": None,
+                    "pages_scraped": 0,
+                    "pages_skipped_unchanged": result['skipped_unchanged'],
+                    "pages_skipped_duplicate": result['skipped_duplicates']
+                }
+            
+            print(f"✅ Scraping complete")
+            
+            return {
+                "message": "Scraping successful",
+                "agent": agent.to_dict(),
+                "vector_db_result": result['vector_db_result'],
+                "pages_scraped": result['total_pages'],
+                "pages_skipped_unchanged": result['skipped_unchanged'],
+                "pages_skipped_duplicate": result['skipped_duplicates'],
+                "embedding_chunks_saved": result['embedding_chunks_saved'],
+                "crawl_budget": result['budget']
+            }
+        
+        # Single page
+        fetched = await fetch_page_async(
+            str(data.url),
+            css_selector=data.css_selector,
+            xpath=data.xpath,
+            js_only=data.js_only,
+            ready_policy=data.ready_policy,
+            ready_selector=data.ready_selector,
+            allow_third_party=data.allow_third_party,
+            api_pattern=data.api_pattern
+        )
+        combined_text = fetched["text"]
+        print(f"📄 Extracted {len(combined_text)} characters (via {fetched['strategy']})")
         
         if not combined_text.strip():
             raise HTTPException(status_code=400, detail="No text extracted")
@@ -103,11 +210,18 @@ async def scrape_and_store(data: ScrapeRequest):
             url=str(data.url),
             text=combined_text,
             css_selector=data.css_selector,
-            xpath=data.xpath
+            xpath=data.xpath,
+            noise_patterns=agent.noise_pattern_list
         )
         
         # Update config with new hash
-        config.update(last_content_hash=content_hash)
+        api = fetched.get("api")
+        config.update(
+            last_content_hash=content_hash,
+            etag=fetched["etag"],
+            last_modified=fetched["last_modified"],
+            **({"api_url": api["url"], "api_hash": api["hash"]} if api else {})
+        )
         
         # Update agent
         agent.update(
@@ -121,11 +235,17 @@ async def scrape_and_store(data: ScrapeRequest):
             "message": "Scraping successful",
             "agent": agent.to_dict(),
             "vector_db_result": vector_result,
-            "pages_scraped": result['total_pages'] if data.multi_page else 1
+            "pages_scraped": 1,
+            "pages_skipped_unchanged": 0,
+            "pages_skipped_duplicate": 0,
+            "embedding_chunks_saved": 0,
+            "crawl_budget": None
         }
         
     except HTTPException:
         raise
+    except RobotsDisallowedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         print(f"❌ Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,7 +253,7 @@ async def scrape_and_store(data: ScrapeRequest):
 
 @router.post("/scrape/refresh/{agent_id}")
 async def refresh_agent_data(agent_id: str):
-    """Re-scrape primary URL for an agent"""
+    """Re-scrape (or re-crawl) the primary URL for an agent with its stored settings"""
     try:
         agent = Agent.get_by_id(agent_id)
         if not agent:
@@ -145,17 +265,231 @@ async def refresh_agent_data(agent_id: str):
         if not primary:
             raise HTTPException(status_code=404, detail="No scrape config found")
         
-        return await scrape_and_store(ScrapeRequest(
-            agent_id=agent_id,
-            url=primary.url,
-            css_selector=primary.css_selector,
-            xpath=primary.xpath,
-            multi_page=False,
-            auto_scrape=primary.auto_scrape,
-            scrape_interval_hours=primary.scrape_interval_hours
-        ))
+        return await scrape_and_store(ScrapeRequest(**params_for_config(primary)))
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/scrape/crawls/{agent_id}")
+def list_crawl_checkpoints(agent_id: str):
+    """Crawl checkpoints for an agent, with visited / pending progress"""
+    return {"crawls": [job.to_dict() for job in CrawlJob.get_by_agent(agent_id)]}
+
+
+@router.post("/scrape/crawls/{crawl_id}/resume")
+async def resume_crawl(crawl_id: str):
+    """Resume an interrupted crawl from its last checkpoint"""
+    job = CrawlJob.get_by_id(crawl_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Crawl not found")
+    if job.status != "running":
+        raise HTTPException(status_code=409, detail=f"Crawl is {job.status}, nothing to resume")
+    if job.is_live:
+        raise HTTPException(status_code=409, detail="Crawl is still running")
+    
+    return await scrape_and_store(ScrapeRequest(**job.params))
+
+
+@router.get("/scrape/extraction-pool")
+def extraction_pool_stats():
+    """HTML parsing pool metrics: per-task parse and queue times"""
+    return get_extraction_pool().stats()
+
+
+@router.get("/scrape/browser-pool")
+def browser_pool_stats():
+    """Browser pool metrics (launch count, wait times, per-browser load)"""
+    return get_browser_pool().stats()
+
+
+@router.get("/scrape/admission")
+def admission_stats():
+    """Browser work running / queued per tenant, waits and rejections"""
+    return get_admission().stats()
+
+
+@router.get("/scrape/browser-watchdog")
+def browser_watchdog_stats():
+    """Crawl page / context / browser recycles and peak renderer heap"""
+    return get_watchdog_stats()
+
+
+@router.get("/scrape/browser-cache")
+def browser_cache_stats():
+    """Persistent browser disk cache: hit rate and on-disk size"""
+    return get_disk_cache_stats()
+
+
+@router.get("/scrape/fetch-strategies")
+def fetch_strategy_stats():
+    """Which hosts are served over plain HTTP and which need a browser"""
+    return get_strategy_stats()
+
+
+@router.get("/scrape/readiness")
+def readiness_stats():
+    """How long rendered pages actually needed before being read, per host"""
+    return get_readiness_stats()
+
+
+@router.get("/scrape/rate-limits")
+def rate_limit_stats():
+    """Per-host politeness limits and the waiting they have imposed"""
+    return rate_limiter.stats()
+
+
+@router.get("/scrape/near-duplicates")
+def near_duplicate_stats():
+    """Near-duplicate pages skipped during crawls and the embedding work saved"""
+    return get_dedup_stats()
+
+
+@router.get("/scrape/api-capture")
+def api_capture_stats():
+    """Captured JSON APIs and scheduled checks answered without a browser"""
+    return get_api_capture_stats()
+
+
+@router.get("/scrape/request-blocking")
+def request_blocking_stats():
+    """Requests blocked in rendered pages, by reason and by domain"""
+    return get_blocking_stats()
+
+
+@router.get("/scrape/robots")
+def robots_stats():
+    """robots.txt cache metrics"""
+    return robots_cache.stats()
+
+
+def _cached_page_title(html_content: str) -> str:
+    match = re.search(r"<title[^>]*>(.*?)</title>", html_content, re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else ""
+
+
+def _rebuild_config_pages(config: ScrapeConfig):
+    """
+    Re-extract a config's pages from cached HTML as page dicts
+    ({'url', 'title', 'text'}), plus its last crawl (None for a single
+    page). Only URLs this config actually fetched are replayed; pages no
+    longer in the cache are left out.
+    """
+    job = CrawlJob.get_latest(config.config_id) if config.last_crawled else None
+    if job is None:
+        html_content = latest_html(config.url)
+        if not html_content:
+            return [], None
+        text, _ = get_extraction_pool().extract(html_content, config.css_selector, config.xpath, url=config.url)
+        if not text.strip():
+            return [], None
+        return [{"url": config.url, "title": _cached_page_title(html_content), "text": text}], None
+
+    # Multi-page config: the pages its last crawl kept
+    pages = []
+    for row in job.crawled_pages():
+        html_content = latest_html(row["url"])
+        if not html_content:
+            continue
+        text, _ = get_extraction_pool().extract(html_content, config.css_selector, config.xpath, url=row["url"])
+        if text and len(text) > 100:
+            pages.append({"url": row["url"], "title": row["title"] or _cached_page_title(html_content), "text": text})
+    return pages, job
+
+
+def _replay_config(agent: Agent, config: ScrapeConfig, pages, job):
+    """Swap one config's chunks for ones rebuilt from `pages`, in the layout a live scrape stores"""
+    clear_url_data(agent.agent_id, [page["url"] for page in pages])
+    
+    if job is None:
+        page = pages[0]
+        vector_result = store_scraped_data(
+            agent_id=agent.agent_id,
+            url=page["url"],
+            text=page["text"],
+            css_selector=config.css_selector,
+            xpath=config.xpath,
+            noise_patterns=agent.noise_pattern_list
+        )
+        content_hash = hashlib.sha256(page["text"].encode()).hexdigest()
+    else:
+        stream = pages
+        boilerplate = new_boilerplate_learner(job.start_url)
+        if boilerplate:
+            # Template counts already include these pages; strip only, don't save
+            stream = boilerplate.strip_pages(pages)
+        vector_result = store_page_stream(
+            agent_id=agent.agent_id,
+            scrape_id=job.crawl_id,
+            pages=stream,
+            css_selector=config.css_selector,
+            xpath=config.xpath,
+            batch_size=EMBED_BATCH_SIZE,
+            on_page_stored=job.mark_embedded,
+            noise_patterns=agent.noise_pattern_list
+        )
+        content_hash = hashlib.sha256(PAGE_SEPARATOR.join(
+            f"[{page['title']}]\n{page['text']}" for page in pages
+        ).encode()).hexdigest()
+    
+    config.update(last_content_hash=content_hash)
+    return vector_result
+
+
+@router.post("/scrape/replay/{agent_id}")
+async def replay_from_cache(agent_id: str):
+    """
+    Rebuild an agent's knowledge base from the raw HTML cache:
+    re-extract, re-chunk and re-embed without touching the network.
+    Configs are replaced one at a time; one without cached HTML keeps
+    its current chunks.
+    """
+    try:
+        agent = Agent.get_by_id(agent_id)
+        if not agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        
+        configs = ScrapeConfig.get_by_agent(agent_id)
+        if not configs:
+            raise HTTPException(status_code=404, detail="No scrape config found")
+        
+        results = []
+        for config in configs:
+            pages, job = await asyncio.to_thread(_rebuild_config_pages, config)
+            if not pages:
+                print(f"⏭️ No cached HTML for {config.url}, keeping its chunks")
+                continue
+            
+            vector_result = await asyncio.to_thread(_replay_config, agent, config, pages, job)
+            results.append({
+                "config_id": config.config_id,
+                "url": config.url,
+                "pages": len(pages),
+                "chunks": vector_result["chunks"]
+            })
+        
+        if not results:
+            raise HTTPException(status_code=404, detail="No cached HTML for this agent")
+        
+        print(f"♻️ Replayed {len(results)} config(s) for agent {agent.name} from cache")
+        agent.update(chunks_count=await asyncio.to_thread(count_chunks, agent_id))
+        
+        return {
+            "message": "Knowledge base rebuilt from cache",
+            "agent": agent.to_dict(),
+            "configs": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Replay error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/scrape/html-cache")
+def html_cache_stats():
+    """Raw HTML cache size and dedup figures"""
+    return cache_stats()
@@ -0,0 +1,83 @@
+# backend/benchmark_frontier.py
+"""
+Time crawl frontier bookkeeping alone (no fetching) on synthetic sites,
+against the original list-based queue.
+
+    python backend/benchmark_frontier.py
+"""
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.frontier import CrawlFrontier
+
+
+def _synthetic_links(pages: int, links_per_page: int, seed: int = 0):
+    """
+    Synthetic site: page i links to `links_per_page` random pages, half of
+    them as fragment / utm / trailing-slash variants.
+    """
+    rng = random.Random(seed)
+    variants = ["", "", "#top", "?utm_source=news", "/"]
+    return [
+        [f"https://Example.com/page/{rng.randrange(pages)}{rng.choice(variants)}"
+         for _ in range(links_per_page)]
+        for _ in range(pages)
+    ]
+
+
+def _page_id(url: str) -> int:
+    return int(url.split("/page/", 1)[1].split("?")[0].split("#")[0].rstrip("/"))
+
+
+def _crawl_with_frontier(site):
+    frontier = CrawlFrontier()
+    frontier.add("https://example.com/page/0")
+    crawled = 0
+    while frontier:
+        url, depth = frontier.pop()
+        crawled += 1
+        for link in site[_page_id(url)]:
+            frontier.add(link, depth + 1)
+    return crawled
+
+
+def _crawl_with_list(site):
+    """The original scrape_multiple_pages bookkeeping: list.pop(0) + `in` on the list"""
+    visited, to_visit = set(), ["https://example.com/page/0"]
+    while to_visit:
+        url = to_visit.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        for link in site[_page_id(url)]:
+            if link not in visited and link not in to_visit:
+                to_visit.append(link)
+    return len(visited)
+
+
+def benchmark(sizes=(5_000, 20_000, 50_000), links_per_page: int = 20, legacy_max: int = 5_000):
+    """Time frontier bookkeeping alone (no fetching) on synthetic sites"""
+    for pages in sizes:
+        site = _synthetic_links(pages, links_per_page)
+
+        started = time.perf_counter()
+        crawled = _crawl_with_frontier(site)
+        frontier_s = time.perf_counter() - started
+        line = f"{pages:>7,} pages | frontier: {crawled:,} unique in {frontier_s:6.2f}s"
+
+        if pages <= legacy_max:
+            started = time.perf_counter()
+            legacy_crawled = _crawl_with_list(site)
+            legacy_s = time.perf_counter() - started
+            line += f" | list: {legacy_crawled:,} 'unique' in {legacy_s:6.2f}s"
+        else:
+            line += " | list: skipped (quadratic)"
+
+        print(line)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,95 @@
+# backend/benchmark_parsers.py
+"""
+Compare HTML parser backends on a corpus of real pages: checks that each
+backend extracts exactly the same text and links as the original bs4
+path, and reports the speedup.
+
+    python backend/benchmark_parsers.py                 # pages from the HTML cache
+    python backend/benchmark_parsers.py pages/*.html    # or a golden corpus on disk
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.html_parsers import get_parser, SOUP_PARSER
+from backend.utils.extraction import extract_text_and_links
+
+CANDIDATES = ["lxml", "html5-parser"]
+REPEAT = 3
+CACHE_LIMIT = 500
+
+
+def load_corpus(paths):
+    """(name, html) pairs from files, or from the HTML cache if none given"""
+    if paths:
+        corpus = []
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                corpus.append((path, f.read()))
+        return corpus
+
+    from backend.models.database import get_db_connection
+    from backend.utils.html_cache import load_html
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT url, content_hash FROM html_cache_entries
+            GROUP BY content_hash ORDER BY MAX(fetched_at) DESC LIMIT ?
+        """, (CACHE_LIMIT,))
+        rows = cursor.fetchall()
+
+    corpus = []
+    for row in rows:
+        html_content = load_html(row["content_hash"])
+        if html_content:
+            corpus.append((row["url"], html_content))
+    return corpus
+
+
+def time_backend(parser, corpus):
+    """Best-of-REPEAT total seconds and the outputs of the last run"""
+    best = None
+    outputs = []
+    for _ in range(REPEAT):
+        outputs = []
+        started = time.perf_counter()
+        for _, html_content in corpus:
+            outputs.append(extract_text_and_links(html_content, parser=parser))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def run(paths):
+    corpus = load_corpus(paths)
+    if not corpus:
+        print("⚠️ No pages to benchmark")
+        return
+
+    total_mb = sum(len(html_content) for _, html_content in corpus) / 1024 ** 2
+    print(f"📄 {len(corpus)} pages, {total_mb:.1f} MB of HTML, best of {REPEAT}")
+    print("=" * 80)
+
+    baseline, expected = time_backend(SOUP_PARSER, corpus)
+    print(f"{'bs4':<14} {baseline:8.3f}s   1.00x   (reference)")
+
+    for name in CANDIDATES:
+        parser = get_parser(name)
+        if parser is SOUP_PARSER:
+            print(f"{name:<14} not installed")
+            continue
+
+        elapsed, outputs = time_backend(parser, corpus)
+        mismatches = [
+            page for (page, _), got, want in zip(corpus, outputs, expected) if got != want
+        ]
+        print(f"{name:<14} {elapsed:8.3f}s {baseline / elapsed:6.2f}x   "
+              f"{len(corpus) - len(mismatches)}/{len(corpus)} identical")
+        for page in mismatches[:10]:
+            print(f"   ❌ {page}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -14,3 +14,111 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SUBSCRIBERS = {}      
 SUBSCRIBED_SITES = set()  # dynamic set of sites
 FRONTEND_BASE_URL = "http://127.0.0.1:5173"
+
+
+# Browser pool (backend/utils/browser_pool.py)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+BROWSER_POOL_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_POOL_CONTEXTS_PER_BROWSER", 4))
+BROWSER_POOL_MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", 100))
+
+# Admission control for browser work (backend/utils/admission.py)
+ADMISSION_MAX_ACTIVE = int(os.getenv(
+    "ADMISSION_MAX_ACTIVE", BROWSER_POOL_SIZE * BROWSER_POOL_CONTEXTS_PER_BROWSER
+))
+ADMISSION_TENANT_MAX_ACTIVE = int(os.getenv("ADMISSION_TENANT_MAX_ACTIVE", 2))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 20))  # beyond this, API routes return 429
+ADMISSION_TENANT_MAX_QUEUE = int(os.getenv("ADMISSION_TENANT_MAX_QUEUE", 5))
+ADMISSION_POLICY = os.getenv("ADMISSION_POLICY", "priority").lower()  # "priority" or "fifo"
+
+# Page recycling during crawls (backend/utils/browser_watchdog.py)
+WATCHDOG_MAX_HEAP_MB = float(os.getenv("WATCHDOG_MAX_HEAP_MB", 512))
+WATCHDOG_PAGE_MAX_NAVIGATIONS = int(os.getenv("WATCHDOG_PAGE_MAX_NAVIGATIONS", 100))
+WATCHDOG_CONTEXT_MAX_NAVIGATIONS = int(os.getenv("WATCHDOG_CONTEXT_MAX_NAVIGATIONS", 1000))
+
+# Persistent browser disk cache (backend/utils/browser_cache.py)
+# Off by default: each pooled browser then keeps one profile on disk, so
+# scrapes on the same browser share cookies until it goes idle
+BROWSER_DISK_CACHE_ENABLED = os.getenv("BROWSER_DISK_CACHE_ENABLED", "false").lower() == "true"
+BROWSER_DISK_CACHE_DIR = os.getenv("BROWSER_DISK_CACHE_DIR", "E:/web_scraper/data/browser_cache")
+BROWSER_DISK_CACHE_MAX_BYTES = int(os.getenv("BROWSER_DISK_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+
+# Multi-page crawler (backend/utils/multi_page_scraper.py)
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", 4))
+
+# Default crawl budgets (backend/utils/crawl_budget.py), 0 = unlimited
+CRAWL_MAX_SECONDS = int(os.getenv("CRAWL_MAX_SECONDS", 30 * 60))
+CRAWL_MAX_BYTES = int(os.getenv("CRAWL_MAX_BYTES", 0))  # document bytes over the whole crawl
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", 0))  # link hops from the start URL
+CRAWL_MAX_PAGE_BYTES = int(os.getenv("CRAWL_MAX_PAGE_BYTES", 10 * 1024 ** 2))
+
+# HTTP-first fetch tier (backend/utils/fetch_strategy.py)
+HTTP_FETCH_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", 20))
+HTTP_MIN_TEXT_CHARS = int(os.getenv("HTTP_MIN_TEXT_CHARS", 200))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Page readiness (backend/utils/readiness.py)
+READINESS_DEFAULT_POLICY = os.getenv("READINESS_DEFAULT_POLICY", "dom_quiet")
+READINESS_TIMEOUT_MS = int(os.getenv("READINESS_TIMEOUT_MS", 10000))
+READINESS_QUIET_MS = int(os.getenv("READINESS_QUIET_MS", 50))
+READINESS_FIXED_MS = int(os.getenv("READINESS_FIXED_MS", 2000))
+
+# Per-host politeness (backend/utils/rate_limiter.py)
+# HOST_RATE_LIMITS overrides the default per host, e.g. "example.com=0.5,docs.site=4"
+HOST_RATE_LIMIT_RPS = float(os.getenv("HOST_RATE_LIMIT_RPS", 2))
+HOST_RATE_LIMIT_BURST = int(os.getenv("HOST_RATE_LIMIT_BURST", 2))
+HOST_RATE_LIMITS = os.getenv("HOST_RATE_LIMITS", "")
+
+# Sitemap crawl mode (backend/utils/sitemap.py)
+SITEMAP_MAX_DEPTH = int(os.getenv("SITEMAP_MAX_DEPTH", 2))
+
+# robots.txt (backend/utils/robots.py)
+ROBOTS_ENABLED = os.getenv("ROBOTS_ENABLED", "true").lower() == "true"
+ROBOTS_CACHE_TTL = int(os.getenv("ROBOTS_CACHE_TTL", 3600))
+ROBOTS_ERROR_TTL = int(os.getenv("ROBOTS_ERROR_TTL", 300))
+ROBOTS_USER_AGENT = os.getenv("ROBOTS_USER_AGENT", "WebScraperAI")
+
+# Raw HTML cache (backend/utils/html_cache.py)
+HTML_CACHE_ENABLED = os.getenv("HTML_CACHE_ENABLED", "true").lower() == "true"
+HTML_CACHE_DIR = os.getenv("HTML_CACHE_DIR", "E:/web_scraper/data/html_cache")
+HTML_CACHE_MAX_BYTES = int(os.getenv("HTML_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+# Streaming crawl -> embedding pipeline (backend/core/crawler.py)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 8))  # pages waiting to be embedded
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 64))  # chunks per embedding call
+
+# HTML extraction process pool (backend/utils/extraction_pool.py)
+# 0 = one worker per CPU core; -1 = extract in-process (threads only)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", 0))
+
+# HTML parser backend for text extraction (backend/utils/html_parsers.py)
+# "bs4" (original html.parser path, default), "lxml" or "html5-parser".
+# The faster backends build different trees from malformed markup, so run
+# backend/benchmark_parsers.py on your pages before switching
+HTML_PARSER = os.getenv("HTML_PARSER", "bs4")
+
+# Where crawled pages are extracted (backend/utils/browser_extraction.py)
+# "python": serialize the DOM and parse it in the extraction pool (default)
+# "browser": run extraction in the page and transfer only text and links;
+# the raw HTML of crawled pages is then not written to the HTML cache
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "python").lower()
+
+# Near-duplicate pages during crawls (backend/utils/near_duplicates.py)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+SIMHASH_MAX_DISTANCE = int(os.getenv("SIMHASH_MAX_DISTANCE", 3))  # differing bits out of 64
+
+# Site-wide boilerplate learning (backend/utils/boilerplate.py)
+BOILERPLATE_ENABLED = os.getenv("BOILERPLATE_ENABLED", "true").lower() == "true"
+BOILERPLATE_MIN_PAGES = int(os.getenv("BOILERPLATE_MIN_PAGES", 5))  # pages before a template is trusted
+BOILERPLATE_MIN_RATIO = float(os.getenv("BOILERPLATE_MIN_RATIO", 0.6))  # share of pages a line must be on
+BOILERPLATE_MAX_LINES = int(os.getenv("BOILERPLATE_MAX_LINES", 500))  # lines kept per host
+
+# Playwright request blocking (backend/utils/request_blocking.py)
+# "blocklist" = known trackers / ads / widgets, "scripts" = also every
+# third-party script and XHR, "all" = every third-party request
+THIRD_PARTY_POLICY = os.getenv("THIRD_PARTY_POLICY", "blocklist")
+REQUEST_BLOCKLIST = os.getenv("REQUEST_BLOCKLIST", "")  # extra domains, comma-separated
+THIRD_PARTY_ALLOWLIST = os.getenv("THIRD_PARTY_ALLOWLIST", "")  # domains never blocked as third party
@@ -0,0 +1,289 @@
+# backend/core/crawler.py
+
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from backend.core.config import CRAWL_CONCURRENCY, PIPELINE_QUEUE_SIZE, EMBED_BATCH_SIZE
+from backend.core.vector_db import store_page_stream
+from backend.models.agent import Agent, ScrapeConfig
+from backend.models.crawl_job import CrawlJob
+from backend.utils.boilerplate import new_boilerplate_learner
+from backend.utils.crawl_budget import CrawlBudget
+from backend.utils.multi_page_scraper import scrape_multiple_pages, scrape_multiple_pages_async
+from backend.utils.near_duplicates import new_duplicate_filter
+from backend.utils.pipeline import BoundedStream
+
+DEFAULT_MAX_PAGES = 20
+
+# Crawl settings that change what a crawl fetches; a checkpoint is only
+# resumed when they match
+CRAWL_CHECKPOINT_FIELDS = ("max_pages", "css_selector", "xpath", "crawl_mode",
+                           "ready_policy", "ready_selector", "max_depth")
+
+
+class CrawlInProgress(Exception):
+    """The config's crawl is still being driven by another request"""
+
+
+def is_crawl_config(config: ScrapeConfig) -> bool:
+    """Whether a config is scraped as a multi-page crawl"""
+    return bool(config.last_crawled) or config.crawl_mode == "sitemap"
+
+
+def params_for_config(config: ScrapeConfig) -> dict:
+    """
+    The scrape settings (ScrapeRequest fields) that scrape a stored config
+    again the way it was set up: crawl configs re-crawl with their last
+    crawl's page limit and concurrency, mode and budgets.
+    """
+    params = {
+        "agent_id": config.agent_id,
+        "url": config.url,
+        "css_selector": config.css_selector,
+        "xpath": config.xpath,
+        "auto_scrape": bool(config.auto_scrape),
+        "scrape_interval_hours": config.scrape_interval_hours,
+        "js_only": bool(config.js_only),
+        "ready_policy": config.ready_policy,
+        "ready_selector": config.ready_selector,
+        "crawl_mode": config.crawl_mode or "links",
+        "allow_third_party": bool(config.allow_third_party),
+        "api_pattern": config.api_pattern,
+        "max_crawl_seconds": config.max_crawl_seconds,
+        "max_crawl_bytes": config.max_crawl_bytes,
+        "max_depth": config.max_depth,
+        "max_page_bytes": config.max_page_bytes,
+    }
+
+    if is_crawl_config(config):
+        last_crawl = CrawlJob.get_latest(config.config_id)
+        last_params = last_crawl.params if last_crawl else {}
+        params.update(
+            multi_page=True,
+            max_pages=last_params.get("max_pages") or DEFAULT_MAX_PAGES,
+            concurrency=last_params.get("concurrency") or CRAWL_CONCURRENCY
+        )
+
+    return params
+
+
+def checkpoint_for(config: ScrapeConfig, params: dict) -> CrawlJob:
+    """
+    Resume the config's interrupted crawl if it matches `params`, else
+    start one. The returned job is claimed by the caller, who releases it
+    when the crawl stops. Raises CrawlInProgress if another request is
+    still driving the config's crawl.
+    """
+    job = CrawlJob.get_resumable(config.config_id)
+    if job:
+        if not job.claim():
+            raise CrawlInProgress(f"Crawl {job.crawl_id} of this URL is still running")
+        if all(job.params.get(k) == params.get(k) for k in CRAWL_CHECKPOINT_FIELDS):
+            return job
+        print(f"🗑️ Discarding checkpoint {job.crawl_id}, crawl settings changed")
+        job.update(status="abandoned")
+        job.release()
+
+    job = CrawlJob.create(config.config_id, params["agent_id"], str(params["url"]), params)
+    job.claim()
+    return job
+
+
+def _embed_crawl_stream(job: CrawlJob, page_stream: BoundedStream,
+                        css_selector: str = None, xpath: str = None,
+                        noise_patterns=None, duplicate_filter=None):
+    """
+    Consumer side of the crawl pipeline: strip the host's boilerplate ->
+    chunk -> embed -> upsert pages as the crawl streams them in, then pick
+    up checkpointed pages from an earlier, interrupted run that were never
+    embedded. Each page is marked in the checkpoint, and its near-duplicate
+    fingerprint saved, once stored. Returns the vector result for the crawl.
+    """
+    boilerplate = new_boilerplate_learner(job.start_url)
+    streamed = set()
+
+    def page_stored(url, chunks):
+        job.mark_embedded(url, chunks)
+        if duplicate_filter is not None:
+            duplicate_filter.page_stored(url)
+
+    def live_pages():
+        for page in page_stream:
+            streamed.add(page["url"])
+            yield page
+
+    def store(pages):
+        return store_page_stream(
+            agent_id=job.agent_id,
+            scrape_id=job.crawl_id,
+            pages=boilerplate.strip_pages(pages) if boilerplate else pages,
+            css_selector=css_selector,
+            xpath=xpath,
+            batch_size=EMBED_BATCH_SIZE,
+            on_page_stored=page_stored,
+            noise_patterns=noise_patterns
+        )
+
+    try:
+        result = store(live_pages())
+    except Exception:
+        page_stream.drain()
+        raise
+
+    # Only query leftovers once the live pages' last batch is flushed and
+    # marked, or that batch would come back from the query and be embedded twice
+    leftovers = (row for row in job.pages_to_embed() if row["url"] not in streamed)
+    first = next(leftovers, None)
+    if first is not None:
+        resumed = store(itertools.chain([first], leftovers))
+        for key in ("pages", "chunks", "chars"):
+            result[key] += resumed[key]
+
+    if boilerplate:
+        boilerplate.save()
+
+    totals = job.totals()
+    return {
+        **result,
+        "url": job.start_url,
+        "pages_embedded": result["pages"],
+        "chunks": totals["chunks"],
+        "chars": totals["chars"],
+        "queue": page_stream.stats(),
+        "boilerplate": boilerplate.stats() if boilerplate else None
+    }
+
+
+def _crawl_args(config: ScrapeConfig, params: dict, crawl_job: CrawlJob,
+                page_stream: BoundedStream, duplicate_filter) -> dict:
+    # Sitemap mode only re-crawls pages modified since the last crawl
+    since = None
+    if params["crawl_mode"] == "sitemap" and config.last_crawled:
+        since = datetime.fromisoformat(config.last_crawled)
+
+    return {
+        "start_url": str(params["url"]),
+        "max_pages": params["max_pages"],
+        "css_selector": params["css_selector"],
+        "xpath": params["xpath"],
+        "concurrency": params["concurrency"],
+        "ready_policy": params["ready_policy"],
+        "ready_selector": params["ready_selector"],
+        "crawl_mode": params["crawl_mode"],
+        "since": since,
+        "crawl_job": crawl_job,
+        "page_sink": page_stream,
+        "duplicate_filter": duplicate_filter,
+        "allow_third_party": params["allow_third_party"],
+        "budget": CrawlBudget(params["max_crawl_seconds"], params["max_crawl_bytes"],
+                              params["max_depth"], params["max_page_bytes"])
+    }
+
+
+def _finish_crawl(agent: Agent, config: ScrapeConfig, crawl_job: CrawlJob,
+                  crawl_started: datetime, result: dict, vector_result: dict) -> dict:
+    """
+    Close the checkpoint and record the crawl on its config and agent.
+    A crawl that extracted nothing leaves them as they were, except that
+    a sitemap crawl with only unchanged pages still counts as crawled.
+    """
+    crawl_job.update(status="completed")
+
+    if not result['total_pages']:
+        if result['skipped_unchanged']:
+            config.update(last_crawled=crawl_started.isoformat())
+        return {**result, "vector_db_result": None, "content_hash": None}
+
+    print(f"✅ Scraped {result['total_pages']} pages, {result['total_chars']:,} chars")
+    if result['skipped_duplicates']:
+        print(f"♊ Skipped {result['skipped_duplicates']} near-duplicate pages "
+              f"(~{result['embedding_chunks_saved']} chunks not embedded)")
+    if result['budget']['stopped_by']:
+        print(f"⏹️ Partial crawl: {result['budget']['stopped_by']} budget reached")
+
+    # Validators only describe a single page
+    content_hash = crawl_job.content_hash()
+    config.update(
+        last_content_hash=content_hash,
+        etag=None,
+        last_modified=None,
+        last_crawled=crawl_started.isoformat()
+    )
+    agent.update(
+        chunks_count=vector_result["chunks"],
+        last_scraped=datetime.now().isoformat()
+    )
+    return {**result, "vector_db_result": vector_result, "content_hash": content_hash}
+
+
+def run_crawl(agent: Agent, config: ScrapeConfig, params: dict) -> dict:
+    """
+    Crawl a config with `params` (ScrapeRequest fields, see
+    params_for_config) through the checkpoint / embed pipeline: fetch ->
+    extract run in the crawl, chunk -> embed -> upsert run concurrently on
+    a worker thread, fed through a bounded stream. Interrupted crawls
+    resume from their checkpoint. The caller holds the admission slot.
+
+    Returns the scrape_multiple_pages result plus 'vector_db_result' and
+    'content_hash' (both None when no page had text). Raises
+    CrawlInProgress when the config's crawl is already running.
+    """
+    crawl_job = checkpoint_for(config, params)
+    try:
+        crawl_started = datetime.now()
+        duplicate_filter = new_duplicate_filter(agent.agent_id)
+        page_stream = BoundedStream(PIPELINE_QUEUE_SIZE)
+
+        with ThreadPoolExecutor(max_workers=1) as embed_thread:
+            embedder = embed_thread.submit(
+                _embed_crawl_stream, crawl_job, page_stream, params["css_selector"],
+                params["xpath"], agent.noise_pattern_list, duplicate_filter
+            )
+            try:
+                result = scrape_multiple_pages(
+                    **_crawl_args(config, params, crawl_job, page_stream, duplicate_filter)
+                )
+            except Exception:
+                # Leaving the block lets the embedder finish the pages it
+                # already has (they stay checkpointed) before the error is raised
+                page_stream.close()
+                raise
+            page_stream.close()
+            vector_result = embedder.result()
+
+        return _finish_crawl(agent, config, crawl_job, crawl_started, result, vector_result)
+    finally:
+        crawl_job.release()
+
+
+async def run_crawl_async(agent: Agent, config: ScrapeConfig, params: dict) -> dict:
+    """Async version of run_crawl, same result"""
+    crawl_job = checkpoint_for(config, params)
+    try:
+        crawl_started = datetime.now()
+        duplicate_filter = await asyncio.to_thread(new_duplicate_filter, agent.agent_id)
+        page_stream = BoundedStream(PIPELINE_QUEUE_SIZE)
+
+        embedder = asyncio.ensure_future(asyncio.to_thread(
+            _embed_crawl_stream, crawl_job, page_stream, params["css_selector"],
+            params["xpath"], agent.noise_pattern_list, duplicate_filter
+        ))
+        try:
+            result = await scrape_multiple_pages_async(
+                **_crawl_args(config, params, crawl_job, page_stream, duplicate_filter)
+            )
+        except Exception:
+            # Let the embedder finish the pages it already has (they stay
+            # checkpointed) before reporting the crawl error
+            await asyncio.to_thread(page_stream.close)
+            await asyncio.gather(embedder, return_exceptions=True)
+            raise
+        await asyncio.to_thread(page_stream.close)
+        vector_result = await embedder
+
+        return await asyncio.to_thread(
+            _finish_crawl, agent, config, crawl_job, crawl_started, result, vector_result
+        )
+    finally:
+        crawl_job.release()
@@ -5,8 +5,14 @@ from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 import hashlib
 from backend.models.agent import Agent, ScrapeConfig, ChangeHistory
-from backend.utils.playwright_scraper import scrape_website, extract_text_from_html
-from backend.core.vector_db import store_scraped_data
+from backend.utils.fetch_strategy import fetch_page
+from backend.utils.api_capture import fetch_api_hash, record_unchanged
+from backend.utils.admission import (
+    get_admission, agent_tenant, reminder_tenant, PRIORITY_SCHEDULED
+)
+from backend.core.vector_db import store_scraped_data, get_agent_collection
+from backend.core.crawler import is_crawl_config, params_for_config, run_crawl
+from backend.models.crawl_job import CrawlJob, PAGE_SEPARATOR
 from backend.utils.email_sender import send_change_notification
 from backend.core.llm_service import run_llm
 from backend.models.agent import Subscription
@@ -32,13 +38,53 @@ def scrape_and_check_changes(config: ScrapeConfig):
             print(f"⚠️ Agent inactive or not found, skipping")
             return
         
-        # Scrape the URL
-        html_content = scrape_website(config.url)
-        new_text = extract_text_from_html(
-            html_content,
-            css_selector=config.css_selector,
-            xpath=config.xpath
-        )
+        if is_crawl_config(config):
+            crawl_and_check_changes(config, agent)
+            return
+        
+        # Captured JSON API: if it still returns the same document, the
+        # page has nothing new either and no browser is needed
+        api_hash = fetch_api_hash(config.api_url) if config.api_url else None
+        if api_hash and api_hash == config.api_hash:
+            print(f"✓ API response unchanged, skipping render")
+            record_unchanged()
+            agent.update(last_scraped=datetime.now().isoformat())
+            return
+        
+        # Fetch the URL (plain HTTP first, browser only if needed),
+        # queued with all other browser work
+        with get_admission().slot(agent_tenant(agent), PRIORITY_SCHEDULED):
+            fetched = fetch_page(
+                config.url,
+                css_selector=config.css_selector,
+                xpath=config.xpath,
+                js_only=bool(config.js_only),
+                etag=config.etag,
+                last_modified=config.last_modified,
+                ready_policy=config.ready_policy,
+                ready_selector=config.ready_selector,
+                allow_third_party=bool(config.allow_third_party),
+                api_pattern=config.api_pattern
+            )
+        
+        # Remember the endpoint the render captured (or the API's new hash)
+        api = fetched.get("api")
+        if api:
+            api_fields = {"api_url": api["url"], "api_hash": api["hash"]}
+        elif api_hash:
+            api_fields = {"api_hash": api_hash}
+        else:
+            api_fields = {}
+        
+        # Server says 304: nothing to render, extract or hash
+        if fetched["not_modified"]:
+            print(f"✓ Not modified (304), skipping")
+            if api_fields:
+                config.update(**api_fields)
+            agent.update(last_scraped=datetime.now().isoformat())
+            return
+        
+        new_text = fetched["text"]
         
         if not new_text.strip():
             print(f"⚠️ No content extracted")
@@ -75,41 +121,95 @@ def scrape_and_check_changes(config: ScrapeConfig):
                 url=config.url,
                 text=new_text,
                 css_selector=config.css_selector,
-                xpath=config.xpath
+                xpath=config.xpath,
+                noise_patterns=agent.noise_pattern_list
             )
             
-            # Update config with new hash
-            config.update(last_content_hash=new_hash)
+            # Update config with new hash and validators
+            config.update(
+                last_content_hash=new_hash,
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
+                **api_fields
+            )
             
             # Update agent
             agent.update(last_scraped=datetime.now().isoformat())
             
-            # Notify subscribers
-            subscribers = Subscription.get_by_agent(config.agent_id, active_only=True)
-            
-            if subscribers:
-                print(f"📧 Notifying {len(subscribers)} subscribers")
-                for sub in subscribers:
-                    try:
-                        send_change_notification(
-                            email=sub.email,
-                            agent_name=agent.name,
-                            url=config.url,
-                            change_summary=change_summary
-                        )
-                    except Exception as e:
-                        print(f"❌ Failed to send email to {sub.email}: {e}")
+            notify_subscribers(agent, config, change_summary)
             
             print(f"✅ Update complete")
         else:
             print(f"✓ No changes detected")
-            config.update(last_content_hash=new_hash)
+            config.update(
+                last_content_hash=new_hash,
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
+                **api_fields
+            )
             agent.update(last_scraped=datetime.now().isoformat())
         
     except Exception as e:
         print(f"❌ Error during scheduled scrape: {e}")
 
 
+def crawl_and_check_changes(config: ScrapeConfig, agent: Agent):
+    """
+    Re-crawl a multi-page config with its stored mode and budgets. The
+    crawl embeds what it fetched; if the crawl's combined text changed,
+    record it and notify subscribers.
+    """
+    # The job's config object is from when it was scheduled
+    config = ScrapeConfig.get_by_id(config.config_id) or config
+    old_hash = config.last_content_hash
+    old_data = get_agent_collection(config.agent_id).get(limit=1)
+    old_text = old_data['documents'][0] if old_data['documents'] else ""
+    
+    print(f"🕷️ Re-crawling ({config.crawl_mode} mode)")
+    with get_admission().slot(agent_tenant(agent), PRIORITY_SCHEDULED):
+        run_crawl(agent, config, params_for_config(config))
+    
+    config = ScrapeConfig.get_by_id(config.config_id)
+    if not old_hash or config.last_content_hash == old_hash:
+        print(f"✓ No changes detected")
+        return
+    
+    print(f"🔔 Content changed detected!")
+    last_crawl = CrawlJob.get_latest(config.config_id)
+    new_text = PAGE_SEPARATOR.join(
+        f"[{row['title']}]\n{row['text']}" for row in last_crawl.crawled_pages()
+    ) if last_crawl else ""
+    
+    change_summary = generate_change_summary(old_text[:1500], new_text[:1500])
+    ChangeHistory.create(
+        agent_id=config.agent_id,
+        config_id=config.config_id,
+        old_content=old_text,
+        new_content=new_text,
+        change_summary=change_summary
+    )
+    notify_subscribers(agent, config, change_summary)
+    print(f"✅ Update complete")
+
+
+def notify_subscribers(agent: Agent, config: ScrapeConfig, change_summary: str):
+    """Email a change summary to the agent's active subscribers"""
+    subscribers = Subscription.get_by_agent(config.agent_id, active_only=True)
+    
+    if subscribers:
+        print(f"📧 Notifying {len(subscribers)} subscribers")
+        for sub in subscribers:
+            try:
+                send_change_notification(
+                    email=sub.email,
+                    agent_name=agent.name,
+                    url=config.url,
+                    change_summary=change_summary
+                )
+            except Exception as e:
+                print(f"❌ Failed to send email to {sub.email}: {e}")
+
+
 def schedule_scrape_config(config: ScrapeConfig):
     """Schedule a scrape config for periodic execution"""
     job_id = f"scrape_{config.config_id}"
@@ -135,10 +235,12 @@ def schedule_scrape_config(config: ScrapeConfig):
 # REMINDER SCRAPING FUNCTIONS
 # ========================================
 
-def scrape_and_check_reminder(reminder):
+def scrape_and_check_reminder(reminder, priority: int = PRIORITY_SCHEDULED):
     """
     Scrape a reminder URL and check if content has changed.
     If changed, send email notification.
+    `priority` places the fetch in the admission queue (manual triggers
+    pass PRIORITY_INTERACTIVE).
     """
     from backend.models.reminder import Reminder, ReminderHistory
     
@@ -146,13 +248,27 @@ def scrape_and_check_reminder(reminder):
         print(f"\n⏰ Scheduled reminder check for {reminder.reminder_id}")
         print(f"🔗 URL: {reminder.url}")
         
-        # Scrape the URL
-        html_content = scrape_website(reminder.url)
-        new_text = extract_text_from_html(
-            html_content,
-            css_selector=reminder.css_selector,
-            xpath=reminder.xpath
-        )
+        # Fetch the URL (plain HTTP first, browser only if needed),
+        # queued with all other browser work
+        with get_admission().slot(reminder_tenant(reminder), priority):
+            fetched = fetch_page(
+                reminder.url,
+                css_selector=reminder.css_selector,
+                xpath=reminder.xpath,
+                js_only=bool(reminder.js_only),
+                etag=reminder.etag,
+                last_modified=reminder.last_modified,
+                ready_policy=reminder.ready_policy,
+                ready_selector=reminder.ready_selector
+            )
+        
+        # Server says 304: nothing to render, extract or hash
+        if fetched["not_modified"]:
+            print(f"✓ Not modified (304), skipping")
+            reminder.update(last_scraped=datetime.now().isoformat())
+            return {"status": "no_change"}
+        
+        new_text = fetched["text"]
         
         if not new_text.strip():
             print(f"⚠️ No content extracted")
@@ -180,9 +296,11 @@ def scrape_and_check_reminder(reminder):
                 change_summary=change_summary
             )
             
-            # Update reminder with new hash
+            # Update reminder with new hash and validators
             reminder.update(
                 last_content_hash=new_hash,
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
                 last_scraped=datetime.now().isoformat()
             )
             
@@ -204,6 +322,8 @@ def scrape_and_check_reminder(reminder):
             print(f"✓ No changes detected")
             reminder.update(
                 last_content_hash=new_hash,
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
                 last_scraped=datetime.now().isoformat()
             )
             return {"status": "no_change"}
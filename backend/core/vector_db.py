@@ -4,6 +4,8 @@ import uuid
 import chromadb
 from chromadb.utils import embedding_functions
 from typing import Optional
+from backend.utils.text_cleaning import noise_filter_for
+from backend.models.page_fingerprint import PageFingerprint
 
 VECTOR_DB_PATH = "E:/web_scraper/data/vectors"
 EMBEDDING_MODEL_PATH = "E:/web_scraper/backend/models/embeddings/all-MiniLM-L6-v2"
@@ -73,11 +75,16 @@ def chunk_text(text: str, chunk_size: int = 600, overlap: int = 50) -> list[str]
 
 
 def store_scraped_data(agent_id: str, url: str, text: str, 
-                       css_selector: str = None, xpath: str = None):
+                       css_selector: str = None, xpath: str = None,
+                       noise_patterns=None):
     """Store scraped data with better chunking"""
     
     collection = get_agent_collection(agent_id)
     
+    # Agent-specific noise rules on top of the default cleaning
+    if noise_patterns:
+        text = noise_filter_for(noise_patterns).clean(text)
+    
     scrape_id = str(uuid.uuid4())
     
     # Chunk text with better algorithm
@@ -125,6 +132,107 @@ def store_scraped_data(agent_id: str, url: str, text: str,
     }
 
 
+def iter_page_chunks(pages, chunk_size: int = 600, overlap: int = 50, noise_patterns=None):
+    """
+    Chunk stage: yields (page, chunk_index, total_chunks, chunk) for each
+    page dict ({'url', 'title', 'text'}), one page at a time. Pages that
+    produce no chunks are yielded once with chunk None.
+    """
+    noise_filter = noise_filter_for(noise_patterns) if noise_patterns else None
+    for page in pages:
+        text = noise_filter.clean(page["text"]) if noise_filter else page["text"]
+        chunks = chunk_text(f"[{page['title']}]\n{text}", chunk_size, overlap)
+        if not chunks:
+            yield page, 0, 0, None
+        for i, chunk in enumerate(chunks):
+            yield page, i, len(chunks), chunk
+
+
+def iter_embedded_batches(chunk_stream, batch_size: int):
+    """Embed stage: groups the chunk stream into batches and embeds each one"""
+    batch = []
+    for item in chunk_stream:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch, _embed_batch(batch)
+            batch = []
+    if batch:
+        yield batch, _embed_batch(batch)
+
+
+def _embed_batch(batch):
+    documents = [chunk for _, _, _, chunk in batch if chunk is not None]
+    return sentence_ef(documents) if documents else []
+
+
+def store_page_stream(agent_id: str, scrape_id: str, pages,
+                      css_selector: str = None, xpath: str = None,
+                      batch_size: int = 64, on_page_stored=None, noise_patterns=None):
+    """
+    Chunk, embed and upsert a stream of pages as they arrive, so memory
+    is bounded by `batch_size` rather than by the number of pages.
+
+    Chunk IDs are derived from `scrape_id` and the page URL, so storing
+    the same page twice overwrites it instead of duplicating it.
+    `on_page_stored(url, chunks)` is called once all of a page's chunks
+    are in the collection. `noise_patterns` are the agent's extra
+    cleaning rules, applied to each page before chunking.
+    """
+    collection = get_agent_collection(agent_id)
+    
+    pages_stored = 0
+    total_chunks = 0
+    total_chars = 0
+    
+    for batch, embeddings in iter_embedded_batches(
+        iter_page_chunks(pages, noise_patterns=noise_patterns), batch_size
+    ):
+        rows = [item for item in batch if item[3] is not None]
+        
+        if rows:
+            collection.upsert(
+                ids=[
+                    f"{agent_id}_{scrape_id}_{uuid.uuid5(uuid.NAMESPACE_URL, page['url']).hex}_chunk_{i}"
+                    for page, i, _, _ in rows
+                ],
+                embeddings=embeddings,
+                documents=[chunk for _, _, _, chunk in rows],
+                metadatas=[
+                    {
+                        "agent_id": agent_id,
+                        "scrape_id": scrape_id,
+                        "source_url": page["url"],
+                        "chunk_index": i,
+                        "total_chunks": total,
+                        "css_selector": css_selector if css_selector else "",
+                        "xpath": xpath if xpath else "",
+                    }
+                    for page, i, total, _ in rows
+                ]
+            )
+            total_chunks += len(rows)
+        
+        # A page is stored once its last chunk has been upserted
+        for page, i, total, _ in batch:
+            if i == max(total - 1, 0):
+                pages_stored += 1
+                total_chars += len(page["text"])
+                if on_page_stored:
+                    on_page_stored(page["url"], total)
+    
+    print(f"✅ Streamed {pages_stored} pages ({total_chunks} chunks) into agent {agent_id}")
+    
+    return {
+        "status": "stored",
+        "agent_id": agent_id,
+        "collection_name": f"agent_{agent_id}",
+        "scrape_id": scrape_id,
+        "pages": pages_stored,
+        "chunks": total_chunks,
+        "chars": total_chars,
+    }
+
+
 def query_similar(agent_id: str, text_query: str, top_k: int = 5):
     """Query with more results to ensure we don't miss content"""
     
@@ -180,7 +288,10 @@ def get_agent_stats(agent_id: str):
 
 
 def clear_agent_data(agent_id: str) -> bool:
-    """Clear all data from an agent's collection."""
+    """
+    Clear all data from an agent's collection, and the page fingerprints
+    near-duplicate detection keeps for it (they describe stored pages).
+    """
     try:
         collection = get_agent_collection(agent_id)
         
@@ -189,12 +300,32 @@ def clear_agent_data(agent_id: str) -> bool:
             collection.delete(ids=all_data["ids"])
             print(f"✅ Cleared {len(all_data['ids'])} chunks from agent {agent_id}")
         
+        PageFingerprint.delete_by_agent(agent_id)
         return True
     except Exception as e:
         print(f"❌ Error clearing agent data: {e}")
         return False
 
 
+def clear_url_data(agent_id: str, urls) -> int:
+    """Delete the chunks stored for the given source URLs. Returns the number deleted."""
+    urls = list(urls)
+    if not urls:
+        return 0
+    
+    collection = get_agent_collection(agent_id)
+    existing = collection.get(where={"source_url": {"$in": urls}})
+    if existing and existing.get("ids"):
+        collection.delete(ids=existing["ids"])
+        print(f"✅ Cleared {len(existing['ids'])} chunks of {len(urls)} URL(s) from agent {agent_id}")
+        return len(existing["ids"])
+    return 0
+
+
+def count_chunks(agent_id: str) -> int:
+    return get_agent_collection(agent_id).count()
+
+
 def list_agent_collections():
     """List all agent collections"""
     collections = client.list_collections()
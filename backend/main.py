@@ -6,6 +6,9 @@ from backend.api import api_router
 from backend.core.scheduler import start_scheduler, stop_scheduler
 from backend.models import init_database
 from backend.models.user import Session  # ✅ NEW
+from backend.models.crawl_job import CrawlJob
+from backend.utils.browser_pool import get_browser_pool, shutdown_browser_pool
+from backend.utils.extraction_pool import get_extraction_pool, shutdown_extraction_pool
 
 app = FastAPI(
     title="WebScraper AI Agent API",
@@ -44,10 +47,25 @@ def startup_event():
     if expired > 0:
         print(f"   Removed {expired} expired session(s)")
     
+    # Crawls cut off by the last shutdown resume from their checkpoint
+    # on the next request for the same config (or POST /api/scrape/crawls/{id}/resume)
+    interrupted = CrawlJob.get_all_running()
+    if interrupted:
+        print(f"♻️ {len(interrupted)} interrupted crawl(s) can be resumed:")
+        for job in interrupted:
+            print(f"   {job.crawl_id}: {job.start_url}")
+    
     # Start background scheduler
     print("\n⏰ Starting scheduler...")
     start_scheduler()
     
+    # Launch warm browsers so the first scrape doesn't pay for Chromium startup
+    print("\n🌐 Warming up browser pool...")
+    try:
+        get_browser_pool().warm_up()
+    except Exception as e:
+        print(f"⚠️ Browser pool warm-up failed, will retry on first scrape: {e}")
+    
     print("\n✅ Application started successfully!")
     print("📖 API Documentation: http://127.0.0.1:8000/docs")
     print("="*60 + "\n")
@@ -59,6 +77,8 @@ def shutdown_event():
     """Clean up on application shutdown"""
     print("\n🛑 Shutting down application...")
     stop_scheduler()
+    shutdown_browser_pool()
+    shutdown_extraction_pool()
     print("✅ Application shutdown complete\n")
 
 
@@ -99,7 +119,9 @@ def health_check():
             "scheduler": "running" if scheduler.running else "stopped",
             "scheduled_jobs": len(scheduler.get_jobs()) if scheduler.running else 0,
             "total_agents": len(agents),
-            "active_agents": len(active_agents)
+            "active_agents": len(active_agents),
+            "browser_pool": get_browser_pool().stats(),
+            "extraction_pool": get_extraction_pool().stats()
         }
     except Exception as e:
         return {
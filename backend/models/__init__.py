@@ -4,6 +4,7 @@ from backend.models.database import init_database, get_db_connection
 from backend.models.agent import Agent, ScrapeConfig, Subscription, ChangeHistory
 from backend.models.reminder import Reminder, ReminderHistory
 from backend.models.user import User, Session
+from backend.models.crawl_job import CrawlJob
 
 __all__ = [
     "init_database",
@@ -16,4 +17,5 @@ __all__ = [
     "ReminderHistory",
     "User",
     "Session",
+    "CrawlJob",
 ]
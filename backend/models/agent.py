@@ -4,6 +4,7 @@ import uuid
 from datetime import datetime
 
 from backend.models.database import get_db_connection
+from backend.models.page_fingerprint import PageFingerprint
 
 try:
     from backend.core.vector_db import delete_agent_collection
@@ -32,6 +33,7 @@ class Agent:
         updated_at=None,
         last_scraped=None,
         chunks_count=0,
+        noise_patterns=None,
     ):
         self.agent_id = agent_id
         self.user_id = user_id
@@ -42,6 +44,12 @@ class Agent:
         self.updated_at = updated_at
         self.last_scraped = last_scraped
         self.chunks_count = chunks_count
+        # Extra line-noise rules for text cleaning, one pattern per line
+        self.noise_patterns = noise_patterns
+
+    @property
+    def noise_pattern_list(self):
+        return [p for p in (self.noise_patterns or "").split("\n") if p.strip()]
 
     @staticmethod
     def create(user_id, name, role):
@@ -107,7 +115,7 @@ class Agent:
             return row["count"] if row else 0
 
     def update(self, **kwargs):
-        allowed_fields = ["name", "role", "status", "last_scraped", "chunks_count"]
+        allowed_fields = ["name", "role", "status", "last_scraped", "chunks_count", "noise_patterns"]
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
 
         if not updates:
@@ -132,6 +140,7 @@ class Agent:
     @staticmethod
     def delete_with_related(agent_id: str) -> bool:
         _safe_delete_vector_collection(agent_id)
+        PageFingerprint.delete_by_agent(agent_id)
 
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -167,6 +176,7 @@ class Agent:
             "updated_at": self.updated_at,
             "last_scraped": self.last_scraped,
             "chunks_count": self.chunks_count,
+            "noise_patterns": self.noise_pattern_list,
         }
 
     def __repr__(self):
@@ -185,7 +195,22 @@ class ScrapeConfig:
         auto_scrape=0,
         scrape_interval_hours=24,
         last_content_hash=None,
+        etag=None,
+        last_modified=None,
+        js_only=0,
+        ready_policy=None,
+        ready_selector=None,
+        crawl_mode="links",
+        last_crawled=None,
         created_at=None,
+        allow_third_party=0,
+        api_pattern=None,
+        api_url=None,
+        api_hash=None,
+        max_crawl_seconds=None,
+        max_crawl_bytes=None,
+        max_depth=None,
+        max_page_bytes=None,
     ):
         self.config_id = config_id
         self.agent_id = agent_id
@@ -196,7 +221,23 @@ class ScrapeConfig:
         self.auto_scrape = auto_scrape
         self.scrape_interval_hours = scrape_interval_hours
         self.last_content_hash = last_content_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.js_only = js_only
+        self.ready_policy = ready_policy
+        self.ready_selector = ready_selector
+        self.crawl_mode = crawl_mode
+        self.last_crawled = last_crawled
         self.created_at = created_at
+        self.allow_third_party = allow_third_party
+        self.api_pattern = api_pattern  # regex for the page's JSON API requests
+        self.api_url = api_url  # captured endpoint, checked over plain HTTP
+        self.api_hash = api_hash
+        # Crawl budgets, None = server default (see utils/crawl_budget.py)
+        self.max_crawl_seconds = max_crawl_seconds
+        self.max_crawl_bytes = max_crawl_bytes
+        self.max_depth = max_depth
+        self.max_page_bytes = max_page_bytes
 
     @staticmethod
     def create(
@@ -207,6 +248,16 @@ class ScrapeConfig:
         is_primary=True,
         auto_scrape=False,
         scrape_interval_hours=24,
+        js_only=False,
+        ready_policy=None,
+        ready_selector=None,
+        crawl_mode="links",
+        allow_third_party=False,
+        api_pattern=None,
+        max_crawl_seconds=None,
+        max_crawl_bytes=None,
+        max_depth=None,
+        max_page_bytes=None,
     ):
         config_id = str(uuid.uuid4())
 
@@ -216,8 +267,10 @@ class ScrapeConfig:
                 """
                 INSERT INTO scrape_configs
                 (config_id, agent_id, url, css_selector, xpath, is_primary,
-                 auto_scrape, scrape_interval_hours)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                 auto_scrape, scrape_interval_hours, js_only, ready_policy,
+                 ready_selector, crawl_mode, allow_third_party, api_pattern,
+                 max_crawl_seconds, max_crawl_bytes, max_depth, max_page_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     config_id,
@@ -228,6 +281,16 @@ class ScrapeConfig:
                     1 if is_primary else 0,
                     1 if auto_scrape else 0,
                     scrape_interval_hours,
+                    1 if js_only else 0,
+                    ready_policy,
+                    ready_selector,
+                    crawl_mode,
+                    1 if allow_third_party else 0,
+                    api_pattern,
+                    max_crawl_seconds,
+                    max_crawl_bytes,
+                    max_depth,
+                    max_page_bytes,
                 ),
             )
             conn.commit()
@@ -280,7 +343,22 @@ class ScrapeConfig:
             "auto_scrape",
             "scrape_interval_hours",
             "last_content_hash",
+            "etag",
+            "last_modified",
             "is_primary",
+            "js_only",
+            "ready_policy",
+            "ready_selector",
+            "crawl_mode",
+            "last_crawled",
+            "allow_third_party",
+            "api_pattern",
+            "api_url",
+            "api_hash",
+            "max_crawl_seconds",
+            "max_crawl_bytes",
+            "max_depth",
+            "max_page_bytes",
         ]
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
 
@@ -317,7 +395,21 @@ class ScrapeConfig:
             "auto_scrape": bool(self.auto_scrape),
             "scrape_interval_hours": self.scrape_interval_hours,
             "last_content_hash": self.last_content_hash,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "js_only": bool(self.js_only),
+            "ready_policy": self.ready_policy,
+            "ready_selector": self.ready_selector,
+            "crawl_mode": self.crawl_mode,
+            "last_crawled": self.last_crawled,
             "created_at": self.created_at,
+            "allow_third_party": bool(self.allow_third_party),
+            "api_pattern": self.api_pattern,
+            "api_url": self.api_url,
+            "max_crawl_seconds": self.max_crawl_seconds,
+            "max_crawl_bytes": self.max_crawl_bytes,
+            "max_depth": self.max_depth,
+            "max_page_bytes": self.max_page_bytes,
         }
 
 
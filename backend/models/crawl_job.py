@@ -0,0 +1,311 @@
+# backend/models/crawl_job.py
+
+import hashlib
+import json
+import threading
+import uuid
+from datetime import datetime
+from backend.models.database import get_db_connection
+
+PAGE_SEPARATOR = "\n\n=== PAGE SEPARATOR ===\n\n"
+
+# Crawls this process is driving right now. A 'running' checkpoint that
+# is not in here was cut off (shutdown, crash) and is safe to resume
+_live_crawls = set()
+_live_lock = threading.Lock()
+
+
+class CrawlJob:
+    """
+    Checkpoint for a multi-page crawl.
+
+    The frontier (pending pages), visited set (done / failed pages) and
+    per-page results live in crawl_pages, written as each page finishes,
+    so an interrupted crawl resumes where it stopped and already crawled
+    pages are neither fetched nor embedded again.
+    """
+
+    def __init__(self, crawl_id, config_id, agent_id, start_url, params,
+                 status="running", follow_links=1, skipped_unchanged=0,
+                 created_at=None, updated_at=None):
+        self.crawl_id = crawl_id
+        self.config_id = config_id
+        self.agent_id = agent_id
+        self.start_url = start_url
+        self.params = json.loads(params) if isinstance(params, str) else params
+        self.status = status
+        self.follow_links = follow_links
+        self.skipped_unchanged = skipped_unchanged
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @staticmethod
+    def create(config_id, agent_id, start_url, params: dict):
+        """Start a new crawl, dropping finished checkpoints of the same config"""
+        crawl_id = str(uuid.uuid4())
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM crawl_pages WHERE crawl_id IN (
+                    SELECT crawl_id FROM crawl_jobs
+                    WHERE config_id = ? AND status != 'running'
+                )
+            """, (config_id,))
+            cursor.execute(
+                "DELETE FROM crawl_jobs WHERE config_id = ? AND status != 'running'",
+                (config_id,)
+            )
+            cursor.execute("""
+                INSERT INTO crawl_jobs (crawl_id, config_id, agent_id, start_url, params)
+                VALUES (?, ?, ?, ?, ?)
+            """, (crawl_id, config_id, agent_id, start_url, json.dumps(params)))
+            conn.commit()
+
+        return CrawlJob.get_by_id(crawl_id)
+
+    @staticmethod
+    def get_by_id(crawl_id):
+        """Get crawl job by ID"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM crawl_jobs WHERE crawl_id = ?", (crawl_id,))
+            row = cursor.fetchone()
+            return CrawlJob(**dict(row)) if row else None
+
+    @staticmethod
+    def get_resumable(config_id):
+        """Most recent unfinished crawl for a config, or None"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM crawl_jobs
+                WHERE config_id = ? AND status = 'running'
+                ORDER BY created_at DESC LIMIT 1
+            """, (config_id,))
+            row = cursor.fetchone()
+            return CrawlJob(**dict(row)) if row else None
+
+    @staticmethod
+    def get_latest(config_id):
+        """Most recent crawl for a config, finished or not, or None"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM crawl_jobs
+                WHERE config_id = ?
+                ORDER BY created_at DESC LIMIT 1
+            """, (config_id,))
+            row = cursor.fetchone()
+            return CrawlJob(**dict(row)) if row else None
+
+    @staticmethod
+    def get_all_running():
+        """Crawls that were interrupted (or are still going)"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM crawl_jobs WHERE status = 'running'")
+            return [CrawlJob(**dict(row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_by_agent(agent_id):
+        """All crawl checkpoints for an agent"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM crawl_jobs WHERE agent_id = ? ORDER BY created_at DESC",
+                (agent_id,)
+            )
+            return [CrawlJob(**dict(row)) for row in cursor.fetchall()]
+
+    # ---- liveness ----
+
+    @property
+    def is_live(self):
+        """Whether a crawl in this process is still working on the checkpoint"""
+        with _live_lock:
+            return self.crawl_id in _live_crawls
+
+    def claim(self):
+        """
+        Mark the crawl as driven by the caller. False if it already is
+        being driven, in which case the caller must leave it alone.
+        """
+        with _live_lock:
+            if self.crawl_id in _live_crawls:
+                return False
+            _live_crawls.add(self.crawl_id)
+            return True
+
+    def release(self):
+        """The caller stopped driving the crawl (finished or interrupted)"""
+        with _live_lock:
+            _live_crawls.discard(self.crawl_id)
+
+    def update(self, **kwargs):
+        """Update crawl job fields"""
+        allowed_fields = ['status', 'follow_links', 'skipped_unchanged']
+        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+        updates['updated_at'] = datetime.now().isoformat()
+
+        set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
+        values = list(updates.values()) + [self.crawl_id]
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE crawl_jobs SET {set_clause} WHERE crawl_id = ?",
+                values
+            )
+            conn.commit()
+
+        for k, v in updates.items():
+            setattr(self, k, v)
+
+    # ---- frontier / visited set ----
+
+    def _insert_pending(self, cursor, entries):
+        cursor.execute(
+            "SELECT COALESCE(MAX(seq), 0) AS seq FROM crawl_pages WHERE crawl_id = ?",
+            (self.crawl_id,)
+        )
+        seq = cursor.fetchone()["seq"]
+        for url, depth in entries:
+            seq += 1
+            cursor.execute("""
+                INSERT OR IGNORE INTO crawl_pages (crawl_id, url, depth, seq)
+                VALUES (?, ?, ?, ?)
+            """, (self.crawl_id, url, depth, seq))
+
+    def queue_pages(self, entries):
+        """Persist (url, depth) frontier entries"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            self._insert_pending(cursor, entries)
+            conn.commit()
+
+    def complete_page(self, url, title=None, text=None, ready_ms=None, new_entries=()):
+        """
+        Record a crawled page and the links it added to the frontier in
+        one transaction. `text` is None for pages without usable content.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE crawl_pages
+                SET status = 'done', title = ?, text = ?, char_count = ?, ready_ms = ?
+                WHERE crawl_id = ? AND url = ?
+            """, (title, text, len(text) if text else 0, ready_ms, self.crawl_id, url))
+            self._insert_pending(cursor, new_entries)
+            conn.commit()
+
+    def fail_page(self, url):
+        """Mark a page as visited without a result"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE crawl_pages SET status = 'failed' WHERE crawl_id = ? AND url = ?",
+                (self.crawl_id, url)
+            )
+            conn.commit()
+
+    def load_state(self):
+        """
+        Returns (visited_urls, pending) where pending is the frontier as
+        (url, depth) in queue order. Empty for a fresh crawl.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT url, depth, status FROM crawl_pages
+                WHERE crawl_id = ? ORDER BY seq
+            """, (self.crawl_id,))
+            visited, pending = [], []
+            for row in cursor.fetchall():
+                if row["status"] == "pending":
+                    pending.append((row["url"], row["depth"]))
+                else:
+                    visited.append(row["url"])
+            return visited, pending
+
+    # ---- results ----
+
+    def _iter_result_rows(self, where="", batch_size=50):
+        # Batched by seq with a fresh connection each time, so callers
+        # can write to the job between rows without holding a read lock
+        last_seq = 0
+        while True:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT seq, url, title, text, chunks FROM crawl_pages
+                    WHERE crawl_id = ? AND status = 'done' AND text IS NOT NULL
+                          AND seq > ? {where}
+                    ORDER BY seq LIMIT ?
+                """, (self.crawl_id, last_seq, batch_size))
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_seq = rows[-1]["seq"]
+
+    def crawled_pages(self):
+        """Every crawled page with usable text, in crawl order"""
+        return self._iter_result_rows()
+
+    def pages_to_embed(self):
+        """Crawled pages whose chunks are not in the vector DB yet"""
+        return self._iter_result_rows("AND chunks IS NULL")
+
+    def mark_embedded(self, url, chunks):
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE crawl_pages SET chunks = ? WHERE crawl_id = ? AND url = ?",
+                (chunks, self.crawl_id, url)
+            )
+            conn.commit()
+
+    def content_hash(self):
+        """sha256 of the combined crawl text, streamed page by page"""
+        digest = hashlib.sha256()
+        for i, row in enumerate(self._iter_result_rows()):
+            if i:
+                digest.update(PAGE_SEPARATOR.encode())
+            digest.update(f"[{row['title']}]\n{row['text']}".encode())
+        return digest.hexdigest()
+
+    def totals(self):
+        """Page / character / chunk counts and visited / pending progress"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(status = 'done' AND text IS NOT NULL), 0) AS pages,
+                    COALESCE(SUM(char_count), 0) AS chars,
+                    COALESCE(SUM(chunks), 0) AS chunks,
+                    COALESCE(SUM(status != 'pending'), 0) AS visited,
+                    COALESCE(SUM(status = 'pending'), 0) AS pending
+                FROM crawl_pages WHERE crawl_id = ?
+            """, (self.crawl_id,))
+            return dict(cursor.fetchone())
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'crawl_id': self.crawl_id,
+            'config_id': self.config_id,
+            'agent_id': self.agent_id,
+            'start_url': self.start_url,
+            'params': self.params,
+            'status': self.status,
+            'live': self.is_live,
+            'follow_links': bool(self.follow_links),
+            'skipped_unchanged': self.skipped_unchanged,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            **self.totals()
+        }
+
+    def __repr__(self):
+        return f"<CrawlJob {self.crawl_id}: {self.start_url} ({self.status})>"
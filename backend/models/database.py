@@ -32,6 +32,17 @@ def get_db_connection():
 
 # backend/models/database.py
 
+def add_column_if_missing(cursor, table: str, column: str, definition: str):
+    """
+    CREATE TABLE IF NOT EXISTS never changes an existing table, so columns
+    added after the first release are patched in here on startup.
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row["name"] for row in cursor.fetchall()}
+    if column not in existing:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
 def init_database():
     
     with get_db_connection() as conn:
@@ -75,6 +86,7 @@ def init_database():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_scraped TIMESTAMP,
                 chunks_count INTEGER DEFAULT 0,
+                noise_patterns TEXT,
                 
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
             )
@@ -92,6 +104,21 @@ def init_database():
                 auto_scrape INTEGER DEFAULT 0,
                 scrape_interval_hours INTEGER DEFAULT 24,
                 last_content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                js_only INTEGER DEFAULT 0,
+                ready_policy TEXT,
+                ready_selector TEXT,
+                crawl_mode TEXT DEFAULT 'links',
+                last_crawled TIMESTAMP,
+                allow_third_party INTEGER DEFAULT 0,
+                api_pattern TEXT,
+                api_url TEXT,
+                api_hash TEXT,
+                max_crawl_seconds INTEGER,
+                max_crawl_bytes INTEGER,
+                max_depth INTEGER,
+                max_page_bytes INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 
                 FOREIGN KEY (agent_id) REFERENCES agents(agent_id) ON DELETE CASCADE
@@ -161,7 +188,12 @@ def init_database():
                 xpath TEXT,
                 is_active INTEGER DEFAULT 1,
                 last_content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
                 last_scraped TIMESTAMP,
+                js_only INTEGER DEFAULT 0,
+                ready_policy TEXT,
+                ready_selector TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -182,6 +214,109 @@ def init_database():
         """)
         
         
+        # Raw HTML cache: one row per distinct body, one entry per fetch
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_cache_blobs (
+                content_hash TEXT PRIMARY KEY,
+                raw_bytes INTEGER NOT NULL,
+                stored_bytes INTEGER NOT NULL,
+                last_used TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_cache_entries (
+                entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at TIMESTAMP NOT NULL
+            )
+        """)
+        
+        # Checkpointed multi-page crawls: job state plus one row per
+        # frontier URL (pending), crawled page (done) or failed page
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_jobs (
+                crawl_id TEXT PRIMARY KEY,
+                config_id TEXT NOT NULL,
+                agent_id TEXT NOT NULL,
+                start_url TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT DEFAULT 'running',
+                follow_links INTEGER DEFAULT 1,
+                skipped_unchanged INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                
+                FOREIGN KEY (config_id) REFERENCES scrape_configs(config_id) ON DELETE CASCADE
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                crawl_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER DEFAULT 0,
+                seq INTEGER NOT NULL,
+                status TEXT DEFAULT 'pending',
+                title TEXT,
+                text TEXT,
+                char_count INTEGER DEFAULT 0,
+                ready_ms REAL,
+                chunks INTEGER,
+                
+                PRIMARY KEY (crawl_id, url),
+                FOREIGN KEY (crawl_id) REFERENCES crawl_jobs(crawl_id) ON DELETE CASCADE
+            )
+        """)
+        
+        # SimHash of every crawled page stored per agent (near-duplicate skipping)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS page_fingerprints (
+                agent_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                simhash TEXT NOT NULL,
+                char_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                
+                PRIMARY KEY (agent_id, url),
+                FOREIGN KEY (agent_id) REFERENCES agents(agent_id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Learned boilerplate lines per host (navigation, footers, banners)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS site_templates (
+                host TEXT PRIMARY KEY,
+                line_counts TEXT NOT NULL,
+                pages INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Columns added after the original schema
+        add_column_if_missing(cursor, "scrape_configs", "js_only", "INTEGER DEFAULT 0")
+        add_column_if_missing(cursor, "reminders", "js_only", "INTEGER DEFAULT 0")
+        add_column_if_missing(cursor, "scrape_configs", "etag", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "last_modified", "TEXT")
+        add_column_if_missing(cursor, "reminders", "etag", "TEXT")
+        add_column_if_missing(cursor, "reminders", "last_modified", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "ready_policy", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "ready_selector", "TEXT")
+        add_column_if_missing(cursor, "reminders", "ready_policy", "TEXT")
+        add_column_if_missing(cursor, "reminders", "ready_selector", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "crawl_mode", "TEXT DEFAULT 'links'")
+        add_column_if_missing(cursor, "scrape_configs", "last_crawled", "TIMESTAMP")
+        add_column_if_missing(cursor, "agents", "noise_patterns", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "allow_third_party", "INTEGER DEFAULT 0")
+        add_column_if_missing(cursor, "scrape_configs", "api_pattern", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "api_url", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "api_hash", "TEXT")
+        add_column_if_missing(cursor, "scrape_configs", "max_crawl_seconds", "INTEGER")
+        add_column_if_missing(cursor, "scrape_configs", "max_crawl_bytes", "INTEGER")
+        add_column_if_missing(cursor, "scrape_configs", "max_depth", "INTEGER")
+        add_column_if_missing(cursor, "scrape_configs", "max_page_bytes", "INTEGER")
+        
         # Indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_agents_status ON agents(status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_scrape_configs_agent ON scrape_configs(agent_id)")
@@ -195,6 +330,11 @@ def init_database():
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_token ON sessions(token)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_agents_user ON agents(user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_url ON html_cache_entries(url, fetched_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_hash ON html_cache_entries(content_hash)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_blobs_used ON html_cache_blobs(last_used)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_jobs_config ON crawl_jobs(config_id, status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_pages_status ON crawl_pages(crawl_id, status, seq)")
         
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS password_resets (
@@ -0,0 +1,42 @@
+# backend/models/page_fingerprint.py
+
+from datetime import datetime
+from backend.models.database import get_db_connection
+
+
+class PageFingerprint:
+    """
+    SimHash of every page stored for an agent, so later crawls can skip
+    near-duplicates of content the agent already has.
+    """
+
+    @staticmethod
+    def get_by_agent(agent_id):
+        """[(url, simhash)] for an agent"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT url, simhash FROM page_fingerprints WHERE agent_id = ?",
+                (agent_id,)
+            )
+            return [(row["url"], int(row["simhash"], 16)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def save(agent_id, url, simhash: int, char_count: int):
+        """Record (or refresh) the fingerprint of a stored page"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO page_fingerprints
+                (agent_id, url, simhash, char_count, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (agent_id, url, f"{simhash:016x}", char_count, datetime.now().isoformat()))
+            conn.commit()
+
+    @staticmethod
+    def delete_by_agent(agent_id):
+        """Forget an agent's fingerprints, e.g. when its vectors are cleared"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM page_fingerprints WHERE agent_id = ?", (agent_id,))
+            conn.commit()
@@ -10,8 +10,9 @@ class Reminder:
     
     def __init__(self, reminder_id, url, email, interval_hours=24, 
                  css_selector=None, xpath=None, is_active=1, 
-                 last_content_hash=None, last_scraped=None, 
-                 created_at=None, updated_at=None):
+                 last_content_hash=None, etag=None, last_modified=None,
+                 last_scraped=None, js_only=0, ready_policy=None,
+                 ready_selector=None, created_at=None, updated_at=None):
         self.reminder_id = reminder_id
         self.url = url
         self.email = email
@@ -20,12 +21,18 @@ class Reminder:
         self.xpath = xpath
         self.is_active = is_active
         self.last_content_hash = last_content_hash
+        self.etag = etag
+        self.last_modified = last_modified
         self.last_scraped = last_scraped
+        self.js_only = js_only
+        self.ready_policy = ready_policy
+        self.ready_selector = ready_selector
         self.created_at = created_at
         self.updated_at = updated_at
     
     @staticmethod
-    def create(url, email, interval_hours=24, css_selector=None, xpath=None):
+    def create(url, email, interval_hours=24, css_selector=None, xpath=None,
+               js_only=False, ready_policy=None, ready_selector=None):
         """Create a new reminder"""
         reminder_id = str(uuid.uuid4())
         
@@ -33,9 +40,11 @@ class Reminder:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO reminders 
-                (reminder_id, url, email, interval_hours, css_selector, xpath)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (reminder_id, url, email, interval_hours, css_selector, xpath))
+                (reminder_id, url, email, interval_hours, css_selector, xpath, js_only,
+                 ready_policy, ready_selector)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (reminder_id, url, email, interval_hours, css_selector, xpath,
+                  1 if js_only else 0, ready_policy, ready_selector))
             conn.commit()
         
         return Reminder.get_by_id(reminder_id)
@@ -92,7 +101,9 @@ class Reminder:
     def update(self, **kwargs):
         """Update reminder fields"""
         allowed_fields = ['url', 'email', 'interval_hours', 'css_selector', 
-                         'xpath', 'is_active', 'last_content_hash', 'last_scraped']
+                         'xpath', 'is_active', 'last_content_hash', 'etag',
+                         'last_modified', 'last_scraped', 'js_only',
+                         'ready_policy', 'ready_selector']
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
         updates['updated_at'] = datetime.now().isoformat()
         
@@ -133,7 +144,12 @@ class Reminder:
             'xpath': self.xpath,
             'is_active': bool(self.is_active),
             'last_content_hash': self.last_content_hash,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
             'last_scraped': self.last_scraped,
+            'js_only': bool(self.js_only),
+            'ready_policy': self.ready_policy,
+            'ready_selector': self.ready_selector,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
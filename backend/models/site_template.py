@@ -0,0 +1,39 @@
+# backend/models/site_template.py
+
+import json
+from datetime import datetime
+from backend.models.database import get_db_connection
+
+
+class SiteTemplate:
+    """
+    Learned boilerplate for a host: how many crawled pages each repeated
+    line appeared on, out of `pages` pages seen.
+    """
+
+    def __init__(self, host, line_counts=None, pages=0, updated_at=None):
+        self.host = host
+        if isinstance(line_counts, str):
+            line_counts = json.loads(line_counts)
+        self.line_counts = line_counts or {}
+        self.pages = pages
+        self.updated_at = updated_at
+
+    @staticmethod
+    def get(host):
+        """Template for a host, or an empty one if it was never crawled"""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM site_templates WHERE host = ?", (host,))
+            row = cursor.fetchone()
+            return SiteTemplate(**dict(row)) if row else SiteTemplate(host)
+
+    def save(self):
+        self.updated_at = datetime.now().isoformat()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO site_templates (host, line_counts, pages, updated_at)
+                VALUES (?, ?, ?, ?)
+            """, (self.host, json.dumps(self.line_counts), self.pages, self.updated_at))
+            conn.commit()
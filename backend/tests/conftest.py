@@ -0,0 +1,13 @@
+# backend/tests/conftest.py
+
+import pytest
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh SQLite database for the test, with every table created"""
+    from backend.models import database
+
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "agents.db"))
+    database.init_database()
+    return database
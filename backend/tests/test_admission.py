@@ -0,0 +1,172 @@
+# backend/tests/test_admission.py
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.utils.admission import (
+    AdmissionController, AdmissionRejected, POLICY_FIFO, POLICY_PRIORITY,
+    PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED
+)
+
+
+def _controller(**limits):
+    settings = {"max_active": 1, "tenant_max_active": 1, "max_queue": 100,
+                "tenant_max_queue": 100, "policy": POLICY_FIFO, **limits}
+    return AdmissionController(**settings)
+
+
+class Queue:
+    """Enqueue tickets directly and record the order they are granted in"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.granted = []
+        self.tickets = {}
+
+    def add(self, name, tenant, priority=PRIORITY_SCHEDULED):
+        self.tickets[name] = self.controller._enqueue(
+            tenant, priority, lambda: self.granted.append(name)
+        )
+
+    def finish(self, name):
+        self.controller._release(self.tickets[name])
+
+
+def test_global_limit():
+    queue = Queue(_controller(max_active=2, tenant_max_active=5))
+    for name in "abc":
+        queue.add(name, f"tenant-{name}")
+    assert queue.granted == ["a", "b"]
+
+    queue.finish("a")
+    assert queue.granted == ["a", "b", "c"]
+
+
+def test_tenant_at_its_limit_does_not_block_the_tenants_behind_it():
+    queue = Queue(_controller(max_active=3, tenant_max_active=1))
+    queue.add("a1", "a")
+    queue.add("a2", "a")
+    queue.add("b1", "b")
+    assert queue.granted == ["a1", "b1"]
+    assert queue.controller.stats()["queued_by_tenant"] == {"a": 1}
+
+    queue.finish("a1")
+    assert queue.granted == ["a1", "b1", "a2"]
+
+
+def test_fifo_serves_in_arrival_order():
+    queue = Queue(_controller(policy=POLICY_FIFO, tenant_max_active=5))
+    queue.add("running", "x")
+    queue.add("scheduled", "x", PRIORITY_SCHEDULED)
+    queue.add("interactive", "x", PRIORITY_INTERACTIVE)
+
+    queue.finish("running")
+    assert queue.granted == ["running", "scheduled"]
+
+
+def test_priority_serves_interactive_work_first():
+    queue = Queue(_controller(policy=POLICY_PRIORITY, tenant_max_active=5))
+    queue.add("running", "x")
+    queue.add("scheduled-1", "x", PRIORITY_SCHEDULED)
+    queue.add("interactive", "x", PRIORITY_INTERACTIVE)
+    queue.add("scheduled-2", "x", PRIORITY_SCHEDULED)
+
+    for name in ("running", "interactive", "scheduled-1"):
+        queue.finish(name)
+    assert queue.granted == ["running", "interactive", "scheduled-1", "scheduled-2"]
+
+
+def test_reject_if_busy_global_queue():
+    controller = _controller(max_queue=2, tenant_max_active=5)
+    queue = Queue(controller)
+    for name in ("running", "q1", "q2"):
+        queue.add(name, name)
+
+    with pytest.raises(AdmissionRejected) as e:
+        controller.reject_if_busy("someone-else")
+    assert "2 scrapes already queued" in str(e.value)
+    assert e.value.retry_after >= 1
+    assert controller.stats()["rejected"] == 1
+
+
+def test_reject_if_busy_per_tenant_queue():
+    controller = _controller(max_active=5, tenant_max_active=1, tenant_max_queue=1)
+    queue = Queue(controller)
+    queue.add("a1", "a")
+    queue.add("a2", "a")
+
+    with pytest.raises(AdmissionRejected) as e:
+        controller.reject_if_busy("a")
+    assert "for this account" in str(e.value)
+    controller.reject_if_busy("b")
+
+
+def test_retry_after_grows_with_the_queue():
+    controller = _controller(max_queue=0)
+    with pytest.raises(AdmissionRejected) as e:
+        controller.reject_if_busy("a")
+    short = e.value.retry_after
+
+    queue = Queue(controller)
+    for i in range(5):
+        queue.add(str(i), str(i))
+    with pytest.raises(AdmissionRejected) as e:
+        controller.reject_if_busy("a")
+    assert e.value.retry_after > short
+
+
+def test_slot_blocks_until_a_slot_frees():
+    controller = _controller()
+    order = []
+
+    def scheduled_job():
+        with controller.slot("b"):
+            order.append("b")
+
+    with controller.slot("a"):
+        thread = threading.Thread(target=scheduled_job)
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        order.append("a")
+    thread.join(5)
+
+    assert order == ["a", "b"]
+    assert controller.stats()["running"] == 0
+
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    controller = _controller()
+
+    async def main():
+        async def wait():
+            async with controller.slot_async("b"):
+                pass
+
+        with controller.slot("a"):
+            waiter = asyncio.ensure_future(wait())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        assert controller.stats()["queued"] == 0
+
+    asyncio.run(main())
+
+
+def test_busy_scrape_route_answers_429(monkeypatch):
+    from backend.api.routes import scrape
+
+    controller = _controller(max_queue=0)
+    monkeypatch.setattr(scrape, "get_admission", lambda: controller)
+    monkeypatch.setattr(scrape.Agent, "get_by_id",
+                        staticmethod(lambda agent_id: SimpleNamespace(user_id="u1")))
+
+    request = scrape.ScrapeRequest(agent_id="agent-1", url="https://example.com/")
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(scrape.scrape_and_store(request))
+    assert e.value.status_code == 429
+    assert int(e.value.headers["Retry-After"]) >= 1
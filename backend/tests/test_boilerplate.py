@@ -0,0 +1,93 @@
+# backend/tests/test_boilerplate.py
+
+import pytest
+
+from backend.models.site_template import SiteTemplate
+from backend.utils import boilerplate
+from backend.utils.boilerplate import BoilerplateLearner
+
+HOST = "example.com"
+NAV = "Home | Docs | Blog"
+FOOTER = "© Example Inc."
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_MIN_PAGES", 3)
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_MIN_RATIO", 0.6)
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_MAX_LINES", 500)
+
+
+def _page(i, *template):
+    return {"url": f"https://{HOST}/{i}", "title": str(i),
+            "text": "\n".join([*template, f"Article body {i}"])}
+
+
+def test_pages_are_held_back_until_the_template_is_learned(db, limits):
+    learner = BoilerplateLearner(HOST)
+    pages = iter([_page(i, NAV, FOOTER) for i in range(4)])
+    stripped = learner.strip_pages(pages)
+
+    # The first page only comes out once MIN_PAGES pages have been seen,
+    # and then with the template already stripped
+    first = next(stripped)
+    assert learner.pages == 3
+    assert first["text"] == "Article body 0"
+    assert [page["text"] for page in stripped] == [f"Article body {i}" for i in range(1, 4)]
+
+
+def test_short_crawl_releases_held_pages_unstripped(db, limits):
+    learner = BoilerplateLearner(HOST)
+    pages = [_page(i, NAV) for i in range(2)]
+
+    assert list(learner.strip_pages(pages)) == pages
+    assert learner.stats()["template_lines"] == 0
+
+
+def test_known_host_strips_from_its_first_page(db, limits):
+    SiteTemplate(HOST, {NAV: 10}, pages=10).save()
+    learner = BoilerplateLearner(HOST)
+
+    [page] = learner.strip_pages([_page(0, NAV)])
+    assert page["text"] == "Article body 0"
+    assert learner.stats()["stripped_lines"] == 1
+
+
+def test_lines_below_the_ratio_are_kept(db, limits, monkeypatch):
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_MIN_PAGES", 5)
+    learner = BoilerplateLearner(HOST)
+    # NAV on all 5 pages, the banner on 3/5 (= MIN_RATIO), the promo on 2/5
+    pages = [_page(i, NAV, *(["Cookie banner"] if i < 3 else []),
+                   *(["Summer promo"] if i < 2 else [])) for i in range(5)]
+
+    stripped = [page["text"] for page in learner.strip_pages(pages)]
+    assert learner.template() == {NAV, "Cookie banner"}
+    assert stripped[0] == "Summer promo\nArticle body 0"
+    assert stripped[4] == "Article body 4"
+
+
+def test_save_keeps_only_the_most_frequent_repeated_lines(db, limits, monkeypatch):
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_MAX_LINES", 2)
+    learner = BoilerplateLearner(HOST)
+    for i in range(4):
+        learner.observe("\n".join([NAV, *([FOOTER] if i < 3 else []),
+                                   *(["Sidebar"] if i < 2 else []), f"Article body {i}"]))
+    learner.save()
+
+    saved = SiteTemplate.get(HOST)
+    assert saved.line_counts == {NAV: 4, FOOTER: 3}
+    assert saved.pages == 4
+
+
+def test_save_drops_lines_seen_once(db, limits):
+    learner = BoilerplateLearner(HOST)
+    learner.observe(f"{NAV}\nOnly here")
+    learner.observe(NAV)
+    learner.save()
+
+    assert SiteTemplate.get(HOST).line_counts == {NAV: 2}
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(boilerplate, "BOILERPLATE_ENABLED", False)
+    assert boilerplate.new_boilerplate_learner(f"https://{HOST}/") is None
@@ -0,0 +1,128 @@
+# backend/tests/test_crawl_budget.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.utils import crawl_budget, multi_page_scraper
+from backend.utils.crawl_budget import CrawlBudget, BUDGET_TIME, BUDGET_BYTES
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(crawl_budget, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.mark.parametrize("value, default, expected", [
+    (None, 30, 30),    # unset -> server default
+    (None, 0, None),   # unset, default unlimited
+    (0, 30, None),     # 0 overrides the default with unlimited
+    (10, 30, 10),
+    (10, 0, 10),
+    (-5, 30, None),
+])
+def test_limit(value, default, expected):
+    assert crawl_budget._limit(value, default) == expected
+
+
+def test_unset_limits_use_the_server_defaults(monkeypatch):
+    monkeypatch.setattr(crawl_budget, "CRAWL_MAX_SECONDS", 60)
+    monkeypatch.setattr(crawl_budget, "CRAWL_MAX_BYTES", 0)
+    monkeypatch.setattr(crawl_budget, "CRAWL_MAX_DEPTH", 3)
+    monkeypatch.setattr(crawl_budget, "CRAWL_MAX_PAGE_BYTES", 1024)
+
+    assert CrawlBudget().report()["limits"] == {
+        "max_seconds": 60, "max_bytes": None, "max_depth": 3, "max_page_bytes": 1024
+    }
+    assert CrawlBudget(0, 500, 0, None).report()["limits"] == {
+        "max_seconds": None, "max_bytes": 500, "max_depth": None, "max_page_bytes": 1024
+    }
+
+
+def test_time_budget_ends_the_crawl(clock):
+    budget = CrawlBudget(max_seconds=10, max_bytes=0)
+    clock.now += 9.9
+    assert budget.exhausted() is None
+
+    clock.now += 0.1
+    assert budget.exhausted() == BUDGET_TIME
+    assert budget.report()["stopped_by"] == BUDGET_TIME
+
+
+def test_start_restarts_the_clock(clock):
+    budget = CrawlBudget(max_seconds=10, max_bytes=0)
+    clock.now += 30
+    budget.start()
+    assert budget.exhausted() is None
+
+
+def test_bytes_budget_ends_the_crawl(clock):
+    budget = CrawlBudget(max_seconds=0, max_bytes=1000, max_page_bytes=0)
+    assert budget.record_page(600)
+    assert budget.exhausted() is None
+
+    assert budget.record_page(400)
+    assert budget.exhausted() == BUDGET_BYTES
+
+
+def test_exhausted_sticks_to_the_first_budget_reached(clock):
+    budget = CrawlBudget(max_seconds=10, max_bytes=100, max_page_bytes=0)
+    budget.record_page(100)
+    assert budget.exhausted() == BUDGET_BYTES
+
+    clock.now += 60
+    assert budget.exhausted() == BUDGET_BYTES
+
+
+def test_unlimited_budget_never_ends_the_crawl(clock):
+    budget = CrawlBudget(0, 0, 0, 0)
+    budget.record_page(10 ** 12)
+    clock.now += 10 ** 6
+    assert budget.exhausted() is None
+
+
+def test_record_page_rejects_oversized_pages_but_counts_their_bytes():
+    budget = CrawlBudget(max_seconds=0, max_bytes=0, max_page_bytes=100)
+    assert budget.record_page(100)
+    assert not budget.record_page(101)
+
+    report = budget.report()
+    assert report["bytes_downloaded"] == 201
+    assert report["pages_over_size"] == 1
+
+
+def test_allows_depth_counts_links_beyond_it():
+    budget = CrawlBudget(max_depth=2)
+    assert budget.allows_depth(2, link_count=5)
+    assert not budget.allows_depth(3, link_count=5)
+    assert budget.report()["links_beyond_depth"] == 5
+
+    assert CrawlBudget(max_depth=0).allows_depth(100)
+
+
+def test_unchanged_sitemap_result_has_the_full_shape(monkeypatch):
+    def seed(frontier, start_url, max_pages, since, stats):
+        stats["skipped_unchanged"] = 7
+        return 0
+
+    monkeypatch.setattr(multi_page_scraper, "_seed_from_sitemaps", seed)
+    result = asyncio.run(multi_page_scraper._crawl(
+        None, "https://example.com/", 10, crawl_mode=multi_page_scraper.CRAWL_MODE_SITEMAP
+    ))
+
+    assert result["skipped_unchanged"] == 7
+    assert result["total_pages"] == 0
+    assert result["watchdog"] == {"page_recycles": 0, "context_recycles": 0,
+                                  "browser_recycles": 0, "peak_heap_mb": 0.0}
+    assert result["budget"]["stopped_by"] is None
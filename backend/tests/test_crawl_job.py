@@ -0,0 +1,170 @@
+# backend/tests/test_crawl_job.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core.crawler import checkpoint_for, params_for_config, CrawlInProgress
+from backend.models.crawl_job import CrawlJob
+
+START = "https://example.com/"
+
+
+@pytest.fixture
+def job(db):
+    job = CrawlJob.create("config-1", "agent-1", START, {"max_pages": 10})
+    yield job
+    job.release()
+
+
+def test_queue_pages_keeps_queue_order_and_ignores_repeats(job):
+    job.queue_pages([(START, 0), (START + "a", 1)])
+    job.queue_pages([(START + "b", 1), (START + "a", 2)])
+
+    visited, pending = job.load_state()
+    assert visited == []
+    assert pending == [(START, 0), (START + "a", 1), (START + "b", 1)]
+
+
+def test_complete_page_moves_it_to_visited_and_queues_its_links(job):
+    job.queue_pages([(START, 0)])
+    job.complete_page(START, "Home", "Hello world", ready_ms=12.5,
+                      new_entries=[(START + "a", 1), (START + "b", 1)])
+    job.queue_pages([(START + "c", 1)])
+    job.fail_page(START + "a")
+
+    visited, pending = job.load_state()
+    assert visited == [START, START + "a"]
+    assert pending == [(START + "b", 1), (START + "c", 1)]
+    assert job.totals() == {"pages": 1, "chars": 11, "chunks": 0, "visited": 2, "pending": 2}
+
+
+def test_load_state_survives_a_restart(job):
+    job.queue_pages([(START, 0), (START + "a", 1)])
+    job.complete_page(START, "Home", "Hello")
+
+    visited, pending = CrawlJob.get_by_id(job.crawl_id).load_state()
+    assert visited == [START]
+    assert pending == [(START + "a", 1)]
+
+
+def test_pages_to_embed_skips_embedded_and_textless_pages(job):
+    urls = [START + str(i) for i in range(4)]
+    job.queue_pages([(url, 1) for url in urls])
+    job.complete_page(urls[0], "Zero", "text 0")
+    job.complete_page(urls[1], "One", "text 1")
+    job.complete_page(urls[2], "Two", None)
+    job.fail_page(urls[3])
+    job.mark_embedded(urls[0], 3)
+
+    assert [row["url"] for row in job.pages_to_embed()] == [urls[1]]
+    assert [row["url"] for row in job.crawled_pages()] == urls[:2]
+    assert job.totals()["chunks"] == 3
+
+
+def test_pages_to_embed_pages_through_large_crawls(job):
+    urls = [f"{START}{i}" for i in range(120)]
+    job.queue_pages([(url, 1) for url in urls])
+    for url in urls:
+        job.complete_page(url, url, "text")
+
+    assert [row["url"] for row in job.pages_to_embed()] == urls
+
+
+def test_create_drops_finished_checkpoints_of_the_config(db):
+    done = CrawlJob.create("config-1", "agent-1", START, {})
+    done.queue_pages([(START, 0)])
+    done.update(status="completed")
+    interrupted = CrawlJob.create("config-1", "agent-1", START, {})
+
+    CrawlJob.create("config-1", "agent-1", START, {})
+
+    assert CrawlJob.get_by_id(done.crawl_id) is None
+    assert CrawlJob.get_by_id(interrupted.crawl_id) is not None
+
+
+def test_claim_is_exclusive_until_released(job):
+    assert not job.is_live
+    assert job.claim()
+
+    other = CrawlJob.get_by_id(job.crawl_id)
+    assert other.is_live
+    assert not other.claim()
+    assert other.to_dict()["live"]
+
+    job.release()
+    assert not other.is_live
+    assert other.claim()
+
+
+CONFIG = SimpleNamespace(config_id="config-1")
+
+
+def _params(**params):
+    return {"agent_id": "agent-1", "url": START, "max_pages": 10, **params}
+
+
+def test_checkpoint_resumes_an_interrupted_crawl(job):
+    resumed = checkpoint_for(CONFIG, _params())
+    assert resumed.crawl_id == job.crawl_id
+    assert resumed.is_live
+
+
+def test_checkpoint_refuses_a_crawl_that_is_still_running(job):
+    job.claim()
+    with pytest.raises(CrawlInProgress):
+        checkpoint_for(CONFIG, _params(max_pages=50))
+    # The live crawl's checkpoint is neither resumed nor discarded
+    assert CrawlJob.get_resumable("config-1").crawl_id == job.crawl_id
+
+
+def test_checkpoint_with_changed_settings_starts_over(job):
+    fresh = checkpoint_for(CONFIG, _params(max_pages=50))
+    try:
+        assert fresh.crawl_id != job.crawl_id
+        assert fresh.is_live
+        # The old checkpoint is abandoned, and so dropped by the new crawl
+        assert CrawlJob.get_by_id(job.crawl_id) is None
+        assert not job.is_live
+    finally:
+        fresh.release()
+
+
+def test_resume_refuses_a_live_crawl(job):
+    from backend.api.routes.scrape import resume_crawl
+
+    job.claim()
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(resume_crawl(job.crawl_id))
+    assert e.value.status_code == 409
+
+
+def _config(**fields):
+    return SimpleNamespace(**{
+        "config_id": "config-1", "agent_id": "agent-1", "url": START,
+        "css_selector": None, "xpath": None, "auto_scrape": 1, "scrape_interval_hours": 24,
+        "js_only": 0, "ready_policy": None, "ready_selector": None, "crawl_mode": None,
+        "allow_third_party": 0, "api_pattern": None, "max_crawl_seconds": None,
+        "max_crawl_bytes": None, "max_depth": None, "max_page_bytes": None,
+        "last_crawled": None, **fields
+    })
+
+
+def test_params_for_config_recrawls_with_the_last_crawl_settings(db):
+    from backend.api.routes.scrape import ScrapeRequest
+
+    CrawlJob.create("config-1", "agent-1", START, {"max_pages": 50, "concurrency": 2})
+    params = params_for_config(_config(last_crawled="2026-01-01T00:00:00"))
+
+    assert params["multi_page"]
+    assert (params["max_pages"], params["concurrency"]) == (50, 2)
+    # The checkpoint stores these params and resume_crawl replays them as a request
+    assert ScrapeRequest(**params).max_pages == 50
+
+
+def test_params_for_config_of_a_single_page(db):
+    params = params_for_config(_config())
+    assert "multi_page" not in params
+    assert params["crawl_mode"] == "links"
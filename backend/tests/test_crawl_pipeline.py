@@ -0,0 +1,148 @@
+# backend/tests/test_crawl_pipeline.py
+
+from collections import Counter
+
+import pytest
+
+from backend.core import vector_db
+from backend.models.crawl_job import CrawlJob
+from backend.utils.pipeline import BoundedStream
+
+
+class FakeCollection:
+    def __init__(self):
+        self.upserts = Counter()  # chunk id -> times upserted
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        assert len(ids) == len(embeddings) == len(documents) == len(metadatas)
+        self.upserts.update(ids)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(vector_db, "get_agent_collection", lambda agent_id: collection)
+    monkeypatch.setattr(vector_db, "sentence_ef", lambda documents: [[0.0] for _ in documents])
+    return collection
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    from backend.core import crawler
+
+    monkeypatch.setattr(crawler, "new_boilerplate_learner", lambda start_url: None)
+    return crawler._embed_crawl_stream
+
+
+def _page(i):
+    return {"url": f"https://example.com/{i}", "title": f"Page {i}",
+            "text": f"Paragraph {i} " * 80}
+
+
+def _crawl(job, pages):
+    job.queue_pages([(page["url"], 1) for page in pages])
+    for page in pages:
+        job.complete_page(page["url"], page["title"], page["text"])
+
+
+def test_each_page_is_upserted_once(db, collection, pipeline):
+    job = CrawlJob.create("config-1", "agent-1", "https://example.com/", {})
+    pages = [_page(i) for i in range(5)]
+    _crawl(job, pages)
+
+    # The whole crawl fits in one (partial) embedding batch
+    stream = BoundedStream(16)
+    for page in pages:
+        stream.put(page)
+    stream.close()
+    result = pipeline(job, stream)
+
+    totals = job.totals()
+    assert set(collection.upserts.values()) == {1}
+    assert sum(collection.upserts.values()) == totals["chunks"]
+    assert result["pages_embedded"] == totals["pages"] == 5
+    assert result["chars"] == totals["chars"]
+
+
+def test_leftover_pages_of_an_interrupted_run_are_embedded_once(db, collection, pipeline):
+    job = CrawlJob.create("config-1", "agent-1", "https://example.com/", {})
+    pages = [_page(i) for i in range(4)]
+    _crawl(job, pages)
+
+    # Pages 0 and 1 were crawled by the interrupted run but never embedded
+    stream = BoundedStream(16)
+    for page in pages[2:]:
+        stream.put(page)
+    stream.close()
+    result = pipeline(job, stream)
+
+    per_page = Counter(chunk_id.rsplit("_chunk_", 1)[0] for chunk_id in collection.upserts)
+    assert len(per_page) == 4
+    assert set(collection.upserts.values()) == {1}
+    assert result["pages_embedded"] == 4
+    assert list(job.pages_to_embed()) == []
+
+
+def test_fingerprints_are_saved_as_pages_are_stored(db, collection, pipeline):
+    from backend.models.page_fingerprint import PageFingerprint
+    from backend.utils.near_duplicates import NearDuplicateFilter
+
+    job = CrawlJob.create("config-1", "agent-1", "https://example.com/", {})
+    pages = [_page(i) for i in range(3)]
+    _crawl(job, pages)
+    dedup = NearDuplicateFilter("agent-1")
+    for page in pages:
+        dedup.check(page["url"], page["text"])
+    assert PageFingerprint.get_by_agent("agent-1") == []
+
+    stream = BoundedStream(16)
+    for page in pages:
+        stream.put(page)
+    stream.close()
+    pipeline(job, stream, duplicate_filter=dedup)
+
+    assert sorted(url for url, _ in PageFingerprint.get_by_agent("agent-1")) == [p["url"] for p in pages]
+
+
+class Recorder:
+    """Stands in for an Agent / ScrapeConfig, keeping what update() was given"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def update(self, **fields):
+        self.__dict__.update(fields)
+
+
+def _fake_crawl(pages):
+    def crawl(start_url, crawl_job, page_sink, **kwargs):
+        _crawl(crawl_job, pages)
+        for page in pages:
+            page_sink.put(page)
+        return {"total_pages": len(pages), "total_chars": sum(len(p["text"]) for p in pages),
+                "skipped_unchanged": 0, "skipped_duplicates": 0, "embedding_chunks_saved": 0,
+                "budget": {"stopped_by": None}}
+    return crawl
+
+
+def test_run_crawl_embeds_and_records_the_crawl(db, collection, pipeline, monkeypatch):
+    from backend.core import crawler
+
+    pages = [_page(i) for i in range(3)]
+    monkeypatch.setattr(crawler, "scrape_multiple_pages", _fake_crawl(pages))
+    agent = Recorder(agent_id="agent-1", noise_pattern_list=[])
+    config = Recorder(config_id="config-1", last_crawled=None)
+    params = {"agent_id": "agent-1", "url": "https://example.com/", "max_pages": 10,
+              "concurrency": 2, "css_selector": None, "xpath": None, "ready_policy": None,
+              "ready_selector": None, "crawl_mode": "links", "allow_third_party": False,
+              "max_crawl_seconds": None, "max_crawl_bytes": None, "max_depth": None,
+              "max_page_bytes": None}
+
+    result = crawler.run_crawl(agent, config, params)
+
+    job = CrawlJob.get_latest("config-1")
+    assert job.status == "completed" and not job.is_live
+    assert result["content_hash"] == config.last_content_hash == job.content_hash()
+    assert result["vector_db_result"]["pages_embedded"] == 3
+    assert agent.chunks_count == sum(collection.upserts.values())
+    assert config.last_crawled
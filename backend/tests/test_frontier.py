@@ -0,0 +1,83 @@
+# backend/tests/test_frontier.py
+
+import pytest
+
+from backend.utils.frontier import CrawlFrontier, canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM/Path", "https://example.com/Path"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com/a#section", "https://example.com/a"),
+    ("https://example.com/a/", "https://example.com/a"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/", "https://example.com/"),
+    ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?utm_source=x&id=7&gclid=y&fbclid=z", "https://example.com/a?id=7"),
+    ("https://user:pw@Example.com/a", "https://user:pw@example.com/a"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_url_variants_compare_equal():
+    variants = [
+        "https://example.com/page/1",
+        "https://Example.com/page/1/",
+        "https://example.com/page/1#top",
+        "https://example.com/page/1?utm_source=news",
+        "https://example.com:443/page/1",
+    ]
+    assert len({canonicalize_url(url) for url in variants}) == 1
+
+
+@pytest.mark.parametrize("url", ["http://a.com:abc/", "http://[::1/"])
+def test_canonicalize_url_rejects_unparseable(url):
+    with pytest.raises(ValueError):
+        canonicalize_url(url)
+
+
+def test_frontier_is_breadth_first():
+    frontier = CrawlFrontier()
+    for url, depth in [("https://a.com/1", 0), ("https://a.com/2", 1), ("https://a.com/3", 1)]:
+        assert frontier.add(url, depth)
+
+    assert len(frontier) == 3
+    assert frontier.pop() == ("https://a.com/1", 0)
+    frontier.add("https://a.com/4", 2)
+    assert frontier.pending() == [("https://a.com/2", 1), ("https://a.com/3", 1), ("https://a.com/4", 2)]
+
+
+def test_frontier_dedups_variants_and_keeps_first_url():
+    frontier = CrawlFrontier()
+    assert frontier.add("https://a.com/search?q")
+    assert not frontier.add("https://A.com/search?q=#results")
+    assert not frontier.add("https://a.com/search/?q=&utm_medium=email")
+
+    # Fetched as found, not in canonical form
+    assert frontier.pending() == [("https://a.com/search?q", 0)]
+    assert frontier.seen_count == 1
+
+
+def test_frontier_remembers_popped_and_marked_urls():
+    frontier = CrawlFrontier()
+    frontier.add("https://a.com/1")
+    frontier.pop()
+    frontier.mark_seen("https://a.com/2")
+
+    assert not frontier.add("https://a.com/1/")
+    assert not frontier.add("https://a.com/2#x")
+    assert "https://a.com/2" in frontier
+    assert "https://a.com/3" not in frontier
+    assert len(frontier) == 0
+
+
+def test_frontier_skips_unparseable_urls():
+    frontier = CrawlFrontier()
+    assert not frontier.add("http://a.com:abc/")
+    frontier.mark_seen("http://[::1/")
+    assert "http://a.com:abc/" not in frontier
+    assert frontier.add("https://a.com/ok")
+    assert frontier.pending() == [("https://a.com/ok", 0)]
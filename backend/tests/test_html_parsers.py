@@ -0,0 +1,88 @@
+# backend/tests/test_html_parsers.py
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.utils.html_parsers import SOUP_PARSER, get_parser
+from backend.utils.extraction import extract_text_and_links
+
+CORPUS = Path(__file__).parent / "fixtures" / "html"
+FAST_BACKENDS = ["lxml", "html5-parser"]
+
+# (page, css_selector, xpath) cases every backend must extract identically
+CASES = [
+    ("article.html", None, None),
+    ("article.html", "article p", None),
+    ("article.html", None, "//ul/li"),
+    ("blog_no_landmarks.html", None, None),
+    ("blog_no_landmarks.html", ".comment", None),
+    ("docs_table.html", None, None),
+    ("docs_table.html", "td", None),
+    ("docs_table.html", None, "//dt"),
+    ("listing.html", None, None),
+    ("listing.html", ".product .name", None),
+    ("listing.html", None, "//span[@class='price']"),
+    ("listing.html", ".missing", None),
+    ("special_tags.html", None, None),
+    ("special_tags.html", "p", None),
+]
+
+
+def _backend(name):
+    parser = get_parser(name)
+    if parser is SOUP_PARSER:
+        pytest.skip(f"{name} is not installed")
+    return parser
+
+
+def _extract(parser, page, css_selector=None, xpath=None):
+    html_content = (CORPUS / page).read_text(encoding="utf-8")
+    return extract_text_and_links(html_content, css_selector, xpath, parser=parser)
+
+
+@pytest.mark.parametrize("name", FAST_BACKENDS)
+@pytest.mark.parametrize("page, css_selector, xpath", CASES)
+def test_backend_matches_bs4(name, page, css_selector, xpath):
+    parser = _backend(name)
+    assert _extract(parser, page, css_selector, xpath) == _extract(SOUP_PARSER, page, css_selector, xpath)
+
+
+def test_corpus_extracts_main_content():
+    text, links = _extract(SOUP_PARSER, "article.html")
+    assert text.startswith("Release notes 4.2")
+    assert "Docs" not in text and "Example Corp" not in text
+    assert links[:3] == ["#main", "/", "/docs/"]
+
+    text, _ = _extract(SOUP_PARSER, "blog_no_landmarks.html")
+    assert text.startswith("Why we stopped re-rendering every page")
+    assert "Popular posts" not in text
+
+    text, _ = _extract(SOUP_PARSER, "special_tags.html")
+    assert "Template text" not in text and "a comment" not in text
+    assert "Enable JavaScript" not in text and "Article" not in text
+
+
+# libxml2 and html.parser repair broken nesting differently; this is why
+# bs4 stays the default HTML_PARSER
+@pytest.mark.parametrize("css_selector", [None, "p"])
+def test_lxml_repairs_malformed_markup_differently(css_selector):
+    parser = _backend("lxml")
+    assert _extract(parser, "malformed.html", css_selector) != _extract(SOUP_PARSER, "malformed.html", css_selector)
+
+
+def test_unavailable_backend_falls_back_to_bs4():
+    assert get_parser("no-such-parser") is SOUP_PARSER
+
+
+def test_extraction_workers_do_not_load_browser_or_http_code():
+    # What an extraction pool worker process imports to run _extract_task
+    code = ("import sys; from backend.utils.extraction_pool import _extract_task; "
+            "_extract_task('<p>Hello</p>', base_url='https://example.com/'); "
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'playwright', 'httpx'}))")
+    root = Path(__file__).parents[2]
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "[]"
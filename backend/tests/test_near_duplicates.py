@@ -0,0 +1,104 @@
+# backend/tests/test_near_duplicates.py
+
+import random
+
+import pytest
+
+from backend.models.page_fingerprint import PageFingerprint
+from backend.utils.near_duplicates import (
+    SIMHASH_BITS, SimHashIndex, NearDuplicateFilter, simhash, estimate_chunks
+)
+
+ARTICLE = " ".join(
+    f"Sentence {i} of the article talks about crawling, caching and politeness." for i in range(60)
+)
+
+
+def _flip(fingerprint, bits):
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def test_simhash_is_stable_and_64_bit():
+    assert simhash(ARTICLE) == simhash(ARTICLE)
+    assert simhash(ARTICLE.upper()) == simhash(ARTICLE)
+    assert 0 <= simhash(ARTICLE) < 1 << SIMHASH_BITS
+    assert simhash("") == simhash("   ")
+
+
+def test_simhash_near_and_far_texts():
+    near = ARTICLE.replace("Sentence 7 ", "Sentence seven ")
+    far = " ".join(f"Recipe step {i}: whisk eggs, add flour and bake slowly." for i in range(60))
+    assert (simhash(ARTICLE) ^ simhash(near)).bit_count() <= 3
+    assert (simhash(ARTICLE) ^ simhash(far)).bit_count() > 10
+
+
+@pytest.mark.parametrize("distance, found", [(0, True), (1, True), (3, True), (4, False), (20, False)])
+def test_index_distance_threshold(distance, found):
+    index = SimHashIndex(max_distance=3)
+    base = random.Random(1).getrandbits(SIMHASH_BITS)
+    index.add(base, "https://a.com/1")
+    other = _flip(base, range(0, distance * 3, 3))
+    assert (index.find(other) == "https://a.com/1") is found
+
+
+def test_index_finds_matches_whichever_band_is_shared():
+    index = SimHashIndex(max_distance=3)
+    assert len(index._blocks) == 4
+    rng = random.Random(2)
+    base = rng.getrandbits(SIMHASH_BITS)
+    index.add(base, "https://a.com/1")
+    # Three flipped bits can spoil at most three of the four bands
+    for shift, width in index._blocks:
+        for _ in range(20):
+            bits = rng.sample([b for b in range(SIMHASH_BITS) if not shift <= b < shift + width], 3)
+            assert index.find(_flip(base, bits)) == "https://a.com/1"
+
+
+def test_index_blocks_cover_every_bit():
+    for max_distance in (0, 3, 6, 63, 100):
+        index = SimHashIndex(max_distance)
+        covered = [b for shift, width in index._blocks for b in range(shift, shift + width)]
+        assert sorted(covered) == list(range(SIMHASH_BITS))
+
+
+def test_index_excludes_own_url():
+    index = SimHashIndex(max_distance=3)
+    index.add(12345, "https://a.com/1")
+    assert index.find(12345, exclude_url="https://a.com/1") is None
+    index.add(12345, "https://a.com/2")
+    assert index.find(12345, exclude_url="https://a.com/1") == "https://a.com/2"
+
+
+def test_filter_flags_duplicates_but_not_updates():
+    dedup = NearDuplicateFilter(max_distance=3)
+    assert dedup.check("https://a.com/1", ARTICLE) is None
+    assert dedup.check("https://a.com/1", ARTICLE) is None  # same URL again: an update
+    assert dedup.check("https://a.com/copy", ARTICLE) == "https://a.com/1"
+    assert dedup.stats() == {
+        "skipped_duplicates": 1,
+        "duplicate_chars": len(ARTICLE),
+        "embedding_chunks_saved": estimate_chunks(len(ARTICLE)),
+    }
+
+
+def test_fingerprints_are_saved_only_once_the_page_is_stored(db):
+    dedup = NearDuplicateFilter("agent-1", max_distance=3)
+    assert dedup.check("https://a.com/1", ARTICLE) is None
+    assert PageFingerprint.get_by_agent("agent-1") == []
+
+    dedup.page_stored("https://a.com/1")
+    assert PageFingerprint.get_by_agent("agent-1") == [("https://a.com/1", simhash(ARTICLE))]
+
+    # A later crawl starts from the saved fingerprints
+    assert NearDuplicateFilter("agent-1", max_distance=3).check("https://b.com/", ARTICLE) == "https://a.com/1"
+
+
+def test_failed_crawl_leaves_no_fingerprints(db):
+    dedup = NearDuplicateFilter("agent-1", max_distance=3)
+    dedup.check("https://a.com/1", ARTICLE)
+    # The crawl fails before the page is embedded: nothing was stored
+    assert NearDuplicateFilter("agent-1", max_distance=3).check("https://b.com/", ARTICLE) is None
+    dedup.page_stored("https://a.com/unknown")
+    assert PageFingerprint.get_by_agent("agent-1") == []
@@ -0,0 +1,103 @@
+# backend/tests/test_rate_limiter.py
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.utils import rate_limiter as rate_limiter_module
+from backend.utils.rate_limiter import HostRateLimiter, _parse_overrides
+
+URL = "https://example.com/page"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(rate_limiter_module, "time",
+                        SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_burst_then_one_request_per_token(clock):
+    limiter = HostRateLimiter(default_rate=2.0, default_burst=3, overrides={})
+
+    assert [limiter._reserve(URL) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Bucket empty: each further request reserves the next token
+    assert limiter._reserve(URL) == pytest.approx(0.5)
+    assert limiter._reserve(URL) == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time_up_to_the_burst(clock):
+    limiter = HostRateLimiter(default_rate=2.0, default_burst=2, overrides={})
+    limiter._reserve(URL)
+    limiter._reserve(URL)
+
+    clock.now += 0.5  # one token back
+    assert limiter._reserve(URL) == 0.0
+    assert limiter._reserve(URL) == pytest.approx(0.5)
+
+    clock.now += 60  # refills to the burst, not beyond
+    assert [limiter._reserve(URL) for _ in range(2)] == [0.0, 0.0]
+    assert limiter._reserve(URL) > 0
+
+
+def test_hosts_have_separate_buckets(clock):
+    limiter = HostRateLimiter(default_rate=1.0, default_burst=1, overrides={})
+    limiter._reserve(URL)
+
+    assert limiter._reserve("https://other.org/") == 0.0
+    assert limiter._reserve("https://EXAMPLE.com/x") == pytest.approx(1.0)
+
+
+def test_overrides_and_unlimited_hosts(clock):
+    limiter = HostRateLimiter(default_rate=1.0, default_burst=1,
+                              overrides={"example.com": 4.0, "fast.io": 0})
+    limiter._reserve(URL)
+    assert limiter._reserve(URL) == pytest.approx(0.25)
+    assert all(limiter._reserve("https://fast.io/") == 0.0 for _ in range(10))
+
+
+def test_crawl_delay_caps_the_rate_and_disables_bursting(clock):
+    limiter = HostRateLimiter(default_rate=10.0, default_burst=5, overrides={})
+    limiter._reserve(URL)
+    limiter.set_crawl_delay("Example.com", 2)
+
+    host = limiter.stats()["hosts"]["example.com"]
+    assert (host["rate"], host["burst"], host["crawl_delay"]) == (0.5, 1, 2.0)
+    # Saved-up tokens shrink to the new burst of one
+    assert limiter._reserve(URL) == 0.0
+    assert limiter._reserve(URL) == pytest.approx(2.0)
+
+
+def test_crawl_delay_never_raises_a_slower_rate(clock):
+    limiter = HostRateLimiter(default_rate=0.1, default_burst=1, overrides={})
+    limiter.set_crawl_delay("example.com", 1)
+    limiter._reserve(URL)
+    assert limiter._reserve(URL) == pytest.approx(10.0)
+
+
+def test_clearing_the_crawl_delay_restores_the_default(clock):
+    limiter = HostRateLimiter(default_rate=10.0, default_burst=5, overrides={})
+    limiter.set_crawl_delay("example.com", 2)
+    limiter._reserve(URL)
+    limiter.set_crawl_delay("example.com", None)
+
+    host = limiter.stats()["hosts"]["example.com"]
+    assert (host["rate"], host["burst"], host["crawl_delay"]) == (10.0, 5, None)
+
+
+def test_stats_count_requests_and_delay(clock):
+    limiter = HostRateLimiter(default_rate=1.0, default_burst=1, overrides={})
+    for _ in range(3):
+        limiter._reserve(URL)
+
+    host = limiter.stats()["hosts"]["example.com"]
+    assert host["requests"] == 3
+    assert host["total_delay_s"] == 3.0
+
+
+def test_parse_overrides():
+    assert _parse_overrides("Example.com=0.5, news.site=2,bad=x,,junk") == {
+        "example.com": 0.5, "news.site": 2.0
+    }
+    assert _parse_overrides("") == {}
@@ -0,0 +1,123 @@
+# backend/tests/test_request_blocking.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.utils.request_blocking import (
+    RequestBlocker, site_of, _listed, POLICY_BLOCKLIST, POLICY_SCRIPTS, POLICY_ALL
+)
+
+PAGE = "https://www.example.co.uk/articles/1"
+
+
+def _request(url, resource_type="script", navigation=False, top_frame=True):
+    frame = SimpleNamespace(parent_frame=None if top_frame else object())
+    return SimpleNamespace(url=url, resource_type=resource_type, frame=frame,
+                           is_navigation_request=lambda: navigation)
+
+
+def _reason(url, policy=POLICY_SCRIPTS, allow_third_party=False, **request):
+    return RequestBlocker(PAGE, allow_third_party, policy)._reason(_request(url, **request))
+
+
+@pytest.mark.parametrize("host, site", [
+    ("example.com", "example.com"),
+    ("www.Example.com.", "example.com"),
+    ("a.b.example.co.uk", "example.co.uk"),
+    ("cdn.example.io", "example.io"),
+    ("localhost", "localhost"),
+])
+def test_site_of(host, site):
+    assert site_of(host) == site
+
+
+def test_listed_matches_domains_and_their_subdomains():
+    domains = {"hotjar.com"}
+    assert _listed("hotjar.com", domains)
+    assert _listed("static.hotjar.com", domains)
+    assert not _listed("nothotjar.com", domains)
+    assert not _listed("com", {"com"})
+
+
+@pytest.mark.parametrize("resource_type", ["stylesheet", "font", "image", "media"])
+def test_resource_types_are_always_blocked(resource_type):
+    url = "https://www.example.co.uk/static/file"
+    assert _reason(url, resource_type=resource_type) == "resource_type"
+    assert _reason(url, resource_type=resource_type, allow_third_party=True) == "resource_type"
+
+
+def test_first_party_subdomains_load():
+    assert _reason("https://api.example.co.uk/data", resource_type="xhr", policy=POLICY_ALL) is None
+
+
+@pytest.mark.parametrize("policy", [POLICY_BLOCKLIST, POLICY_SCRIPTS, POLICY_ALL])
+def test_blocklisted_domains_are_blocked_under_every_policy(policy):
+    assert _reason("https://www.googletagmanager.com/gtm.js", policy=policy) == "blocklist"
+
+
+def test_blocklist_wins_over_the_allowlist_and_navigation():
+    assert _reason("https://connect.facebook.net/sdk.js", navigation=True) == "blocklist"
+
+
+@pytest.mark.parametrize("policy, resource_type, reason", [
+    (POLICY_BLOCKLIST, "script", None),
+    (POLICY_BLOCKLIST, "xhr", None),
+    (POLICY_SCRIPTS, "script", "third_party"),
+    (POLICY_SCRIPTS, "fetch", "third_party"),
+    (POLICY_SCRIPTS, "document", "third_party"),
+    (POLICY_SCRIPTS, "other", None),
+    (POLICY_ALL, "other", "third_party"),
+])
+def test_third_party_policy(policy, resource_type, reason):
+    url = "https://widgets.vendor.com/embed"
+    assert _reason(url, policy=policy, resource_type=resource_type) == reason
+
+
+def test_allowlisted_cdns_load_under_every_policy():
+    for url in ("https://cdn.jsdelivr.net/npm/vue.js", "https://ajax.googleapis.com/jquery.js"):
+        assert _reason(url, policy=POLICY_ALL) is None
+
+
+def test_cross_site_main_document_loads():
+    url = "https://login.vendor.com/redirect"
+    assert _reason(url, policy=POLICY_ALL, resource_type="document", navigation=True) is None
+    # ... but not the same navigation inside an iframe
+    assert _reason(url, policy=POLICY_ALL, resource_type="document",
+                   navigation=True, top_frame=False) == "third_party"
+
+
+def test_allow_third_party_only_keeps_resource_type_blocking():
+    assert _reason("https://www.hotjar.com/h.js", allow_third_party=True) is None
+    assert _reason("https://widgets.vendor.com/embed", policy=POLICY_ALL,
+                   allow_third_party=True) is None
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+
+def test_handle_aborts_blocked_requests_and_counts_them_per_page():
+    blocker = RequestBlocker(PAGE, policy=POLICY_SCRIPTS)
+    urls = [("https://www.example.co.uk/app.js", "script"),
+            ("https://www.example.co.uk/logo.png", "image"),
+            ("https://www.google-analytics.com/analytics.js", "script"),
+            ("https://widgets.vendor.com/embed.js", "script")]
+
+    routes = [FakeRoute(_request(url, resource_type)) for url, resource_type in urls]
+    for route in routes:
+        asyncio.run(blocker.handle(route))
+
+    assert [route.outcome for route in routes] == ["continued", "aborted", "aborted", "aborted"]
+    assert blocker.blocked == {"resource_type": 1, "blocklist": 1, "third_party": 1}
+    assert blocker.take_page_count() == 3
+    assert blocker.take_page_count() == 0
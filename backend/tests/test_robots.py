@@ -0,0 +1,128 @@
+# backend/tests/test_robots.py
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.utils import robots
+from backend.utils.rate_limiter import HostRateLimiter
+from backend.utils.robots import RobotsCache, RobotsDisallowedError
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Crawl-delay: 3
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+class FakeClient:
+    """Serves one robots.txt response (or error) and counts the fetches"""
+
+    def __init__(self):
+        self.response = SimpleNamespace(status_code=200, text=ROBOTS_TXT)
+        self.error = None
+        self.fetches = 0
+
+    def get(self, url):
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(robots, "get_http_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(robots, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = HostRateLimiter(default_rate=0, default_burst=1, overrides={})
+    monkeypatch.setattr(robots, "rate_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture
+def cache(client, clock, limiter):
+    return RobotsCache(ttl=3600, error_ttl=60, user_agent="TestBot", enabled=True)
+
+
+def test_disallow_raises(cache):
+    cache.check("https://example.com/docs/")
+    with pytest.raises(RobotsDisallowedError):
+        cache.check("https://example.com/private/page")
+    assert cache.stats()["disallowed"] == 1
+
+
+def test_robots_txt_is_cached_per_host_for_the_ttl(cache, client, clock):
+    cache.is_allowed("https://example.com/a")
+    cache.is_allowed("https://EXAMPLE.com/b")
+    assert client.fetches == 1
+    assert cache.stats()["hits"] == 1
+
+    cache.is_allowed("http://example.com/a")  # another origin
+    assert client.fetches == 2
+
+    clock.now += 3599
+    cache.is_allowed("https://example.com/a")
+    assert client.fetches == 2
+
+    clock.now += 1
+    cache.is_allowed("https://example.com/a")
+    assert client.fetches == 3
+
+
+@pytest.mark.parametrize("failure", [
+    {"error": httpx.ConnectError("unreachable")},
+    {"response": SimpleNamespace(status_code=503, text="")},
+])
+def test_errors_allow_everything_but_are_retried_after_the_error_ttl(cache, client, clock, failure):
+    for name, value in failure.items():
+        setattr(client, name, value)
+
+    assert cache.is_allowed("https://example.com/private/page")
+    clock.now += 59
+    cache.is_allowed("https://example.com/private/page")
+    assert client.fetches == 1
+
+    clock.now += 1
+    client.error, client.response = None, SimpleNamespace(status_code=200, text=ROBOTS_TXT)
+    assert not cache.is_allowed("https://example.com/private/page")
+    assert client.fetches == 2
+
+
+def test_missing_robots_txt_allows_everything_for_the_full_ttl(cache, client, clock):
+    client.response = SimpleNamespace(status_code=404, text="Not found")
+
+    assert cache.is_allowed("https://example.com/private/page")
+    clock.now += 3599
+    cache.is_allowed("https://example.com/private/page")
+    assert client.fetches == 1
+
+
+def test_crawl_delay_reaches_the_rate_limiter(cache, limiter):
+    assert cache.crawl_delay("https://example.com/") == 3
+    assert limiter._crawl_delays == {"example.com": 3.0}
+
+
+def test_sitemaps(cache):
+    assert cache.sitemaps("https://example.com/") == ["https://example.com/sitemap.xml"]
+
+
+def test_disabled_cache_never_fetches(client, clock, limiter):
+    cache = RobotsCache(enabled=False)
+    cache.check("https://example.com/private/page")
+    assert cache.crawl_delay("https://example.com/") is None
+    assert cache.sitemaps("https://example.com/") == []
+    assert client.fetches == 0
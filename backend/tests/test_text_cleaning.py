@@ -0,0 +1,90 @@
+# backend/tests/test_text_cleaning.py
+
+import pytest
+
+from backend.utils.text_cleaning import NoiseFilter, DEFAULT_NOISE_FILTER, noise_filter_for
+from backend.utils.extraction import clean_text_minimal
+
+
+def _original_clean_text_minimal(text):
+    """clean_text_minimal as it was before NoiseFilter, the reference output"""
+    if not text:
+        return ""
+    skip_patterns = ["skip to content", "skip to main", "accept cookies", "cookie policy"]
+    cleaned, prev = [], ""
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if any(pattern in line.lower() for pattern in skip_patterns):
+            continue
+        if line == prev:
+            continue
+        cleaned.append(line)
+        prev = line
+    result = "\n".join(cleaned)
+    while "\n\n\n" in result:
+        result = result.replace("\n\n\n", "\n\n")
+    return result.strip()
+
+
+SAMPLES = [
+    "",
+    "one line",
+    "  padded  \n\n\n\n  lines \t\n",
+    "Skip to content\nHome\nNews\nNews\nNews\nArticle body",
+    "We use cookies. ACCEPT COOKIES\nRead our Cookie Policy here\nReal text",
+    "Title\n\nTitle\n\nBody\nTitle",
+    "a\r\nb\r\n\r\nb",
+    "Jump: skip to main navigation\nkeep me",
+    "İstanbul\nSKIP TO MAIN\nİstanbul\nistanbul",
+    "\n".join(f"line {i % 3}" for i in range(20)),
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_clean_text_minimal_matches_original(text):
+    assert clean_text_minimal(text) == _original_clean_text_minimal(text)
+
+
+def test_clean_text_minimal_output():
+    text = "  Skip to content \nHome\nHome\n\n  Story text  \nAccept cookies\nStory text\nEnd"
+    assert clean_text_minimal(text) == "Home\nStory text\nEnd"
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_clean_lines_matches_clean(text):
+    assert "\n".join(DEFAULT_NOISE_FILTER.clean_lines(text.split("\n"))) == DEFAULT_NOISE_FILTER.clean(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_clean_stream_matches_clean(text, size):
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+    assert "\n".join(DEFAULT_NOISE_FILTER.clean_stream(chunks)) == DEFAULT_NOISE_FILTER.clean(text)
+
+
+def test_clean_lines_continues_from_prev():
+    assert list(DEFAULT_NOISE_FILTER.clean_lines(["Same", "Other"], prev="Same")) == ["Other"]
+
+
+def test_extra_patterns_add_to_defaults():
+    noise = NoiseFilter(["  Subscribe NOW ", "", "multi\nline", "skip to content"])
+    assert noise.patterns == (
+        "skip to content", "skip to main", "accept cookies", "cookie policy", "subscribe now"
+    )
+    text = "Subscribe now for more\nSkip to content\nBody"
+    assert noise.clean(text) == "Body"
+    assert DEFAULT_NOISE_FILTER.clean(text) == "Subscribe now for more\nBody"
+
+
+def test_patterns_are_literal():
+    noise = NoiseFilter(["a.c", "(x"])
+    assert noise.clean("abc\na.c here\n(x)\nok") == "abc\nok"
+
+
+def test_noise_filter_for():
+    assert noise_filter_for(None) is DEFAULT_NOISE_FILTER
+    assert noise_filter_for([]) is DEFAULT_NOISE_FILTER
+    assert noise_filter_for(["promo"]) is noise_filter_for(["promo"])
+    assert noise_filter_for(["promo"]).clean("promo code\ntext") == "text"
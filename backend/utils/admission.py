@@ -0,0 +1,231 @@
+# backend/utils/admission.py
+
+import asyncio
+import itertools
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+
+from backend.core.config import (
+    ADMISSION_MAX_ACTIVE,
+    ADMISSION_TENANT_MAX_ACTIVE,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_TENANT_MAX_QUEUE,
+    ADMISSION_POLICY,
+)
+
+PRIORITY_INTERACTIVE = 0  # API requests someone is waiting on
+PRIORITY_SCHEDULED = 10  # APScheduler jobs
+
+POLICY_FIFO = "fifo"
+POLICY_PRIORITY = "priority"
+
+
+class AdmissionRejected(Exception):
+    """Too much queued browser work; retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    def __init__(self, tenant, priority, seq, wake):
+        self.tenant = tenant
+        self.priority = priority
+        self.seq = seq
+        self.wake = wake
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    One gate for every piece of browser work in the process: API scrapes
+    and crawls, reminder triggers and scheduler jobs.
+
+    At most `max_active` run at once, and at most `tenant_max_active` for
+    any one tenant (an agent's user, or a reminder's email). The rest wait
+    in a queue served in arrival order ('fifo') or interactive work first
+    ('priority'); a tenant at its limit never blocks the tenants behind it.
+    HTTP routes call `reject_if_busy()` first so a burst is turned away
+    with a retry estimate instead of piling up.
+
+    Sync callers (scheduler threads) use `slot()`, async ones `slot_async()`.
+    """
+
+    def __init__(self, max_active=ADMISSION_MAX_ACTIVE,
+                 tenant_max_active=ADMISSION_TENANT_MAX_ACTIVE,
+                 max_queue=ADMISSION_MAX_QUEUE, tenant_max_queue=ADMISSION_TENANT_MAX_QUEUE,
+                 policy=ADMISSION_POLICY):
+        self.max_active = max(1, max_active)
+        self.tenant_max_active = max(1, tenant_max_active)
+        self.max_queue = max_queue
+        self.tenant_max_queue = tenant_max_queue
+        self.policy = policy
+
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queue = []
+        self._running = Counter()  # tenant -> running
+        self._avg_service_s = 10.0  # EWMA, seeds the first Retry-After estimates
+        self._stats = {
+            "admitted": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    # ----------------------------------------
+    # Queueing
+    # ----------------------------------------
+
+    def _retry_after_locked(self) -> int:
+        waves = (len(self._queue) + 1) / self.max_active
+        return max(1, math.ceil(self._avg_service_s * waves))
+
+    def reject_if_busy(self, tenant: str):
+        """Raise AdmissionRejected if new work for `tenant` would only queue behind too much"""
+        with self._lock:
+            queued = sum(1 for t in self._queue if t.tenant == tenant)
+            if len(self._queue) >= self.max_queue:
+                reason = f"{len(self._queue)} scrapes already queued"
+            elif queued >= self.tenant_max_queue:
+                reason = f"{queued} scrapes already queued for this account"
+            else:
+                return
+            self._stats["rejected"] += 1
+            retry_after = self._retry_after_locked()
+        raise AdmissionRejected(f"Scraper busy: {reason}", retry_after)
+
+    def _enqueue(self, tenant, priority, wake) -> _Ticket:
+        with self._lock:
+            ticket = _Ticket(tenant, priority, next(self._seq), wake)
+            self._queue.append(ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+            self._dispatch_locked()
+            return ticket
+
+    def _dispatch_locked(self):
+        """Grant waiting tickets while there is global and per-tenant room"""
+        if self.policy == POLICY_PRIORITY:
+            order = sorted(self._queue, key=lambda t: (t.priority, t.seq))
+        else:
+            order = list(self._queue)
+
+        for ticket in order:
+            if sum(self._running.values()) >= self.max_active:
+                break
+            if self._running[ticket.tenant] >= self.tenant_max_active:
+                continue
+            self._queue.remove(ticket)
+            self._running[ticket.tenant] += 1
+            ticket.granted = True
+
+            wait_ms = (time.monotonic() - ticket.enqueued_at) * 1000
+            self._stats["admitted"] += 1
+            self._stats["total_wait_ms"] += wait_ms
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+            ticket.wake()
+
+    def _release(self, ticket: _Ticket, started: float = None):
+        with self._lock:
+            self._running[ticket.tenant] -= 1
+            if self._running[ticket.tenant] <= 0:
+                del self._running[ticket.tenant]
+            if started is not None:
+                self._avg_service_s = 0.8 * self._avg_service_s + 0.2 * (time.monotonic() - started)
+            self._dispatch_locked()
+
+    def _withdraw(self, ticket: _Ticket) -> bool:
+        """Drop a ticket that stopped waiting; True if it was granted meanwhile"""
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+            return ticket.granted
+
+    # ----------------------------------------
+    # Slots
+    # ----------------------------------------
+
+    @contextmanager
+    def slot(self, tenant: str, priority: int = PRIORITY_SCHEDULED):
+        """Block until `tenant` may start browser work, hold the slot for the block"""
+        granted = threading.Event()
+        ticket = self._enqueue(tenant, priority, granted.set)
+        granted.wait()
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(ticket, started)
+
+    @asynccontextmanager
+    async def slot_async(self, tenant: str, priority: int = PRIORITY_INTERACTIVE):
+        """Async version of slot(), for FastAPI routes"""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        ticket = self._enqueue(tenant, priority, wake)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if self._withdraw(ticket):
+                self._release(ticket)
+            raise
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(ticket, started)
+
+    # ----------------------------------------
+    # Metrics
+    # ----------------------------------------
+
+    def stats(self):
+        """Queue depth, running work per tenant and admission waits"""
+        with self._lock:
+            stats = dict(self._stats)
+            queued_by_tenant = Counter(t.tenant for t in self._queue)
+            stats["queued"] = len(self._queue)
+            stats["running"] = sum(self._running.values())
+            stats["running_by_tenant"] = dict(self._running)
+            stats["queued_by_tenant"] = dict(queued_by_tenant)
+            stats["avg_service_s"] = round(self._avg_service_s, 2)
+            stats["retry_after_s"] = self._retry_after_locked()
+
+        admitted = stats["admitted"]
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / admitted, 2) if admitted else 0.0
+        stats["total_wait_ms"] = round(stats["total_wait_ms"], 2)
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 2)
+        stats["policy"] = self.policy
+        stats["max_active"] = self.max_active
+        stats["tenant_max_active"] = self.tenant_max_active
+        stats["max_queue"] = self.max_queue
+        return stats
+
+
+_controller = AdmissionController()
+
+
+def get_admission() -> AdmissionController:
+    """The process-wide admission controller"""
+    return _controller
+
+
+def agent_tenant(agent) -> str:
+    return f"user:{agent.user_id}"
+
+
+def reminder_tenant(reminder) -> str:
+    return f"reminder:{reminder.email}"
@@ -0,0 +1,104 @@
+# backend/utils/api_capture.py
+
+import hashlib
+import json
+import re
+import threading
+
+import httpx
+
+from backend.utils.http_client import get_http_client
+from backend.utils.rate_limiter import rate_limiter
+from backend.utils.robots import robots_cache
+
+CAPTURED_RESOURCE_TYPES = {"xhr", "fetch"}
+
+_stats_lock = threading.Lock()
+_stats = {"captures": 0, "api_checks": 0, "api_unchanged": 0, "api_failures": 0}
+
+
+def _bump(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def json_hash(body) -> str | None:
+    """sha256 of the JSON document in canonical form, None if it is not JSON"""
+    try:
+        document = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ApiCapture:
+    """
+    Response listener for one render: remembers the GET XHR / fetch
+    responses with a JSON content type whose URL matches `pattern` (a
+    regex, searched anywhere in the URL).
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = re.compile(pattern)
+        self.candidates = []
+
+    def handle(self, response):
+        request = response.request
+        if (request.resource_type in CAPTURED_RESOURCE_TYPES and request.method == "GET" and
+                response.status == 200 and
+                "json" in response.headers.get("content-type", "") and
+                self.pattern.search(response.url)):
+            self.candidates.append(response)
+
+    async def result(self):
+        """{'url', 'hash'} of the first matching response that parsed as JSON, or None"""
+        for response in self.candidates:
+            try:
+                body = await response.body()
+            except Exception:
+                continue  # Body already evicted, e.g. after a redirect
+            digest = json_hash(body)
+            if digest:
+                _bump("captures")
+                print(f"📡 Captured JSON API: {response.url}")
+                return {"url": response.url, "hash": digest}
+        return None
+
+
+def fetch_api_hash(api_url: str) -> str | None:
+    """
+    Call a captured endpoint over plain HTTP and hash its JSON. Returns
+    None when the call fails or no longer returns JSON (e.g. it needs the
+    page's cookies), so the caller falls back to rendering.
+    """
+    _bump("api_checks")
+    if not robots_cache.is_allowed(api_url):
+        _bump("api_failures")
+        return None
+
+    rate_limiter.acquire(api_url)
+    try:
+        response = get_http_client().get(api_url, headers={"Accept": "application/json"})
+    except httpx.HTTPError as e:
+        print(f"⚠️ API fetch failed for {api_url}: {e}")
+        _bump("api_failures")
+        return None
+
+    digest = json_hash(response.content) if response.status_code == 200 else None
+    if digest is None:
+        _bump("api_failures")
+    return digest
+
+
+def record_unchanged():
+    _bump("api_unchanged")
+
+
+def get_api_capture_stats():
+    """Captured endpoints and how often they answered a check without a browser"""
+    with _stats_lock:
+        stats = dict(_stats)
+    checks = stats["api_checks"]
+    stats["renders_avoided_rate"] = round(stats["api_unchanged"] / checks, 3) if checks else 0.0
+    return stats
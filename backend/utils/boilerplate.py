@@ -0,0 +1,114 @@
+# backend/utils/boilerplate.py
+
+from collections import Counter
+from urllib.parse import urlsplit
+
+from backend.core.config import (
+    BOILERPLATE_ENABLED,
+    BOILERPLATE_MIN_PAGES,
+    BOILERPLATE_MIN_RATIO,
+    BOILERPLATE_MAX_LINES,
+)
+from backend.models.site_template import SiteTemplate
+
+
+class BoilerplateLearner:
+    """
+    Learns a host's template (navigation, footers, cookie banners) as the
+    lines that appear on at least BOILERPLATE_MIN_RATIO of its pages, and
+    strips them from page text before chunking.
+
+    Line counts persist per host, so a later crawl strips the template
+    from its first page and keeps refining it.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self._saved = SiteTemplate.get(host)
+        self.line_counts = Counter(self._saved.line_counts)
+        self.pages = self._saved.pages
+        self.stripped_lines = 0
+        self.stripped_chars = 0
+        self._template = None
+        self._template_pages = 0
+
+    def observe(self, text: str):
+        """Count each distinct line of a page once"""
+        self.pages += 1
+        self.line_counts.update({line.strip() for line in text.split("\n") if line.strip()})
+
+    def template(self):
+        """Lines currently considered boilerplate (empty until enough pages)"""
+        if self.pages < BOILERPLATE_MIN_PAGES:
+            return frozenset()
+        # Rescanning every count per page would be quadratic in a long
+        # crawl; refresh once the page count has grown by 10%
+        if self._template is None or self.pages >= self._template_pages * 1.1:
+            threshold = max(2, BOILERPLATE_MIN_RATIO * self.pages)
+            self._template = frozenset(
+                line for line, count in self.line_counts.items() if count >= threshold
+            )
+            self._template_pages = self.pages
+        return self._template
+
+    def strip(self, text: str, template=None) -> str:
+        template = self.template() if template is None else template
+        if not template:
+            return text
+        kept = []
+        for line in text.split("\n"):
+            if line.strip() in template:
+                self.stripped_lines += 1
+                self.stripped_chars += len(line)
+            else:
+                kept.append(line)
+        return "\n".join(kept)
+
+    def strip_pages(self, pages):
+        """
+        Pipeline stage over page dicts ({'url', 'title', 'text'}): yields
+        copies with the template removed. While a new host has no usable
+        template yet, the first BOILERPLATE_MIN_PAGES pages are held back
+        and released once it has been learned.
+        """
+        held = []
+        for page in pages:
+            self.observe(page["text"])
+            if self.pages < BOILERPLATE_MIN_PAGES:
+                held.append(page)
+                continue
+
+            template = self.template()
+            for waiting in (*held, page):
+                yield {**waiting, "text": self.strip(waiting["text"], template)}
+            held = []
+
+        template = self.template()
+        for waiting in held:
+            yield {**waiting, "text": self.strip(waiting["text"], template)}
+
+    def save(self):
+        """Persist the most frequent lines (seen on 2+ pages) for this host"""
+        frequent = [
+            (line, count) for line, count in self.line_counts.most_common(BOILERPLATE_MAX_LINES)
+            if count >= 2
+        ]
+        self._saved.line_counts = dict(frequent)
+        self._saved.pages = self.pages
+        self._saved.save()
+
+    def stats(self):
+        return {
+            "host": self.host,
+            "pages_seen": self.pages,
+            "template_lines": len(self.template()),
+            "stripped_lines": self.stripped_lines,
+            "stripped_chars": self.stripped_chars,
+        }
+
+
+def new_boilerplate_learner(start_url: str):
+    """A BoilerplateLearner for the crawl's host, or None when disabled"""
+    if not BOILERPLATE_ENABLED:
+        return None
+    return BoilerplateLearner(urlsplit(start_url).netloc.lower())
@@ -0,0 +1,76 @@
+# backend/utils/browser_cache.py
+
+import os
+import shutil
+import threading
+
+from backend.core.config import (
+    BROWSER_DISK_CACHE_ENABLED,
+    BROWSER_DISK_CACHE_DIR,
+    BROWSER_DISK_CACHE_MAX_BYTES,
+)
+
+# Chromium enforces --disk-cache-size itself; a profile that still grew
+# past this (code cache, service worker storage) is wiped on relaunch
+PROFILE_SLACK = 1.5
+
+_stats_lock = threading.Lock()
+_stats = {"responses": 0, "disk_cache_hits": 0, "hit_bytes": 0, "profile_wipes": 0}
+
+
+def profile_dir(slot_index: int) -> str:
+    return os.path.join(BROWSER_DISK_CACHE_DIR, f"browser-{slot_index}")
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # Chromium may delete cache entries while we walk
+    return total
+
+
+def prepare_profile(slot_index: int) -> str:
+    """
+    Profile directory for a pool slot's persistent browser, wiped first
+    if it outgrew the cap. Blocking, call off the event loop.
+    """
+    path = profile_dir(slot_index)
+    if os.path.isdir(path) and _dir_size(path) > BROWSER_DISK_CACHE_MAX_BYTES * PROFILE_SLACK:
+        print(f"🧹 Browser profile {path} over size cap, wiping")
+        shutil.rmtree(path, ignore_errors=True)
+        with _stats_lock:
+            _stats["profile_wipes"] += 1
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def launch_args():
+    return [f"--disk-cache-size={BROWSER_DISK_CACHE_MAX_BYTES}"]
+
+
+def record_response(response: dict):
+    """Count one CDP Network.responseReceived `response` payload"""
+    with _stats_lock:
+        _stats["responses"] += 1
+        if response.get("fromDiskCache"):
+            _stats["disk_cache_hits"] += 1
+            _stats["hit_bytes"] += int(response.get("encodedDataLength") or 0)
+
+
+def get_disk_cache_stats():
+    """Cache hit rate across rendered pages and on-disk profile size"""
+    with _stats_lock:
+        stats = dict(_stats)
+    responses = stats["responses"]
+    stats["hit_rate"] = round(stats["disk_cache_hits"] / responses, 3) if responses else 0.0
+    stats["enabled"] = BROWSER_DISK_CACHE_ENABLED
+    stats["max_bytes"] = BROWSER_DISK_CACHE_MAX_BYTES
+    stats["size_bytes"] = (
+        _dir_size(BROWSER_DISK_CACHE_DIR)
+        if BROWSER_DISK_CACHE_ENABLED and os.path.isdir(BROWSER_DISK_CACHE_DIR) else 0
+    )
+    return stats
@@ -0,0 +1,207 @@
+# backend/utils/browser_extraction.py
+
+import asyncio
+
+from backend.utils.extraction import (
+    LANDMARK_RANKS,
+    ROLE_MAIN_RANK,
+    CLASS_LANDMARK_RANKS,
+    ID_LANDMARK_RANKS,
+    MIN_CONTENT_CHARS,
+    PARAGRAPH_TAGS,
+    BLOCK_TAGS,
+    TAG_WEIGHTS,
+    POSITIVE_HINTS,
+    NEGATIVE_HINTS,
+    clean_text_minimal,
+)
+
+EXTRACTION_MODE_PYTHON = "python"
+EXTRACTION_MODE_BROWSER = "browser"
+
+# Same rules as extraction.find_main_content, passed to the page
+# so both paths score against one set of constants
+_SCORING = {
+    "landmarkRanks": LANDMARK_RANKS,
+    "roleMainRank": ROLE_MAIN_RANK,
+    "classLandmarkRanks": CLASS_LANDMARK_RANKS,
+    "idLandmarkRanks": ID_LANDMARK_RANKS,
+    "minContentChars": MIN_CONTENT_CHARS,
+    "paragraphTags": sorted(PARAGRAPH_TAGS),
+    "blockTags": sorted(BLOCK_TAGS),
+    "tagWeights": TAG_WEIGHTS,
+    "positiveHints": POSITIVE_HINTS.pattern,
+    "negativeHints": NEGATIVE_HINTS.pattern,
+}
+
+# Port of extraction._extract. Mutates the live DOM (removes
+# scripts etc.), so run it only once the page is no longer needed.
+_EXTRACT_JS = r"""
+([cssSelector, xpath, cfg]) => {
+  // Text under <rt>/<rp> is skipped like bs4's string containers;
+  // <template> content is not part of the DOM tree at all
+  const inContainer = (node, root) => {
+    for (let el = node.parentElement; el && el !== root.parentElement; el = el.parentElement) {
+      if (el.tagName === "RT" || el.tagName === "RP") return true;
+    }
+    return false;
+  };
+
+  // get_text(strip=True, separator="\n")
+  const textOf = (root) => {
+    const parts = [];
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+      const value = walker.currentNode.nodeValue.trim();
+      if (value && !inContainer(walker.currentNode, root)) parts.push(value);
+    }
+    return parts.join("\n");
+  };
+
+  // Links are collected before cleanup, resolved by the browser
+  const hrefs = Array.from(document.querySelectorAll("a[href]"), a => a.href);
+
+  for (const el of document.querySelectorAll("script, style, noscript, iframe")) el.remove();
+
+  if (cssSelector) {
+    let elements;
+    try {
+      elements = document.querySelectorAll(cssSelector);
+    } catch (e) {
+      return {unsupported: `CSS selector: ${e.message}`};
+    }
+    if (elements.length) {
+      return {text: Array.from(elements, textOf).join("\n\n"), hrefs};
+    }
+  }
+
+  if (xpath) {
+    let snapshot;
+    try {
+      snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+      return {unsupported: `XPath: ${e.message}`};
+    }
+    if (snapshot.snapshotLength) {
+      const parts = [];
+      for (let i = 0; i < snapshot.snapshotLength; i++) {
+        parts.push(snapshot.snapshotItem(i).textContent.trim());
+      }
+      return {text: parts.join("\n\n"), hrefs};
+    }
+  }
+
+  // find_main_content: one bottom-up pass
+  const paragraphTags = new Set(cfg.paragraphTags);
+  const blockTags = new Set(cfg.blockTags);
+  const positive = new RegExp(cfg.positiveHints, "i");
+  const negative = new RegExp(cfg.negativeHints, "i");
+
+  const nodes = Array.from(document.querySelectorAll("*"));
+  const stats = new Map(nodes.map(el => [el, [0, 0, 0, false]]));
+  const scores = new Map();
+  const landmarks = [];
+  const landmarkRank = (el, tag) => {
+    const ranks = [];
+    for (const name of el.classList) {
+      if (Object.hasOwn(cfg.classLandmarkRanks, name)) ranks.push(cfg.classLandmarkRanks[name]);
+    }
+    if (Object.hasOwn(cfg.idLandmarkRanks, el.id)) ranks.push(cfg.idLandmarkRanks[el.id]);
+    if (el.getAttribute("role") === "main") ranks.push(cfg.roleMainRank);
+    if (tag in cfg.landmarkRanks) ranks.push(cfg.landmarkRanks[tag]);
+    return ranks.length ? Math.min(...ranks) : null;
+  };
+
+  for (let i = nodes.length - 1; i >= 0; i--) {
+    const el = nodes[i];
+    const tag = el.localName;
+    const node = stats.get(el);
+    if (!el.closest("rt, rp")) {
+      for (const child of el.childNodes) {
+        if (child.nodeType !== Node.TEXT_NODE && child.nodeType !== Node.CDATA_SECTION_NODE) continue;
+        const value = child.nodeValue.trim();
+        if (value) {
+          node[0] += value.length;
+          node[2] += value.split(",").length - 1;
+        }
+      }
+    }
+    if (tag === "a") node[1] = node[0];
+
+    const rank = landmarkRank(el, tag);
+    if (rank !== null) landmarks.push([rank, el]);
+
+    const parent = el.parentElement;
+    const isParagraph = paragraphTags.has(tag) || ((tag === "div" || tag === "section") && !node[3]);
+    if (isParagraph && node[0] >= 25) {
+      const points = 1 + node[2] + Math.min(Math.floor(node[0] / 100), 3);
+      const grandparent = parent && parent.parentElement;
+      for (const [ancestor, share] of [[parent, 1], [grandparent, 0.5]]) {
+        if (ancestor && stats.has(ancestor)) {
+          scores.set(ancestor, (scores.get(ancestor) || 0) + points * share);
+        }
+      }
+    }
+
+    if (parent && stats.has(parent)) {
+      const up = stats.get(parent);
+      up[0] += node[0];
+      up[1] += node[1];
+      up[2] += node[2];
+      up[3] = up[3] || blockTags.has(tag);
+    }
+  }
+
+  let main = null;
+  landmarks.reverse();  // back to document order, ties keep the first
+  for (const rank of [...new Set(landmarks.map(([r]) => r))].sort((a, b) => a - b)) {
+    let best = null;
+    for (const [r, el] of landmarks) {
+      if (r === rank && (best === null || stats.get(el)[0] > stats.get(best)[0])) best = el;
+    }
+    if (stats.get(best)[0] > cfg.minContentChars) {
+      main = best;
+      break;
+    }
+  }
+
+  if (main === null) {
+    let bestScore = 0;
+    for (const el of nodes) {
+      if (!scores.has(el)) continue;
+      const [textLen, linkLen] = stats.get(el);
+      if (textLen <= cfg.minContentChars) continue;
+      let weight = cfg.tagWeights[el.localName] || 0;
+      const hints = `${el.getAttribute("class") || ""} ${el.id || ""}`;
+      if (positive.test(hints)) weight += 25;
+      if (negative.test(hints)) weight -= 25;
+      const score = (scores.get(el) + weight) * (1 - linkLen / textLen);
+      if (score > bestScore) {
+        main = el;
+        bestScore = score;
+      }
+    }
+  }
+
+  return {text: textOf(main || document.body || document.documentElement), hrefs};
+}
+"""
+
+
+async def extract_in_page(page, css_selector: str = None, xpath: str = None):
+    """
+    Run text and link extraction inside the rendered page and return
+    (text, hrefs), with `hrefs` already absolute. Only the extracted text
+    crosses over from the browser instead of the serialized DOM.
+
+    Returns None when the browser cannot evaluate the selector (e.g. a
+    soupsieve-only CSS extension); the caller should then fall back to
+    page.content() and the Python parsers.
+    """
+    result = await page.evaluate(_EXTRACT_JS, [css_selector, xpath, _SCORING])
+    if "unsupported" in result:
+        print(f"⚠️ In-browser extraction fallback: {result['unsupported']}")
+        return None
+    # Noise filtering is CPU-bound, keep it off the browser loop
+    text = await asyncio.to_thread(clean_text_minimal, result["text"])
+    return text, result["hrefs"]
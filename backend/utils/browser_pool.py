@@ -0,0 +1,343 @@
+# backend/utils/browser_pool.py
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from backend.core.config import (
+    BROWSER_POOL_SIZE,
+    BROWSER_POOL_CONTEXTS_PER_BROWSER,
+    BROWSER_POOL_MAX_USES,
+    BROWSER_DISK_CACHE_ENABLED,
+)
+from backend.utils.browser_cache import prepare_profile, launch_args
+
+
+class _BrowserSlot:
+    """One warm Chromium instance owned by the pool"""
+
+    def __init__(self, index):
+        self.index = index
+        self.browser = None
+        self.persistent = None  # launch_persistent_context() in disk cache mode
+        self.closed = False
+        self.uses = 0
+        self.active = 0
+
+    def connected(self):
+        if self.persistent is not None:
+            return not self.closed
+        return self.browser is not None and self.browser.is_connected()
+
+    async def close(self):
+        try:
+            if self.persistent is not None:
+                await self.persistent.close()
+            elif self.browser is not None:
+                await self.browser.close()
+        except Exception:
+            pass
+
+
+class _SharedContext:
+    """
+    A disk-cache browser's persistent context as seen by one call. Pages
+    it opens are closed on close(); the context itself stays open.
+    """
+
+    def __init__(self, context):
+        self._context = context
+        self._pages = []
+
+    async def new_page(self):
+        page = await self._context.new_page()
+        self._pages.append(page)
+        return page
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Chromium browsers.
+
+    Playwright objects are bound to the event loop that created them, so the
+    pool runs its own event loop on a daemon thread and every browser lives
+    there. Sync callers (scheduler jobs, worker threads) use `run()`, async
+    callers (FastAPI routes) use `run_async()`. Both hand a coroutine function
+    a fresh, isolated BrowserContext which is closed when the call returns.
+
+    With BROWSER_DISK_CACHE_ENABLED each browser is instead launched with a
+    persistent profile (and HTTP disk cache) of its own, and calls share
+    that profile's context; only the pages they open are closed.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE,
+                 contexts_per_browser=BROWSER_POOL_CONTEXTS_PER_BROWSER,
+                 max_uses=BROWSER_POOL_MAX_USES):
+        self.size = size
+        self.contexts_per_browser = contexts_per_browser
+        self.max_uses = max_uses
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # Created on the pool loop in _start()
+        self._playwright = None
+        self._slots = []
+        self._slot_lock = None
+        self._capacity = None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "launches": 0,
+            "relaunches": 0,
+            "health_failures": 0,
+            "retirements": 0,
+            "contexts_served": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            thread.start()
+
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+            except Exception:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=5)
+                raise
+
+            self._loop = loop
+            self._thread = thread
+
+    async def _start(self):
+        self._slot_lock = asyncio.Lock()
+        self._capacity = asyncio.Semaphore(self.size * self.contexts_per_browser)
+        self._playwright = await async_playwright().start()
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+
+        for slot in self._slots:
+            await self._launch(slot)
+
+        print(f"🌐 Browser pool ready ({self.size} browsers)")
+
+    async def _launch(self, slot):
+        if slot.browser is not None or slot.persistent is not None:
+            await slot.close()
+            self._bump("relaunches")
+
+        if BROWSER_DISK_CACHE_ENABLED:
+            profile = await asyncio.to_thread(prepare_profile, slot.index)
+            slot.persistent = await self._playwright.chromium.launch_persistent_context(
+                profile, headless=True, args=launch_args()
+            )
+            slot.closed = False
+            slot.persistent.on("close", lambda _: setattr(slot, "closed", True))
+        else:
+            slot.browser = await self._playwright.chromium.launch(headless=True)
+        slot.uses = 0
+        self._bump("launches")
+
+    def warm_up(self):
+        """Start the pool loop and launch all browsers ahead of the first request"""
+        self._ensure_loop()
+
+    def shutdown(self):
+        """Close every browser and stop the pool loop"""
+        if self._loop is None:
+            return
+
+        async def _close():
+            for slot in self._slots:
+                await slot.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout=30)
+        except Exception as e:
+            print(f"⚠️ Error closing browser pool: {e}")
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+        print("🛑 Browser pool stopped")
+
+    # ----------------------------------------
+    # Context hand-out
+    # ----------------------------------------
+
+    async def _checkout(self):
+        async with self._slot_lock:
+            # Least busy browser first, so contexts spread over the pool
+            slot = min(self._slots, key=lambda s: s.active)
+
+            # Health check: relaunch crashed or disconnected browsers
+            if not slot.connected():
+                self._bump("health_failures")
+                print(f"⚠️ Browser {slot.index} unhealthy, relaunching")
+                await self._launch(slot)
+
+            # Recycle browsers that have served enough contexts
+            elif slot.uses >= self.max_uses and slot.active == 0:
+                await self._launch(slot)
+
+            slot.uses += 1
+            slot.active += 1
+            return slot
+
+    def retire(self, browser) -> bool:
+        """
+        Mark a pooled browser (or persistent context) for relaunch as soon
+        as no call is using it, e.g. after a renderer crash. Returns False
+        if it is not ours.
+        """
+        for slot in self._slots:
+            if browser is not None and browser in (slot.browser, slot.persistent):
+                slot.uses = max(slot.uses, self.max_uses)
+                self._bump("retirements")
+                return True
+        return False
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Async context manager yielding an isolated BrowserContext.
+        Must be used from inside the pool loop (i.e. from a function
+        passed to `run()` / `run_async()`).
+        """
+        started = time.perf_counter()
+        await self._capacity.acquire()
+        wait_ms = (time.perf_counter() - started) * 1000
+
+        with self._stats_lock:
+            self._stats["contexts_served"] += 1
+            self._stats["total_wait_ms"] += wait_ms
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+        slot = None
+        browser_context = None
+        try:
+            slot = await self._checkout()
+            if slot.persistent is not None:
+                browser_context = _SharedContext(slot.persistent)
+            else:
+                browser_context = await slot.browser.new_context(**context_options)
+            yield browser_context
+        finally:
+            if browser_context is not None:
+                try:
+                    await browser_context.close()
+                except Exception:
+                    pass
+            if slot is not None:
+                slot.active -= 1
+                if slot.persistent is not None and slot.active == 0:
+                    # Keep the cache, not one scrape's session
+                    try:
+                        await slot.persistent.clear_cookies()
+                    except Exception:
+                        pass
+            self._capacity.release()
+
+    async def _run_in_context(self, fn, args, kwargs):
+        async with self.context() as browser_context:
+            return await fn(browser_context, *args, **kwargs)
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """
+        Run `async fn(context, *args, **kwargs)` on a pooled browser and
+        block until it finishes. For use from sync code.
+        """
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_in_context(fn, args, kwargs), self._loop
+        )
+        return future.result(timeout=timeout)
+
+    async def run_async(self, fn, *args, **kwargs):
+        """Same as `run()`, awaitable from any other event loop"""
+        await asyncio.to_thread(self._ensure_loop)
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_in_context(fn, args, kwargs), self._loop
+        )
+        return await asyncio.wrap_future(future)
+
+    # ----------------------------------------
+    # Metrics
+    # ----------------------------------------
+
+    def _bump(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        """Pool metrics for sizing: launches, waits and current load"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        served = stats["contexts_served"]
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / served, 2) if served else 0.0
+        stats["total_wait_ms"] = round(stats["total_wait_ms"], 2)
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 2)
+        stats["size"] = self.size
+        stats["contexts_per_browser"] = self.contexts_per_browser
+        stats["disk_cache"] = BROWSER_DISK_CACHE_ENABLED
+        stats["running"] = self._loop is not None
+        stats["browsers"] = [
+            {
+                "index": slot.index,
+                "connected": slot.connected(),
+                "uses": slot.uses,
+                "active_contexts": slot.active,
+            }
+            for slot in self._slots
+        ]
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def shutdown_browser_pool():
+    """Close the process-wide browser pool if it was started"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
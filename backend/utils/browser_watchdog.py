@@ -0,0 +1,202 @@
+# backend/utils/browser_watchdog.py
+
+import threading
+
+from backend.core.config import (
+    WATCHDOG_MAX_HEAP_MB,
+    WATCHDOG_PAGE_MAX_NAVIGATIONS,
+    WATCHDOG_CONTEXT_MAX_NAVIGATIONS,
+)
+from backend.utils.browser_pool import get_browser_pool
+
+_MB = 1024 * 1024
+
+_stats_lock = threading.Lock()
+_stats = {
+    "checks": 0,
+    "page_recycles": 0,
+    "context_recycles": 0,
+    "browser_recycles": 0,
+    "crashes": 0,
+    "peak_heap_mb": 0.0,
+}
+
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class PageWatchdog:
+    """
+    Hands out the pages a long crawl works with and recycles them before
+    they grow without bound.
+
+    After every navigation `check(page)` reads the renderer's JS heap over
+    CDP and counts the page's navigations. The page is replaced by a fresh
+    one when the heap passes WATCHDOG_MAX_HEAP_MB, after
+    WATCHDOG_PAGE_MAX_NAVIGATIONS, or when its renderer crashed. Once the
+    context has served WATCHDOG_CONTEXT_MAX_NAVIGATIONS pages (cache,
+    cookies and service workers pile up there) new pages go to a fresh
+    context, and the old one is closed when its last page is. A crashed
+    renderer also retires its browser in the pool, which relaunches it
+    once it is idle.
+
+    Recycling only swaps pages under the workers; the crawl frontier and
+    results are untouched.
+    """
+
+    def __init__(self, context, setup_page=None,
+                 max_heap_mb: float = WATCHDOG_MAX_HEAP_MB,
+                 page_max_navigations: int = WATCHDOG_PAGE_MAX_NAVIGATIONS,
+                 context_max_navigations: int = WATCHDOG_CONTEXT_MAX_NAVIGATIONS):
+        self.base_context = context
+        self.context = context
+        self.setup_page = setup_page  # async fn(page), e.g. request routing
+        self.max_heap_mb = max_heap_mb
+        self.page_max_navigations = page_max_navigations
+        self.context_max_navigations = context_max_navigations
+
+        self._context_navigations = 0
+        self._open = {}  # context -> set of open pages
+        self._page_navigations = {}
+        self._page_context = {}  # page -> context it was opened from
+        self._cdp = {}
+        self._crashed = set()
+        self.page_recycles = 0
+        self.context_recycles = 0
+        self.browser_recycles = 0
+        self.peak_heap_mb = 0.0
+
+    async def new_page(self):
+        page = await self.context.new_page()
+        self._open.setdefault(self.context, set()).add(page)
+        self._page_navigations[page] = 0
+        self._page_context[page] = self.context
+        page.on("crash", lambda _: self._crashed.add(page))
+        if self.setup_page is not None:
+            await self.setup_page(page)
+        return page
+
+    async def _heap_mb(self, page):
+        """Used JS heap of the page's renderer, None if CDP is unavailable"""
+        try:
+            session = self._cdp.get(page)
+            if session is None:
+                session = await page.context.new_cdp_session(page)
+                await session.send("Performance.enable")
+                self._cdp[page] = session
+            metrics = await session.send("Performance.getMetrics")
+        except Exception:
+            return None
+        for metric in metrics.get("metrics", []):
+            if metric["name"] == "JSHeapUsedSize":
+                return metric["value"] / _MB
+        return None
+
+    async def check(self, page):
+        """
+        Call after each navigation. Returns the page the worker should use
+        next: the same one, or a fresh replacement.
+        """
+        self._page_navigations[page] += 1
+        self._context_navigations += 1
+        _bump("checks")
+
+        reason = None
+        if page in self._crashed or page.is_closed():
+            reason = "crash"
+        else:
+            heap_mb = await self._heap_mb(page)
+            if heap_mb is not None:
+                self.peak_heap_mb = max(self.peak_heap_mb, heap_mb)
+                with _stats_lock:
+                    _stats["peak_heap_mb"] = max(_stats["peak_heap_mb"], round(heap_mb, 1))
+                if heap_mb > self.max_heap_mb:
+                    reason = f"heap {heap_mb:.0f} MB"
+            if reason is None and self._page_navigations[page] >= self.page_max_navigations:
+                reason = f"{self._page_navigations[page]} navigations"
+
+        if reason == "crash":
+            _bump("crashes")
+            await self._recycle_browser(page)
+        if self._context_navigations >= self.context_max_navigations:
+            await self._recycle_context()
+
+        if reason is None and self._page_context[page] is self.context:
+            return page
+
+        print(f"♻️ Recycling crawl page ({reason or 'context recycled'})")
+        self.page_recycles += 1
+        _bump("page_recycles")
+        await self._close_page(page)
+        return await self.new_page()
+
+    async def _recycle_context(self):
+        """Send new pages to a fresh context on the same browser"""
+        served, self._context_navigations = self._context_navigations, 0
+        if self.base_context.browser is None:
+            # Persistent (disk cache) profile: a new context would drop the cache
+            return
+        print(f"♻️ Recycling crawl context after {served} pages")
+        self.context = await self.base_context.browser.new_context()
+        self.context_recycles += 1
+        _bump("context_recycles")
+
+    async def _recycle_browser(self, page):
+        """Ask the pool to relaunch the crashed page's browser once idle"""
+        browser = page.context.browser or page.context
+        if get_browser_pool().retire(browser):
+            self.browser_recycles += 1
+            _bump("browser_recycles")
+
+    async def _close_page(self, page):
+        context = self._page_context.pop(page, None)
+        self._page_navigations.pop(page, None)
+        self._crashed.discard(page)
+        session = self._cdp.pop(page, None)
+        try:
+            if session is not None:
+                await session.detach()
+            await page.close()
+        except Exception:
+            pass
+
+        open_pages = self._open.get(context, set())
+        open_pages.discard(page)
+        # The pool closes the context it handed out; ours we close here
+        if not open_pages and context is not self.context and context is not self.base_context:
+            self._open.pop(context, None)
+            await self._close_context(context)
+
+    async def _close_context(self, context):
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Close every context the watchdog created"""
+        for context in list(self._open):
+            if context is not self.base_context:
+                await self._close_context(context)
+        self._open.clear()
+        self._cdp.clear()
+
+    def stats(self):
+        return {
+            "page_recycles": self.page_recycles,
+            "context_recycles": self.context_recycles,
+            "browser_recycles": self.browser_recycles,
+            "peak_heap_mb": round(self.peak_heap_mb, 1),
+        }
+
+
+def get_watchdog_stats():
+    """Recycles by level and the highest renderer heap seen, process-wide"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["max_heap_mb"] = WATCHDOG_MAX_HEAP_MB
+    stats["page_max_navigations"] = WATCHDOG_PAGE_MAX_NAVIGATIONS
+    stats["context_max_navigations"] = WATCHDOG_CONTEXT_MAX_NAVIGATIONS
+    return stats
@@ -0,0 +1,93 @@
+# backend/utils/crawl_budget.py
+
+import time
+
+from backend.core.config import (
+    CRAWL_MAX_SECONDS,
+    CRAWL_MAX_BYTES,
+    CRAWL_MAX_DEPTH,
+    CRAWL_MAX_PAGE_BYTES,
+)
+
+BUDGET_TIME = "time"
+BUDGET_BYTES = "bytes"
+BUDGET_PAGES = "max_pages"
+
+
+def _limit(value, default):
+    """None -> server default; 0 (either way) -> unlimited"""
+    value = default if value is None else value
+    return value if value and value > 0 else None
+
+
+class CrawlBudget:
+    """
+    Limits for one crawl besides max_pages: wall-clock seconds, document
+    bytes downloaded, link depth and bytes per page. Each limit is None
+    for "use the CRAWL_MAX_* default", and 0 means unlimited.
+
+    Time and bytes end the crawl: workers finish the page they are on and
+    stop taking new ones, so the crawl returns what it has. Depth and
+    per-page size only skip the links / pages that exceed them.
+    """
+
+    def __init__(self, max_seconds: int = None, max_bytes: int = None,
+                 max_depth: int = None, max_page_bytes: int = None):
+        self.max_seconds = _limit(max_seconds, CRAWL_MAX_SECONDS)
+        self.max_bytes = _limit(max_bytes, CRAWL_MAX_BYTES)
+        self.max_depth = _limit(max_depth, CRAWL_MAX_DEPTH)
+        self.max_page_bytes = _limit(max_page_bytes, CRAWL_MAX_PAGE_BYTES)
+
+        self.started = time.monotonic()
+        self.bytes_downloaded = 0
+        self.pages_over_size = 0
+        self.links_beyond_depth = 0
+        self.stopped_by = None
+
+    def start(self):
+        """Restart the clock, e.g. once the crawl actually has a browser"""
+        self.started = time.monotonic()
+
+    def exhausted(self):
+        """Name of the budget that ends the crawl, or None to keep going"""
+        if self.stopped_by:
+            return self.stopped_by
+        if self.max_seconds and time.monotonic() - self.started >= self.max_seconds:
+            self.stopped_by = BUDGET_TIME
+        elif self.max_bytes and self.bytes_downloaded >= self.max_bytes:
+            self.stopped_by = BUDGET_BYTES
+        return self.stopped_by
+
+    def record_page(self, size: int) -> bool:
+        """
+        Count a document's bytes: its Content-Length as soon as the headers
+        arrive, else its transfer size once loaded. Returns False if it is
+        too large to process.
+        """
+        self.bytes_downloaded += size
+        if self.max_page_bytes and size > self.max_page_bytes:
+            self.pages_over_size += 1
+            return False
+        return True
+
+    def allows_depth(self, depth: int, link_count: int = 1) -> bool:
+        """Whether links at `depth` may be queued; counts the ones that may not"""
+        if self.max_depth is not None and depth > self.max_depth:
+            self.links_beyond_depth += link_count
+            return False
+        return True
+
+    def report(self):
+        return {
+            "stopped_by": self.stopped_by,
+            "elapsed_s": round(time.monotonic() - self.started, 1),
+            "bytes_downloaded": self.bytes_downloaded,
+            "pages_over_size": self.pages_over_size,
+            "links_beyond_depth": self.links_beyond_depth,
+            "limits": {
+                "max_seconds": self.max_seconds,
+                "max_bytes": self.max_bytes,
+                "max_depth": self.max_depth,
+                "max_page_bytes": self.max_page_bytes,
+            },
+        }
@@ -0,0 +1,185 @@
+# backend/utils/extraction.py
+
+import re
+from backend.utils.html_parsers import get_parser, SOUP_PARSER, UnsupportedInput
+from backend.utils.text_cleaning import DEFAULT_NOISE_FILTER
+
+
+def extract_text_from_html(html_content: str, css_selector: str = None, xpath: str = None):
+    """Extract text with MINIMAL cleaning to preserve content"""
+    text, _ = extract_text_and_links(html_content, css_selector, xpath, with_links=False)
+    return text
+
+
+def extract_text_and_links(html_content: str, css_selector: str = None, xpath: str = None,
+                           with_links: bool = True, parser=None):
+    """
+    Parse once with the configured backend and return (text, hrefs).
+    `hrefs` are the raw href values of every <a> in document order,
+    collected before cleanup. Anything the fast backend cannot handle
+    is redone with BeautifulSoup.
+    """
+    if not html_content or not html_content.strip():
+        return "", []
+    
+    parser = parser or get_parser()
+    try:
+        return _extract(parser, html_content, css_selector, xpath, with_links)
+    except UnsupportedInput as e:
+        print(f"⚠️ {parser.name} parser fallback: {e}")
+        return _extract(SOUP_PARSER, html_content, css_selector, xpath, with_links)
+
+
+def _extract(parser, html_content: str, css_selector: str, xpath: str, with_links: bool):
+    tree = parser.parse(html_content)
+    links = parser.links(tree) if with_links else []
+    
+    # Step 1: Remove only truly useless tags
+    parser.drop_tags(tree, ["script", "style", "noscript", "iframe"])
+    
+    # Step 2: If user provided selector, use it
+    if css_selector:
+        elements = parser.select(tree, css_selector)
+        if elements:
+            text = "\n\n".join(parser.text(el) for el in elements)
+            return clean_text_minimal(text), links
+    
+    if xpath:
+        elements = parser.xpath(tree, xpath)
+        if elements:
+            text = "\n\n".join(el.xpath("string()").strip() for el in elements)
+            return clean_text_minimal(text), links
+    
+    # Step 3: Try to find main content area
+    main_content = find_main_content(tree, parser)
+    if main_content is not None:
+        return clean_text_minimal(parser.text(main_content)), links
+    
+    # Step 4: Fallback - get body text
+    body = parser.body(tree)
+    if body is not None:
+        return clean_text_minimal(parser.text(body)), links
+    
+    # Last resort
+    return clean_text_minimal(parser.text(tree)), links
+
+
+# Landmarks win outright when they hold enough text, in this order
+LANDMARK_RANKS = {"main": 0, "article": 1}
+ROLE_MAIN_RANK = 2
+# then the usual content wrappers: .main-content, #main-content, .content, #content
+CLASS_LANDMARK_RANKS = {"main-content": 3, "content": 5}
+ID_LANDMARK_RANKS = {"main-content": 4, "content": 6}
+MIN_CONTENT_CHARS = 200
+
+# Readability-style scoring for pages without usable landmarks
+PARAGRAPH_TAGS = {"p", "pre", "td", "blockquote"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dl", "div", "fieldset", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main",
+    "nav", "ol", "p", "pre", "section", "table", "ul",
+}
+TAG_WEIGHTS = {
+    "div": 5, "section": 5, "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+    "nav": -25, "header": -25, "footer": -25, "aside": -25,
+}
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|main|page|post|text|blog|story", re.I)
+NEGATIVE_HINTS = re.compile(
+    r"comment|footer|footnote|masthead|meta|nav|menu|sidebar|sponsor|share|social|"
+    r"related|promo|banner|header|widget|popup|cookie", re.I
+)
+
+
+def _landmark_rank(tag, hints, role):
+    """Best landmark rank of an element, None if it is not a landmark"""
+    classes, _, el_id = hints.rpartition(" ")
+    ranks = [CLASS_LANDMARK_RANKS[c] for c in classes.split() if c in CLASS_LANDMARK_RANKS]
+    if el_id in ID_LANDMARK_RANKS:
+        ranks.append(ID_LANDMARK_RANKS[el_id])
+    if role == "main":
+        ranks.append(ROLE_MAIN_RANK)
+    if tag in LANDMARK_RANKS:
+        ranks.append(LANDMARK_RANKS[tag])
+    return min(ranks) if ranks else None
+
+
+def find_main_content(tree, parser=None):
+    """
+    Find the main content block in one bottom-up pass over the tree.
+
+    <main>, <article>, role="main" and then the .main-content /
+    #main-content / .content / #content wrappers are taken as-is when they
+    hold more than MIN_CONTENT_CHARS of text. Otherwise every paragraph-like block
+    scores its parent and grandparent by length and commas, and the best
+    container is chosen after tag / class weights and link density.
+    """
+    parser = parser or SOUP_PARSER
+    nodes = list(parser.iter_nodes(tree))
+    parents = {id(el): parent for el, parent, *_ in nodes}
+
+    # id(el) -> [text_len, link_len, commas, has_block_child]
+    stats = {id(el): [0, 0, 0, False] for el, *_ in nodes}
+    scores = {}
+    landmarks = []
+
+    # Children follow their parent in document order, so walking it
+    # backwards finishes every subtree before its root
+    for el, parent, tag, hints, role, strings in reversed(nodes):
+        node = stats[id(el)]
+        node[0] += sum(len(s) for s in strings)
+        node[2] += sum(s.count(",") for s in strings)
+        if tag == "a":
+            node[1] = node[0]
+
+        rank = _landmark_rank(tag, hints, role)
+        if rank is not None:
+            landmarks.append((rank, el))
+
+        is_paragraph = tag in PARAGRAPH_TAGS or (tag in ("div", "section") and not node[3])
+        if is_paragraph and node[0] >= 25:
+            points = 1 + node[2] + min(node[0] // 100, 3)
+            grandparent = parents.get(id(parent))
+            for ancestor, share in ((parent, 1), (grandparent, 0.5)):
+                if ancestor is not None and id(ancestor) in stats:
+                    scores[id(ancestor)] = scores.get(id(ancestor), 0) + points * share
+
+        if id(parent) in stats:
+            up = stats[id(parent)]
+            up[0] += node[0]
+            up[1] += node[1]
+            up[2] += node[2]
+            up[3] = up[3] or tag in BLOCK_TAGS
+
+    for rank in sorted({rank for rank, _ in landmarks}):
+        # Reverse back to document order so ties keep the first element
+        group = [el for r, el in reversed(landmarks) if r == rank]
+        best = max(group, key=lambda e: stats[id(e)][0])
+        if stats[id(best)][0] > MIN_CONTENT_CHARS:
+            return best
+
+    best, best_score = None, 0
+    for el, parent, tag, hints, role, strings in nodes:
+        if id(el) not in scores:
+            continue
+        text_len, link_len = stats[id(el)][:2]
+        if text_len <= MIN_CONTENT_CHARS:
+            continue
+        weight = TAG_WEIGHTS.get(tag, 0)
+        if POSITIVE_HINTS.search(hints):
+            weight += 25
+        if NEGATIVE_HINTS.search(hints):
+            weight -= 25
+        score = (scores[id(el)] + weight) * (1 - link_len / text_len)
+        if score > best_score:
+            best, best_score = el, score
+    
+    return best
+
+
+def clean_text_minimal(text: str) -> str:
+    """
+    MINIMAL cleaning - only remove obvious noise
+    """
+    return DEFAULT_NOISE_FILTER.clean(text)
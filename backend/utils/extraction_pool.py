@@ -0,0 +1,204 @@
+# backend/utils/extraction_pool.py
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urljoin, urlparse
+
+from backend.core.config import EXTRACTION_WORKERS
+# Parsing only (bs4 / lxml, no Playwright or HTTP client), which is all
+# the worker processes load
+from backend.utils.extraction import extract_text_and_links
+
+SKIPPED_LINK_EXTENSIONS = ('.pdf', '.jpg', '.png', '.zip')
+
+
+def scope_links(hrefs, base_url: str, link_scope: str = None):
+    """Absolute links on the link scope's host, minus binary downloads"""
+    scope = urlparse(link_scope or base_url).netloc
+    links = []
+    for href in hrefs:
+        absolute_url = urljoin(base_url, href)
+        if (urlparse(absolute_url).netloc == scope and
+                not absolute_url.endswith(SKIPPED_LINK_EXTENSIONS)):
+            links.append(absolute_url)
+    return links
+
+
+def _extract_task(html_content: str, css_selector: str = None, xpath: str = None,
+                  base_url: str = None, link_scope: str = None, submitted_at: float = None):
+    """
+    Runs inside a worker process. Returns (text, links, timing) where
+    `links` are absolute same-domain links when `base_url` is given.
+    """
+    started = time.time()
+    text, hrefs = extract_text_and_links(html_content, css_selector, xpath, with_links=bool(base_url))
+
+    links = scope_links(hrefs, base_url, link_scope) if base_url else []
+
+    finished = time.time()
+    timing = {
+        "parse_ms": (finished - started) * 1000,
+        "queue_ms": (started - submitted_at) * 1000 if submitted_at else 0.0,
+        "pid": os.getpid(),
+    }
+    return text, links, timing
+
+
+class ExtractionPool:
+    """
+    Process pool for CPU-bound HTML parsing, shared by the crawler, the
+    fetch tiers (scheduler, reminders, /api/scrape) and cache replay.
+
+    Parsing in separate processes keeps the GIL free for the browser loop
+    and uses every core. With workers=-1 tasks run in the calling thread,
+    which is also the fallback if the pool cannot be started.
+    """
+
+    def __init__(self, workers=EXTRACTION_WORKERS):
+        self.workers = workers if workers != 0 else (os.cpu_count() or 1)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=100)
+        self._stats = {
+            "tasks": 0,
+            "failures": 0,
+            "total_parse_ms": 0.0,
+            "max_parse_ms": 0.0,
+            "total_queue_ms": 0.0,
+            "max_queue_ms": 0.0,
+        }
+
+    def _get_executor(self):
+        if self.workers < 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    print(f"🧮 Extraction pool ready ({self.workers} processes)")
+                except (OSError, NotImplementedError) as e:
+                    print(f"⚠️ Extraction pool unavailable, parsing in-process: {e}")
+                    self.workers = -1
+            return self._executor
+
+    def _record(self, url, timing):
+        with self._lock:
+            self._stats["tasks"] += 1
+            self._stats["total_parse_ms"] += timing["parse_ms"]
+            self._stats["max_parse_ms"] = max(self._stats["max_parse_ms"], timing["parse_ms"])
+            self._stats["total_queue_ms"] += timing["queue_ms"]
+            self._stats["max_queue_ms"] = max(self._stats["max_queue_ms"], timing["queue_ms"])
+            self._recent.append({
+                "url": url,
+                "parse_ms": round(timing["parse_ms"], 2),
+                "queue_ms": round(timing["queue_ms"], 2),
+                "pid": timing["pid"],
+            })
+
+    def _failed(self, error):
+        with self._lock:
+            self._stats["failures"] += 1
+            # A crashed worker breaks the whole executor; start a fresh one next time
+            if isinstance(error, BrokenProcessPool) and self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, html_content, css_selector, xpath, base_url, link_scope):
+        executor = self._get_executor()
+        if executor is None:
+            return None
+        return executor.submit(
+            _extract_task, html_content, css_selector, xpath, base_url, link_scope, time.time()
+        )
+
+    def extract(self, html_content: str, css_selector: str = None, xpath: str = None,
+                url: str = None, link_scope: str = None):
+        """
+        Extract text (and, when `link_scope` is given, same-domain links)
+        from HTML. Blocks the calling thread, not the pool.
+        Returns (text, links).
+        """
+        base_url = url if link_scope else None
+        try:
+            future = self._submit(html_content, css_selector, xpath, base_url, link_scope)
+            if future is None:
+                text, links, timing = _extract_task(
+                    html_content, css_selector, xpath, base_url, link_scope, time.time()
+                )
+            else:
+                text, links, timing = future.result()
+        except Exception as e:
+            self._failed(e)
+            raise
+
+        self._record(url, timing)
+        return text, links
+
+    async def extract_async(self, html_content: str, css_selector: str = None, xpath: str = None,
+                            url: str = None, link_scope: str = None):
+        """Async version of extract, awaits the worker without blocking the loop"""
+        base_url = url if link_scope else None
+        try:
+            future = self._submit(html_content, css_selector, xpath, base_url, link_scope)
+            if future is None:
+                text, links, timing = await asyncio.to_thread(
+                    _extract_task, html_content, css_selector, xpath, base_url, link_scope, time.time()
+                )
+            else:
+                text, links, timing = await asyncio.wrap_future(future)
+        except Exception as e:
+            self._failed(e)
+            raise
+
+        self._record(url, timing)
+        return text, links
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        """Task counts, parse / queue timings and the most recent tasks"""
+        with self._lock:
+            stats = dict(self._stats)
+            recent = list(self._recent)
+
+        tasks = stats["tasks"]
+        for key in ("parse_ms", "queue_ms"):
+            total = stats.pop(f"total_{key}")
+            stats[f"avg_{key}"] = round(total / tasks, 2) if tasks else 0.0
+            stats[f"max_{key}"] = round(stats[f"max_{key}"], 2)
+        stats["workers"] = self.workers
+        stats["mode"] = "in-process" if self.workers < 0 else "processes"
+        stats["running"] = self._executor is not None
+        stats["recent"] = recent
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide extraction pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool()
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Stop the extraction worker processes if they were started"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
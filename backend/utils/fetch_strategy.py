@@ -0,0 +1,233 @@
+# backend/utils/fetch_strategy.py
+
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import httpx
+
+from backend.core.config import HTTP_MIN_TEXT_CHARS
+from backend.utils.http_client import get_http_client
+from backend.utils.rate_limiter import rate_limiter
+from backend.utils.robots import robots_cache
+from backend.utils.html_cache import store_html
+from backend.utils.extraction_pool import get_extraction_pool
+from backend.utils.playwright_scraper import render_page, render_page_async
+
+STRATEGY_HTTP = "http"
+STRATEGY_BROWSER = "browser"
+
+# host -> STRATEGY_HTTP / STRATEGY_BROWSER, learned from earlier fetches
+_host_strategy = {}
+_strategy_lock = threading.Lock()
+
+
+def get_host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def get_strategy(url: str):
+    with _strategy_lock:
+        return _host_strategy.get(get_host(url))
+
+
+def remember_strategy(url: str, strategy: str):
+    with _strategy_lock:
+        _host_strategy[get_host(url)] = strategy
+
+
+def get_strategy_stats():
+    """Learned strategy per host"""
+    with _strategy_lock:
+        hosts = dict(_host_strategy)
+    return {
+        "http_hosts": sum(1 for s in hosts.values() if s == STRATEGY_HTTP),
+        "browser_hosts": sum(1 for s in hosts.values() if s == STRATEGY_BROWSER),
+        "hosts": hosts,
+    }
+
+
+def _conditional_headers(etag: str = None, last_modified: str = None):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _validators(headers):
+    """ETag / Last-Modified from response headers (either may be None)"""
+    return {
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+    }
+
+
+def _http_get(url: str, headers: dict = None):
+    """
+    Plain HTTP GET. Returns the response if it is a 304 or usable HTML,
+    otherwise None.
+    """
+    rate_limiter.acquire(url)
+    try:
+        response = get_http_client().get(url, headers=headers)
+    except httpx.HTTPError as e:
+        print(f"⚠️ HTTP fetch failed for {url}: {e}")
+        return None
+
+    if response.status_code == 304:
+        return response
+
+    content_type = response.headers.get("content-type", "")
+    if response.status_code >= 400 or "html" not in content_type:
+        return None
+
+    return response
+
+
+def _should_probe(url: str, js_only: bool) -> bool:
+    return not js_only and get_strategy(url) != STRATEGY_BROWSER
+
+
+def _http_tier(url: str, css_selector: str = None, xpath: str = None,
+               js_only: bool = False, etag: str = None, last_modified: str = None):
+    """
+    Everything that can be answered without a browser.
+
+    Returns the final fetch result (a 304 or a usable HTTP page), or None
+    when the page must be rendered. Validators are only sent for hosts
+    served over HTTP: a rendered page can change while its HTML shell
+    (and so its ETag / Last-Modified) stays the same.
+    Raises RobotsDisallowedError before any request if robots.txt forbids the URL.
+    """
+    robots_cache.check(url)
+
+    if not _should_probe(url, js_only):
+        return None
+
+    response = _http_get(url, _conditional_headers(etag, last_modified))
+    if response is None:
+        return None
+
+    validators = _validators(response.headers)
+
+    if response.status_code == 304:
+        return {
+            "html": None,
+            "text": None,
+            "strategy": STRATEGY_HTTP,
+            "not_modified": True,
+            "etag": validators["etag"] or etag,
+            "last_modified": validators["last_modified"] or last_modified,
+            "ready_ms": None,
+        }
+
+    html_content = response.text
+    text, _ = get_extraction_pool().extract(html_content, css_selector, xpath, url=url)
+
+    if len(text.strip()) < HTTP_MIN_TEXT_CHARS:
+        print(f"🌐 {get_host(url)} needs JavaScript rendering, escalating to browser")
+        return None
+
+    remember_strategy(url, STRATEGY_HTTP)
+    store_html(url, html_content)
+    return {
+        "html": html_content,
+        "text": text,
+        "strategy": STRATEGY_HTTP,
+        "not_modified": False,
+        "ready_ms": None,
+        **validators,
+    }
+
+
+def _extract_rendered(url: str, html_content: str, css_selector: str = None, xpath: str = None):
+    """Cache the rendered HTML and extract its text"""
+    store_html(url, html_content)
+    text, _ = get_extraction_pool().extract(html_content, css_selector, xpath, url=url)
+    return text
+
+
+def _browser_result(url: str, rendered: dict, text: str, js_only: bool):
+    if not js_only:
+        remember_strategy(url, STRATEGY_BROWSER)
+
+    # No validators: rendered pages are always compared by content hash
+    return {
+        "html": rendered["html"],
+        "text": text,
+        "strategy": STRATEGY_BROWSER,
+        "not_modified": False,
+        "etag": None,
+        "last_modified": None,
+        "ready_ms": rendered["ready_ms"],
+        "blocked_requests": rendered["blocked_requests"],
+        "api": rendered["api"],
+    }
+
+
+def fetch_page(url: str, css_selector: str = None, xpath: str = None,
+               js_only: bool = False, etag: str = None, last_modified: str = None,
+               ready_policy: str = None, ready_selector: str = None,
+               allow_third_party: bool = False, api_pattern: str = None):
+    """
+    Fetch a page and extract its text, cheapest tier first.
+
+    Tries the pooled HTTP client and only falls back to a Playwright render
+    when the extracted text is empty or too short, or the site is marked
+    JS-only. The outcome is remembered per host so later fetches go straight
+    to the right tier.
+
+    When `etag` / `last_modified` from the previous fetch are passed, they
+    are sent as a conditional GET to hosts served over HTTP; a 304
+    short-circuits extraction and comes back with `not_modified=True` and
+    no html/text. Browser-rendered results carry no validators.
+
+    `ready_policy` / `ready_selector` choose how long a browser render waits
+    before reading the page (see backend/utils/readiness.py).
+    `allow_third_party` lets a render load trackers / third-party scripts
+    (see backend/utils/request_blocking.py).
+    `api_pattern` captures the page's JSON API during a browser render
+    (see backend/utils/api_capture.py).
+
+    Raises RobotsDisallowedError if robots.txt forbids the URL.
+
+    Returns:
+        dict: {
+            'html': str | None, 'text': str | None,
+            'strategy': 'http' | 'browser', 'not_modified': bool,
+            'etag': str | None, 'last_modified': str | None,
+            'ready_ms': float | None,
+            'blocked_requests': int,  # browser tier only
+            'api': {'url': str, 'hash': str} | None  # browser tier only
+        }
+    """
+    result = _http_tier(url, css_selector, xpath, js_only, etag, last_modified)
+    if result:
+        return result
+
+    rendered = render_page(url, ready_policy, ready_selector, allow_third_party, api_pattern)
+    text = _extract_rendered(url, rendered["html"], css_selector, xpath)
+    return _browser_result(url, rendered, text, js_only)
+
+
+async def fetch_page_async(url: str, css_selector: str = None, xpath: str = None,
+                           js_only: bool = False, etag: str = None, last_modified: str = None,
+                           ready_policy: str = None, ready_selector: str = None,
+                           allow_third_party: bool = False, api_pattern: str = None):
+    """Async version of fetch_page for use inside FastAPI routes"""
+    result = await asyncio.to_thread(
+        _http_tier, url, css_selector, xpath, js_only, etag, last_modified
+    )
+    if result:
+        return result
+
+    rendered = await render_page_async(
+        url, ready_policy, ready_selector, allow_third_party, api_pattern
+    )
+    await asyncio.to_thread(store_html, url, rendered["html"])
+    text, _ = await get_extraction_pool().extract_async(
+        rendered["html"], css_selector, xpath, url=url
+    )
+    return _browser_result(url, rendered, text, js_only)
@@ -0,0 +1,113 @@
+# backend/utils/frontier.py
+
+from collections import deque
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change page content
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "igshid", "ref_src",
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so variants of the same page compare equal.
+
+    - lowercases scheme and host, drops default ports
+    - drops the #fragment
+    - drops tracking parameters (utm_*, gclid, fbclid, ...)
+    - sorts the remaining query parameters
+    - strips the trailing slash (except for the root path)
+
+    The result is only a dedup key; `urlencode` rewrites some queries
+    (`?a` -> `?a=`, `%20` -> `+`), so fetch the original URL instead.
+    Raises ValueError for URLs urllib cannot parse (e.g. a bad port).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username:
+        auth = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{auth}@{netloc}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class CrawlFrontier:
+    """
+    FIFO crawl frontier: a deque of (url, depth) plus a set of every
+    canonical URL ever queued, so `add` and `pop` are both O(1).
+
+    URLs are queued as given (the first variant seen wins); the canonical
+    form is only used to spot the other variants. Unparseable URLs are
+    never queued.
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._seen = set()
+
+    def add(self, url: str, depth: int = 0) -> bool:
+        """Queue a URL unless a variant of it was seen. Returns True if queued."""
+        try:
+            canonical = canonicalize_url(url)
+        except ValueError:
+            return False
+        if canonical in self._seen:
+            return False
+        self._seen.add(canonical)
+        self._queue.append((url, depth))
+        return True
+
+    def mark_seen(self, url: str):
+        """Remember a URL without queueing it (e.g. already crawled)"""
+        try:
+            self._seen.add(canonicalize_url(url))
+        except ValueError:
+            pass
+
+    def pop(self):
+        """Next (url, depth) in breadth-first order"""
+        return self._queue.popleft()
+
+    def pending(self):
+        """Queued (url, depth) pairs, oldest first"""
+        return list(self._queue)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __contains__(self, url: str):
+        try:
+            return canonicalize_url(url) in self._seen
+        except ValueError:
+            return False
+
+    @property
+    def seen_count(self):
+        return len(self._seen)
@@ -0,0 +1,145 @@
+# backend/utils/html_cache.py
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime
+
+from backend.core.config import HTML_CACHE_ENABLED, HTML_CACHE_DIR, HTML_CACHE_MAX_BYTES
+from backend.models.database import get_db_connection
+
+_evict_lock = threading.Lock()
+
+
+def _blob_path(content_hash: str) -> str:
+    return os.path.join(HTML_CACHE_DIR, content_hash[:2], f"{content_hash}.html.gz")
+
+
+def store_html(url: str, html_content: str):
+    """
+    Record a fetched page. The body is stored once per distinct content
+    (sha256, gzip-compressed); every fetch adds a (url, fetched_at) entry
+    pointing at it. Returns the content hash, or None if caching is off.
+    """
+    if not HTML_CACHE_ENABLED or not html_content:
+        return None
+
+    raw = html_content.encode("utf-8")
+    content_hash = hashlib.sha256(raw).hexdigest()
+    path = _blob_path(content_hash)
+    now = datetime.now().isoformat()
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM html_cache_blobs WHERE content_hash = ?", (content_hash,))
+        exists = cursor.fetchone() is not None
+
+        if not exists or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(raw, compresslevel=6)
+            tmp_path = f"{path}.tmp.{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+            cursor.execute("""
+                INSERT OR REPLACE INTO html_cache_blobs
+                (content_hash, raw_bytes, stored_bytes, last_used)
+                VALUES (?, ?, ?, ?)
+            """, (content_hash, len(raw), len(compressed), now))
+        else:
+            cursor.execute(
+                "UPDATE html_cache_blobs SET last_used = ? WHERE content_hash = ?",
+                (now, content_hash)
+            )
+
+        cursor.execute("""
+            INSERT INTO html_cache_entries (url, content_hash, fetched_at)
+            VALUES (?, ?, ?)
+        """, (url, content_hash, now))
+        conn.commit()
+
+    if not exists:
+        evict_if_needed()
+
+    return content_hash
+
+
+def load_html(content_hash: str):
+    """HTML for a content hash, or None if it was evicted"""
+    try:
+        with open(_blob_path(content_hash), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def latest_html(url: str):
+    """Most recently cached HTML for an exact URL, or None"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT content_hash FROM html_cache_entries
+            WHERE url = ? ORDER BY fetched_at DESC LIMIT 1
+        """, (url,))
+        row = cursor.fetchone()
+    return load_html(row["content_hash"]) if row else None
+
+
+def evict_if_needed(max_bytes: int = HTML_CACHE_MAX_BYTES):
+    """Drop least recently used blobs (and their entries) until under 90% of `max_bytes`"""
+    with _evict_lock, get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(stored_bytes), 0) AS total FROM html_cache_blobs")
+        total = cursor.fetchone()["total"]
+        if total <= max_bytes:
+            return 0
+
+        target = int(max_bytes * 0.9)
+        cursor.execute(
+            "SELECT content_hash, stored_bytes FROM html_cache_blobs ORDER BY last_used ASC"
+        )
+        victims = []
+        for row in cursor.fetchall():
+            if total <= target:
+                break
+            victims.append(row["content_hash"])
+            total -= row["stored_bytes"]
+
+        for content_hash in victims:
+            cursor.execute("DELETE FROM html_cache_entries WHERE content_hash = ?", (content_hash,))
+            cursor.execute("DELETE FROM html_cache_blobs WHERE content_hash = ?", (content_hash,))
+            try:
+                os.remove(_blob_path(content_hash))
+            except FileNotFoundError:
+                pass
+        conn.commit()
+
+    print(f"🧹 HTML cache evicted {len(victims)} blobs")
+    return len(victims)
+
+
+def cache_stats():
+    """Size and dedup figures for the raw HTML cache"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) AS blobs,
+                   COALESCE(SUM(raw_bytes), 0) AS raw_bytes,
+                   COALESCE(SUM(stored_bytes), 0) AS stored_bytes
+            FROM html_cache_blobs
+        """)
+        blobs = dict(cursor.fetchone())
+        cursor.execute("""
+            SELECT COUNT(*) AS entries, COUNT(DISTINCT url) AS urls
+            FROM html_cache_entries
+        """)
+        entries = dict(cursor.fetchone())
+
+    return {
+        "enabled": HTML_CACHE_ENABLED,
+        "max_bytes": HTML_CACHE_MAX_BYTES,
+        **blobs,
+        **entries,
+    }
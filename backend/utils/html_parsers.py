@@ -0,0 +1,218 @@
+# backend/utils/html_parsers.py
+
+from functools import lru_cache
+
+from backend.core.config import HTML_PARSER
+
+# BeautifulSoup gives strings under these tags their own types and leaves
+# them out of get_text() on ancestors; the lxml walker mirrors that
+_STRING_CONTAINERS = {"template", "rt", "rp"}
+
+
+class UnsupportedInput(Exception):
+    """The backend cannot parse this document or evaluate this selector"""
+
+
+class SoupParser:
+    """
+    The original BeautifulSoup + html.parser backend. Slowest, but it is
+    the reference output and the fallback for everything else.
+    """
+
+    name = "bs4"
+
+    def parse(self, html_content: str):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html_content, "html.parser")
+
+    def links(self, tree):
+        return [a["href"] for a in tree.find_all("a", href=True)]
+
+    def drop_tags(self, tree, tags):
+        for tag in tags:
+            for el in tree.find_all(tag):
+                el.decompose()
+
+    def select(self, tree, css_selector: str):
+        return tree.select(css_selector)
+
+    def xpath(self, tree, expression: str):
+        # html.parser has no XPath: serialize and re-parse with lxml
+        from lxml import html
+        return html.fromstring(str(tree)).xpath(expression)
+
+    def body(self, tree):
+        return tree.find("body")
+
+    def text(self, el, separator: str = "\n") -> str:
+        return el.get_text(strip=True, separator=separator)
+
+    def iter_nodes(self, tree):
+        """
+        Every element in document order as
+        (element, parent, tag, "class id" hints, role, own stripped strings)
+        """
+        from bs4 import CData, NavigableString
+        for el in tree.find_all(True):
+            classes = el.get("class") or []
+            if not isinstance(classes, str):
+                classes = " ".join(classes)
+            strings = [
+                s.strip() for s in el.children
+                if type(s) in (NavigableString, CData) and s.strip()
+            ]
+            yield el, el.parent, el.name, f"{classes} {el.get('id') or ''}", el.get("role"), strings
+
+
+class LxmlParser:
+    """
+    libxml2 via lxml. Cleanup, CSS (cssselect), XPath and main-content
+    detection all run on the same tree.
+    """
+
+    name = "lxml"
+
+    def parse(self, html_content: str):
+        from lxml import etree, html
+        try:
+            return html.document_fromstring(html_content)
+        except (etree.ParserError, ValueError) as e:
+            # Empty documents, or str input with an XML encoding declaration
+            raise UnsupportedInput(str(e)) from e
+
+    def links(self, tree):
+        return [a.get("href") for a in tree.iter("a") if a.get("href") is not None]
+
+    def drop_tags(self, tree, tags):
+        from lxml import etree
+        for el in list(tree.iter(*tags)):
+            parent = el.getparent()
+            if parent is None:
+                continue
+            # Swap in an empty comment rather than drop_tree(), which would
+            # merge the tail into the previous text node
+            placeholder = etree.Comment()
+            placeholder.tail = el.tail
+            parent.replace(el, placeholder)
+
+    def select(self, tree, css_selector: str):
+        return _css_selector(css_selector)(tree)
+
+    def xpath(self, tree, expression: str):
+        return tree.xpath(expression)
+
+    def body(self, tree):
+        return tree.find("body")
+
+    def text(self, el, separator: str = "\n") -> str:
+        return separator.join(
+            s.strip() for s in _iter_strings(el) if s.strip()
+        )
+
+    def iter_nodes(self, tree):
+        contained = set()  # elements inside a string container
+        for el in tree.iter():
+            if not isinstance(el.tag, str):
+                continue
+            parent = el.getparent()
+            if el.tag in _STRING_CONTAINERS or parent in contained:
+                contained.add(el)
+                strings = []
+            else:
+                strings = [el.text] + [child.tail for child in el]
+                strings = [s.strip() for s in strings if s and s.strip()]
+            hints = f"{el.get('class') or ''} {el.get('id') or ''}"
+            yield el, parent, el.tag, hints, el.get("role"), strings
+
+
+class Html5Parser(LxmlParser):
+    """html5-parser (gumbo): spec-compliant tree building into lxml"""
+
+    name = "html5-parser"
+
+    def parse(self, html_content: str):
+        from html5_parser import parse
+        return parse(html_content, treebuilder="lxml")
+
+
+@lru_cache(maxsize=256)
+def _css_selector(css_selector: str):
+    from cssselect import SelectorError
+    from lxml.cssselect import CSSSelector
+    try:
+        return CSSSelector(css_selector, translator="html")
+    except SelectorError as e:
+        # Selector syntax cssselect lacks but soupsieve may support
+        raise UnsupportedInput(f"CSS selector {css_selector!r}: {e}") from e
+
+
+def _iter_strings(root):
+    """
+    Text nodes under an lxml element in document order, like bs4's
+    _all_strings: a string counts only if its nearest string-container
+    ancestor matches the root's own container type
+    """
+    wanted = root.tag if root.tag in _STRING_CONTAINERS else None
+    context = next(
+        (a.tag for a in root.iterancestors() if a.tag in _STRING_CONTAINERS), None
+    )
+
+    stack = [(root, context)]
+    while stack:
+        node, context = stack.pop()
+        if isinstance(node, str):
+            if context == wanted:
+                yield node
+            continue
+
+        # Comments and processing instructions have a non-str tag
+        if not isinstance(node.tag, str):
+            continue
+
+        if node.tag in _STRING_CONTAINERS:
+            context = node.tag
+        if node.text and context == wanted:
+            yield node.text
+
+        for child in reversed(node):
+            if child.tail:
+                stack.append((child.tail, context))
+            stack.append((child, context))
+
+
+SOUP_PARSER = SoupParser()
+
+_BACKENDS = {
+    "bs4": (SoupParser, ("bs4",)),
+    "lxml": (LxmlParser, ("lxml.html", "cssselect")),
+    "html5-parser": (Html5Parser, ("html5_parser", "lxml.html", "cssselect")),
+}
+
+_parsers = {}
+
+
+def get_parser(name: str = None):
+    """
+    Parser backend by name (default: HTML_PARSER). Backends whose
+    packages are missing fall back to BeautifulSoup.
+    """
+    name = name or HTML_PARSER
+    if name in _parsers:
+        return _parsers[name]
+
+    if name not in _BACKENDS:
+        print(f"⚠️ Unknown HTML parser '{name}', using bs4")
+        parser = SOUP_PARSER
+    else:
+        backend_cls, modules = _BACKENDS[name]
+        try:
+            for module in modules:
+                __import__(module)
+            parser = backend_cls()
+        except (ImportError, RuntimeError) as e:
+            # html5-parser raises RuntimeError when built against another libxml2 than lxml
+            print(f"⚠️ HTML parser '{name}' unavailable ({e}), using bs4")
+            parser = SOUP_PARSER
+
+    _parsers[name] = parser
+    return parser
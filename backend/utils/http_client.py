@@ -0,0 +1,18 @@
+# backend/utils/http_client.py
+
+import httpx
+
+from backend.core.config import HTTP_FETCH_TIMEOUT, HTTP_USER_AGENT
+
+# Pooled client shared by every plain-HTTP fetch (keep-alive, connection reuse)
+_http_client = httpx.Client(
+    follow_redirects=True,
+    timeout=HTTP_FETCH_TIMEOUT,
+    headers={"User-Agent": HTTP_USER_AGENT},
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+
+
+def get_http_client() -> httpx.Client:
+    """The shared, pooled HTTP client"""
+    return _http_client
@@ -1,10 +1,25 @@
 # backend/utils/multi_page_scraper.py
 
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from backend.utils.playwright_scraper import extract_text_from_html
-import time
+import asyncio
+from datetime import datetime
+from urllib.parse import urlparse
+from backend.utils.browser_pool import get_browser_pool
+from backend.utils.request_blocking import RequestBlocker
+from backend.utils.browser_watchdog import PageWatchdog
+from backend.utils.crawl_budget import CrawlBudget, BUDGET_PAGES
+from backend.utils.extraction_pool import get_extraction_pool, scope_links
+from backend.utils.browser_extraction import extract_in_page, EXTRACTION_MODE_BROWSER
+from backend.utils.readiness import wait_until_ready
+from backend.utils.rate_limiter import rate_limiter
+from backend.utils.frontier import CrawlFrontier
+from backend.utils.sitemap import iter_sitemap_urls, default_sitemap_urls
+from backend.utils.robots import robots_cache
+from backend.utils.html_cache import store_html
+from backend.core.config import CRAWL_CONCURRENCY, EXTRACTION_MODE
+
+
+CRAWL_MODE_LINKS = "links"
+CRAWL_MODE_SITEMAP = "sitemap"
 
 
 def is_same_domain(url1, url2):
@@ -12,97 +27,396 @@ def is_same_domain(url1, url2):
     return urlparse(url1).netloc == urlparse(url2).netloc
 
 
-def scrape_multiple_pages(start_url: str, max_pages: int = 20, 
-                          css_selector: str = None, xpath: str = None):
+def scrape_multiple_pages(start_url: str, max_pages: int = 20,
+                          css_selector: str = None, xpath: str = None,
+                          concurrency: int = CRAWL_CONCURRENCY,
+                          ready_policy: str = None, ready_selector: str = None,
+                          crawl_mode: str = CRAWL_MODE_LINKS, since: datetime = None,
+                          crawl_job=None, page_sink=None, duplicate_filter=None,
+                          allow_third_party: bool = False,
+                          extraction_mode: str = EXTRACTION_MODE,
+                          budget: CrawlBudget = None):
     """
     Crawl multiple pages starting from a URL.
-    
+
+    crawl_mode='links' discovers pages by following same-domain links.
+    crawl_mode='sitemap' seeds the crawl from the site's sitemap(s) instead
+    and skips pages whose <lastmod> is not newer than `since`; it falls
+    back to link discovery when the site has no sitemap.
+
+    With a `crawl_job` (models.crawl_job.CrawlJob) the frontier, visited
+    set and page results are checkpointed to SQLite as the crawl goes, and
+    a job that was interrupted resumes where it stopped. Page results are
+    then read from the job instead of being returned in 'pages'.
+
+    With a `page_sink` (a utils.pipeline.BoundedStream) every page dict is
+    put on it as soon as it is extracted, instead of being collected, so
+    a consumer can embed early pages while later ones are still being
+    fetched. A full stream pauses the crawl workers.
+
+    With a `duplicate_filter` (utils.near_duplicates.NearDuplicateFilter)
+    pages whose text is a near-duplicate of one already seen are treated
+    like pages without content: never emitted, stored or embedded.
+
+    `allow_third_party` turns off tracker / third-party request blocking
+    for sites that need those scripts to render.
+
+    `extraction_mode` ('python' or 'browser', default EXTRACTION_MODE)
+    picks where text and links are extracted; see _extract_page.
+
+    A `budget` (utils.crawl_budget.CrawlBudget, CRAWL_MAX_* defaults when
+    omitted) caps wall-clock time and downloaded bytes, which end the
+    crawl with the pages fetched so far, and link depth and page size,
+    which skip what exceeds them. Page size is checked against the
+    Content-Length before the page is rendered when the server sends one.
+    'budget' in the result reports which limit stopped the crawl, if any.
+
     Returns:
         dict: {
             'pages': [
-                {'url': '...', 'text': '...', 'title': '...'},
+                {'url': '...', 'text': '...', 'title': '...', 'ready_ms': float,
+                 'blocked_requests': int},
                 ...
             ],
             'total_pages': int,
-            'total_chars': int
+            'total_chars': int,
+            'skipped_unchanged': int,
+            'skipped_duplicates': int,
+            'duplicate_chars': int,
+            'embedding_chunks_saved': int,
+            'watchdog': {'page_recycles': int, 'context_recycles': int,
+                         'browser_recycles': int, 'peak_heap_mb': float},
+            'budget': {'stopped_by': 'time' | 'bytes' | 'max_pages' | None,
+                       'elapsed_s': float, 'bytes_downloaded': int, ...}
         }
     """
-    
+    return get_browser_pool().run(
+        _crawl, start_url, max_pages, css_selector, xpath, concurrency,
+        ready_policy, ready_selector, crawl_mode, since, crawl_job, page_sink,
+        duplicate_filter, allow_third_party, extraction_mode, budget
+    )
+
+
+async def scrape_multiple_pages_async(start_url: str, max_pages: int = 20,
+                                      css_selector: str = None, xpath: str = None,
+                                      concurrency: int = CRAWL_CONCURRENCY,
+                                      ready_policy: str = None, ready_selector: str = None,
+                                      crawl_mode: str = CRAWL_MODE_LINKS, since: datetime = None,
+                                      crawl_job=None, page_sink=None, duplicate_filter=None,
+                                      allow_third_party: bool = False,
+                                      extraction_mode: str = EXTRACTION_MODE,
+                                      budget: CrawlBudget = None):
+    """Async version of scrape_multiple_pages, same result shape"""
+    return await get_browser_pool().run_async(
+        _crawl, start_url, max_pages, css_selector, xpath, concurrency,
+        ready_policy, ready_selector, crawl_mode, since, crawl_job, page_sink,
+        duplicate_filter, allow_third_party, extraction_mode, budget
+    )
+
+
+def _seed_from_sitemaps(frontier: CrawlFrontier, start_url: str, max_pages: int,
+                        since: datetime = None, stats: dict = None):
+    """Queue up to `max_pages` same-domain sitemap URLs. Returns how many were queued."""
+    seeded = 0
+    sitemap_urls = robots_cache.sitemaps(start_url) or default_sitemap_urls(start_url)
+    for url in iter_sitemap_urls(sitemap_urls, since=since, stats=stats):
+        if (is_same_domain(url, start_url) and robots_cache.is_allowed(url) and
+                frontier.add(url)):
+            seeded += 1
+            if seeded >= max_pages:
+                break
+    return seeded
+
+
+def _duplicate_stats(duplicate_filter):
+    if duplicate_filter is None:
+        return {'skipped_duplicates': 0, 'duplicate_chars': 0, 'embedding_chunks_saved': 0}
+    return duplicate_filter.stats()
+
+
+def _declared_bytes(response):
+    """Content-Length of the main document, None when the server sent none"""
+    if response is None:
+        return None
+    try:
+        return int(response.headers.get("content-length"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _stop_loading(page):
+    try:
+        await page.evaluate("window.stop()")
+    except Exception:
+        pass
+
+
+async def _document_bytes(response) -> int:
+    """Transfer size of the main document (headers + body)"""
+    if response is None:
+        return 0
+    try:
+        sizes = await response.request.sizes()
+        return max(0, sizes["responseHeadersSize"]) + max(0, sizes["responseBodySize"])
+    except Exception:
+        return int(response.headers.get("content-length") or 0)
+
+
+def _filter_allowed(links):
+    return [url for url in links if robots_cache.is_allowed(url)]
+
+
+def _cache_and_filter(html_content: str, current_url: str, links):
+    """Cache the raw HTML and keep only robots-allowed links"""
+    store_html(current_url, html_content)
+    return _filter_allowed(links)
+
+
+async def _process_html(html_content: str, current_url: str, start_url: str,
+                        css_selector: str = None, xpath: str = None):
+    """
+    Extract text and same-domain, robots-allowed links from a fetched page.
+    Parsing runs in the extraction process pool; caching and robots
+    lookups (which may hit the network) run on a thread.
+    """
+    text, links = await get_extraction_pool().extract_async(
+        html_content, css_selector, xpath, url=current_url, link_scope=start_url
+    )
+    links = await asyncio.to_thread(_cache_and_filter, html_content, current_url, links)
+    return text, links
+
+
+async def _extract_page(page, current_url: str, start_url: str,
+                        css_selector: str = None, xpath: str = None,
+                        extraction_mode: str = EXTRACTION_MODE):
+    """
+    Text and same-domain, robots-allowed links of the page just loaded.
+
+    In 'browser' mode extraction runs inside the page and only text and
+    links cross over; the raw HTML is not cached. Selectors the browser
+    cannot evaluate fall back to the 'python' path, which serializes the
+    DOM and parses it in the extraction pool.
+    """
+    if extraction_mode == EXTRACTION_MODE_BROWSER:
+        extracted = await extract_in_page(page, css_selector, xpath)
+        if extracted is not None:
+            text, hrefs = extracted
+            links = scope_links(hrefs, current_url, start_url)
+            return text, await asyncio.to_thread(_filter_allowed, links)
+
+    html_content = await page.content()
+    # Parsing is CPU-bound, keep it off the browser loop
+    return await _process_html(html_content, current_url, start_url, css_selector, xpath)
+
+
+async def _crawl(context, start_url: str, max_pages: int,
+                 css_selector: str = None, xpath: str = None,
+                 concurrency: int = CRAWL_CONCURRENCY,
+                 ready_policy: str = None, ready_selector: str = None,
+                 crawl_mode: str = CRAWL_MODE_LINKS, since: datetime = None,
+                 crawl_job=None, page_sink=None, duplicate_filter=None,
+                 allow_third_party: bool = False,
+                 extraction_mode: str = EXTRACTION_MODE,
+                 budget: CrawlBudget = None):
+    """
+    Crawl loop, runs on the browser pool's event loop.
+    `concurrency` workers share one frontier, each driving its own page.
+    """
+
+    concurrency = max(1, min(concurrency, max_pages))
+    budget = budget or CrawlBudget()
+    budget.start()
+
     visited_urls = set()
-    to_visit = [start_url]
+    frontier = CrawlFrontier()
     pages_data = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        # Block resources
-        page.route("**/*", lambda route: route.abort()
-                   if route.request.resource_type in ["stylesheet", "font", "image", "media"]
-                   else route.continue_())
-        
-        while to_visit and len(visited_urls) < max_pages:
-            current_url = to_visit.pop(0)
-            
-            # Skip if already visited
-            if current_url in visited_urls:
-                continue
-            
-            # Skip if different domain
-            if not is_same_domain(current_url, start_url):
+    follow_links = True
+    sitemap_stats = {}
+
+    visited, pending = await asyncio.to_thread(crawl_job.load_state) if crawl_job else ([], [])
+    resumed = bool(visited or pending)
+    if resumed:
+        # Resume from the checkpoint instead of seeding again
+        for url in visited:
+            frontier.mark_seen(url)
+            visited_urls.add(url)
+        for url, depth in pending:
+            frontier.add(url, depth)
+        follow_links = bool(crawl_job.follow_links)
+        sitemap_stats["skipped_unchanged"] = crawl_job.skipped_unchanged
+        print(f"♻️ Resuming crawl {crawl_job.crawl_id}: "
+              f"{len(visited)} pages done, {len(pending)} queued")
+    elif crawl_mode == CRAWL_MODE_SITEMAP:
+        # Streams sitemap XML over HTTP, keep it off the browser loop
+        seeded = await asyncio.to_thread(
+            _seed_from_sitemaps, frontier, start_url, max_pages, since, sitemap_stats
+        )
+        if seeded:
+            follow_links = False
+            print(f"🗺️ Seeded {seeded} URLs from sitemap "
+                  f"({sitemap_stats.get('skipped_unchanged', 0)} unchanged skipped)")
+        elif sitemap_stats.get("skipped_unchanged"):
+            print(f"✓ Sitemap reports no pages changed since {since}")
+            return {
+                'pages': [],
+                'total_pages': 0,
+                'total_chars': 0,
+                'skipped_unchanged': sitemap_stats["skipped_unchanged"],
+                **_duplicate_stats(duplicate_filter),
+                'watchdog': PageWatchdog(context).stats(),
+                'budget': budget.report()
+            }
+        else:
+            print(f"⚠️ No sitemap found for {start_url}, falling back to link discovery")
+
+    if follow_links and not resumed:
+        await asyncio.to_thread(robots_cache.check, start_url)
+        frontier.add(start_url)
+
+    if crawl_job and not resumed:
+        await asyncio.to_thread(
+            crawl_job.update,
+            follow_links=1 if follow_links else 0,
+            skipped_unchanged=sitemap_stats.get("skipped_unchanged", 0)
+        )
+        await asyncio.to_thread(crawl_job.queue_pages, frontier.pending())
+
+    # Workers idle on `wake` while the frontier is empty but other
+    # workers are still fetching pages that may add new links
+    in_flight = 0
+    wake = asyncio.Event()
+
+    async def worker(page):
+        nonlocal in_flight
+
+        while len(visited_urls) < max_pages:
+            if budget.exhausted():
+                return
+            if not frontier:
+                if in_flight == 0:
+                    return
+                wake.clear()
+                await wake.wait()
                 continue
-            
+
+            current_url, depth = frontier.pop()
+            visited_urls.add(current_url)
+            in_flight += 1
             try:
-                print(f"🔍 Scraping ({len(visited_urls) + 1}/{max_pages}): {current_url}")
-                
-                page.goto(current_url, timeout=30000, wait_until="domcontentloaded")
-                page.wait_for_timeout(1000)
-                
-                html_content = page.content()
-                
-                # Extract text
-                text = extract_text_from_html(html_content, css_selector, xpath)
-                
-                # Get page title
-                title = page.title()
-                
-                if text and len(text) > 100:  # Only save pages with substantial content
-                    pages_data.append({
+                print(f"🔍 Scraping ({len(visited_urls)}/{max_pages}): {current_url}")
+
+                await rate_limiter.acquire_async(current_url)
+                # Stop at the response headers so a document whose Content-Length
+                # is over budget is dropped before it is parsed and rendered
+                response = await page.goto(current_url, timeout=30000, wait_until="commit")
+                declared = _declared_bytes(response)
+                fits = declared is None or budget.record_page(declared)
+                if fits:
+                    await page.wait_for_load_state("domcontentloaded", timeout=30000)
+                    ready_ms = await wait_until_ready(page, current_url, ready_policy, ready_selector)
+                    if declared is None:
+                        # No Content-Length (chunked): the size is known once loaded
+                        fits = budget.record_page(await _document_bytes(response))
+                else:
+                    await _stop_loading(page)
+                    ready_ms = None
+
+                title = await page.title()
+                blocked_requests = blockers[page].take_page_count()
+
+                if fits:
+                    text, links = await _extract_page(
+                        page, current_url, start_url, css_selector, xpath, extraction_mode
+                    )
+                else:
+                    print(f"📦 Over {budget.max_page_bytes:,} bytes, skipping: {current_url}")
+                    text, links = "", []
+
+                substantial = text and len(text) > 100  # Only save pages with substantial content
+
+                if substantial and duplicate_filter is not None:
+                    duplicate_of = await asyncio.to_thread(duplicate_filter.check, current_url, text)
+                    if duplicate_of:
+                        print(f"♊ Near-duplicate of {duplicate_of}, skipping: {current_url}")
+                        substantial = False
+
+                queued = []
+                if follow_links and budget.allows_depth(depth + 1, len(links)):
+                    for absolute_url in links:
+                        if frontier.add(absolute_url, depth + 1):
+                            queued.append((absolute_url, depth + 1))
+
+                if crawl_job:
+                    await asyncio.to_thread(
+                        crawl_job.complete_page, current_url, title,
+                        text if substantial else None, ready_ms, queued
+                    )
+
+                if substantial:
+                    page_data = {
                         'url': current_url,
                         'text': text,
                         'title': title,
-                        'char_count': len(text)
-                    })
-                
-                visited_urls.add(current_url)
-                
-                # Find links on the page
-                soup = BeautifulSoup(html_content, 'html.parser')
-                links = soup.find_all('a', href=True)
-                
-                for link in links:
-                    href = link['href']
-                    absolute_url = urljoin(current_url, href)
-                    
-                    # Add to queue if not visited and same domain
-                    if (absolute_url not in visited_urls and 
-                        absolute_url not in to_visit and
-                        is_same_domain(absolute_url, start_url) and
-                        not absolute_url.endswith(('.pdf', '.jpg', '.png', '.zip'))):
-                        to_visit.append(absolute_url)
-                
-                time.sleep(0.5)  # Be polite
-                
+                        'char_count': len(text),
+                        'ready_ms': ready_ms,
+                        'blocked_requests': blocked_requests
+                    }
+                    if page_sink is not None:
+                        # Blocks (off the loop) while the consumer is behind
+                        await asyncio.to_thread(page_sink.put, page_data)
+                    elif not crawl_job:
+                        pages_data.append(page_data)
+
             except Exception as e:
                 print(f"⚠️ Error scraping {current_url}: {e}")
-                continue
-        
-        browser.close()
-    
-    total_chars = sum(p['char_count'] for p in pages_data)
-    
+                if crawl_job:
+                    await asyncio.to_thread(crawl_job.fail_page, current_url)
+            finally:
+                in_flight -= 1
+                wake.set()
+
+            # Swap in a fresh page when this one grew too large or crashed
+            old_page = page
+            try:
+                page = await watchdog.check(page)
+            except Exception as e:
+                print(f"⚠️ Could not replace crawl page, stopping worker: {e}")
+                return
+            if page is not old_page:
+                blockers.pop(old_page, None)
+
+    blockers = {}
+
+    async def setup_page(page):
+        # Block resources and third-party trackers / widgets
+        blockers[page] = RequestBlocker(start_url, allow_third_party)
+        await blockers[page].attach(page)
+
+    watchdog = PageWatchdog(context, setup_page)
+    try:
+        pages = [await watchdog.new_page() for _ in range(concurrency)]
+        await asyncio.gather(*(worker(page) for page in pages))
+    finally:
+        await watchdog.close()
+
+    if budget.stopped_by is None and len(visited_urls) >= max_pages and frontier:
+        budget.stopped_by = BUDGET_PAGES
+    if budget.stopped_by:
+        print(f"⏹️ Crawl stopped by {budget.stopped_by} budget after {len(visited_urls)} pages")
+
+    if crawl_job:
+        totals = await asyncio.to_thread(crawl_job.totals)
+        total_pages, total_chars = totals['pages'], totals['chars']
+    else:
+        total_pages = len(pages_data)
+        total_chars = sum(p['char_count'] for p in pages_data)
+
     return {
         'pages': pages_data,
-        'total_pages': len(pages_data),
-        'total_chars': total_chars
-    }
\ No newline at end of file
+        'total_pages': total_pages,
+        'total_chars': total_chars,
+        'skipped_unchanged': sitemap_stats.get("skipped_unchanged", 0),
+        **_duplicate_stats(duplicate_filter),
+        'watchdog': watchdog.stats(),
+        'budget': budget.report()
+    }
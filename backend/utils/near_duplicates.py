@@ -0,0 +1,167 @@
+# backend/utils/near_duplicates.py
+
+import hashlib
+import math
+import re
+import threading
+
+from backend.core.config import DEDUP_ENABLED, SIMHASH_MAX_DISTANCE
+from backend.models.page_fingerprint import PageFingerprint
+
+SIMHASH_BITS = 64
+SHINGLE_WORDS = 3
+
+# Same chunking parameters as store_scraped_data, for the savings estimate
+CHUNK_STRIDE = 600 - 50
+
+_WORD = re.compile(r"\w+")
+
+_stats_lock = threading.Lock()
+_stats = {"pages_checked": 0, "duplicates": 0, "chars_skipped": 0, "chunks_saved": 0}
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over 3-word shingles of the lowercased text"""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[i:i + SHINGLE_WORDS])
+            for i in range(len(words) - SHINGLE_WORDS + 1)
+        ]
+
+    bits = [
+        format(int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big"), "064b")
+        for s in shingles
+    ]
+    # Column-wise majority vote; zip(*) transposes in C
+    half = len(bits) / 2
+    fingerprint = 0
+    for column in zip(*bits):
+        fingerprint = (fingerprint << 1) | (column.count("1") > half)
+    return fingerprint
+
+
+def estimate_chunks(char_count: int) -> int:
+    """Chunks chunk_text would cut from this much text"""
+    return max(1, math.ceil(char_count / CHUNK_STRIDE))
+
+
+class SimHashIndex:
+    """
+    Fingerprints split into max_distance + 1 bit blocks. Two fingerprints
+    within max_distance bits agree on at least one whole block, so only
+    pages sharing a block are compared.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max(0, min(max_distance, SIMHASH_BITS - 1))
+        blocks = self.max_distance + 1
+        width = SIMHASH_BITS // blocks
+        self._blocks = [
+            (i * width, SIMHASH_BITS - i * width if i == blocks - 1 else width)
+            for i in range(blocks)
+        ]
+        self._tables = [{} for _ in self._blocks]
+        self.size = 0
+
+    def _keys(self, fingerprint: int):
+        for shift, width in self._blocks:
+            yield (fingerprint >> shift) & ((1 << width) - 1)
+
+    def add(self, fingerprint: int, url: str):
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            table.setdefault(key, []).append((fingerprint, url))
+        self.size += 1
+
+    def find(self, fingerprint: int, exclude_url: str = None):
+        """URL of a stored page within max_distance bits, or None"""
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            for other, url in table.get(key, ()):
+                if url != exclude_url and (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return url
+        return None
+
+
+class NearDuplicateFilter:
+    """
+    Per-crawl near-duplicate check. With an agent_id it starts from every
+    page the agent already stores and remembers the pages it lets through,
+    so duplicates across crawls and configs are caught too.
+
+    A page is never a duplicate of an earlier version of its own URL:
+    that is an update and has to be re-embedded.
+
+    New pages are indexed for the rest of the crawl as soon as they are
+    checked, but their fingerprint is only saved for later crawls once
+    `page_stored(url)` reports the page embedded, so a crawl that fails
+    first leaves no fingerprints of content the agent never got.
+    """
+
+    def __init__(self, agent_id: str = None, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.agent_id = agent_id
+        self.index = SimHashIndex(max_distance)
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.chars = 0
+        self.chunks_saved = 0
+        self._unsaved = {}  # url -> (fingerprint, chars) awaiting page_stored
+
+        if agent_id:
+            for url, fingerprint in PageFingerprint.get_by_agent(agent_id):
+                self.index.add(fingerprint, url)
+
+    def check(self, url: str, text: str):
+        """
+        Returns the URL this page duplicates, or None after indexing it as
+        new content. Blocking (hashing), call it off the event loop.
+        """
+        fingerprint = simhash(text)
+        with self._lock:
+            duplicate_of = self.index.find(fingerprint, exclude_url=url)
+            if duplicate_of is None:
+                self.index.add(fingerprint, url)
+                if self.agent_id:
+                    self._unsaved[url] = (fingerprint, len(text))
+            else:
+                self.pages += 1
+                self.chars += len(text)
+                self.chunks_saved += estimate_chunks(len(text))
+
+        with _stats_lock:
+            _stats["pages_checked"] += 1
+            if duplicate_of is not None:
+                _stats["duplicates"] += 1
+                _stats["chars_skipped"] += len(text)
+                _stats["chunks_saved"] += estimate_chunks(len(text))
+
+        return duplicate_of
+
+    def page_stored(self, url: str):
+        """Persist the fingerprint of a checked page once it is embedded (SQLite, blocking)"""
+        with self._lock:
+            unsaved = self._unsaved.pop(url, None)
+        if unsaved is not None:
+            PageFingerprint.save(self.agent_id, url, *unsaved)
+
+    def stats(self):
+        return {
+            "skipped_duplicates": self.pages,
+            "duplicate_chars": self.chars,
+            "embedding_chunks_saved": self.chunks_saved,
+        }
+
+
+def new_duplicate_filter(agent_id: str = None):
+    """A NearDuplicateFilter, or None when near-duplicate detection is off"""
+    return NearDuplicateFilter(agent_id) if DEDUP_ENABLED else None
+
+
+def get_dedup_stats():
+    """Process-wide near-duplicate counters"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["enabled"] = DEDUP_ENABLED
+    stats["max_distance"] = SIMHASH_MAX_DISTANCE
+    return stats
@@ -0,0 +1,52 @@
+# backend/utils/pipeline.py
+
+import queue
+import threading
+
+_END = object()
+
+
+class BoundedStream:
+    """
+    Bounded hand-off between two pipeline stages running on different
+    threads / event loops. The producer calls `put` (blocking while the
+    stream is full) and `close`; the consumer iterates it like a generator.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._finished = False
+        self.items = 0
+        self.peak_depth = 0
+
+    def put(self, item):
+        self._queue.put(item)
+        with self._lock:
+            self.items += 1
+            self.peak_depth = max(self.peak_depth, self._queue.qsize())
+
+    def close(self):
+        """Signal end of stream"""
+        self._queue.put(_END)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                self._finished = True
+                return
+            yield item
+
+    def drain(self):
+        """
+        Discard whatever is left until the producer closes the stream, so a
+        producer blocked on a full stream can finish after the consumer failed
+        """
+        if not self._finished:
+            for _ in self:
+                pass
+
+    def stats(self):
+        return {"max_depth": self.maxsize, "peak_depth": self.peak_depth, "items": self.items}
@@ -1,135 +1,72 @@
 # backend/utils/playwright_scraper.py
 
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from backend.utils.browser_pool import get_browser_pool
+from backend.utils.readiness import wait_until_ready
+from backend.utils.rate_limiter import rate_limiter
+from backend.utils.request_blocking import RequestBlocker
+from backend.utils.api_capture import ApiCapture
+# Re-exported for existing callers; extraction itself has no browser imports
+from backend.utils.extraction import (
+    extract_text_from_html, extract_text_and_links, find_main_content, clean_text_minimal
+)
 
-def scrape_website(url: str):
-    """Synchronous version of Playwright scraper"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        # Block unnecessary resources
-        page.route("**/*", lambda route: route.abort()
-                   if route.request.resource_type in ["stylesheet", "font", "image", "media"]
-                   else route.continue_())
-        
-        page.goto(url, timeout=60000, wait_until="domcontentloaded")
-        page.wait_for_timeout(2000)
-        content = page.content()
-        browser.close()
-    return content
+async def _render(context, url: str, ready_policy: str = None, ready_selector: str = None,
+                  allow_third_party: bool = False, api_pattern: str = None):
+    page = await context.new_page()
+    
+    # Block unnecessary resources and third-party trackers / widgets
+    blocker = RequestBlocker(url, allow_third_party)
+    await blocker.attach(page)
+    
+    capture = ApiCapture(api_pattern) if api_pattern else None
+    if capture:
+        page.on("response", capture.handle)
+    
+    await rate_limiter.acquire_async(url)
+    response = await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+    ready_ms = await wait_until_ready(page, url, ready_policy, ready_selector)
+    return {
+        "html": await page.content(),
+        "status": response.status if response else None,
+        "ready_ms": ready_ms,
+        "blocked_requests": blocker.take_page_count(),
+        "api": await capture.result() if capture else None,
+    }
 
 
-def extract_text_from_html(html_content: str, css_selector: str = None, xpath: str = None):
-    """Extract text with MINIMAL cleaning to preserve content"""
-    
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    # Step 1: Remove only truly useless tags
-    unwanted_tags = ["script", "style", "noscript", "iframe"]
-    for tag in unwanted_tags:
-        for el in soup.find_all(tag):
-            el.decompose()
-    
-    # Step 2: If user provided selector, use it
-    if css_selector:
-        elements = soup.select(css_selector)
-        if elements:
-            text = "\n\n".join(el.get_text(strip=True, separator="\n") for el in elements)
-            return clean_text_minimal(text)
-    
-    if xpath:
-        from lxml import html
-        tree = html.fromstring(str(soup))
-        elements = tree.xpath(xpath)
-        if elements:
-            text = "\n\n".join(el.text_content().strip() for el in elements)
-            return clean_text_minimal(text)
-    
-    # Step 3: Try to find main content area
-    main_content = find_main_content(soup)
-    if main_content:
-        text = main_content.get_text(strip=True, separator="\n")
-        return clean_text_minimal(text)
-    
-    # Step 4: Fallback - get body text
-    body = soup.find('body')
-    if body:
-        text = body.get_text(separator="\n", strip=True)
-        return clean_text_minimal(text)
-    
-    # Last resort
-    text = soup.get_text(separator="\n", strip=True)
-    return clean_text_minimal(text)
+def render_page(url: str, ready_policy: str = None, ready_selector: str = None,
+                allow_third_party: bool = False, api_pattern: str = None):
+    """
+    Render a page on a pooled browser. `allow_third_party` turns off
+    tracker / third-party blocking for sites that need those scripts.
+    With an `api_pattern` (regex) the first matching JSON XHR / fetch
+    response is captured as 'api' (see backend/utils/api_capture.py).
 
+    Returns:
+        dict: {'html': str, 'status': int | None,
+               'ready_ms': float, 'blocked_requests': int,
+               'api': {'url': str, 'hash': str} | None}
+    """
+    return get_browser_pool().run(
+        _render, url, ready_policy=ready_policy, ready_selector=ready_selector,
+        allow_third_party=allow_third_party, api_pattern=api_pattern
+    )
 
-def find_main_content(soup):
-    """Try to find the main content area"""
-    
-    # Priority selectors
-    main_selectors = [
-        "main",
-        "article",
-        "[role='main']",
-        ".main-content",
-        "#main-content",
-        ".content",
-        "#content"
-    ]
-    
-    for selector in main_selectors:
-        elements = soup.select(selector)
-        if elements:
-            best = max(elements, key=lambda e: len(e.get_text(strip=True)))
-            if len(best.get_text(strip=True)) > 200:
-                return best
-    
-    return None
 
+async def render_page_async(url: str, ready_policy: str = None, ready_selector: str = None,
+                            allow_third_party: bool = False, api_pattern: str = None):
+    """Async version of render_page"""
+    return await get_browser_pool().run_async(
+        _render, url, ready_policy=ready_policy, ready_selector=ready_selector,
+        allow_third_party=allow_third_party, api_pattern=api_pattern
+    )
 
-def clean_text_minimal(text: str) -> str:
-    """
-    MINIMAL cleaning - only remove obvious noise
-    """
-    if not text:
-        return ""
-    
-    lines = text.split("\n")
-    cleaned = []
-    
-    # Only skip VERY obvious noise
-    skip_patterns = [
-        "skip to content",
-        "skip to main",
-        "accept cookies",
-        "cookie policy"
-    ]
-    
-    prev = ""
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-        
-        # Skip obvious noise (case-insensitive, exact match)
-        if any(pattern in line.lower() for pattern in skip_patterns):
-            continue
-        
-        # Skip duplicate consecutive lines
-        if line == prev:
-            continue
-        
-        cleaned.append(line)
-        prev = line
-    
-    result = "\n".join(cleaned)
-    
-    # Remove excessive blank lines
-    while "\n\n\n" in result:
-        result = result.replace("\n\n\n", "\n\n")
-    
-    return result.strip()
\ No newline at end of file
+
+def scrape_website(url: str):
+    """Render a page on a pooled browser and return its HTML"""
+    return render_page(url)["html"]
+
+
+async def scrape_website_async(url: str):
+    """Async version of scrape_website for use inside FastAPI routes"""
+    return (await render_page_async(url))["html"]
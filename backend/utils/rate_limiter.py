@@ -0,0 +1,136 @@
+# backend/utils/rate_limiter.py
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+from backend.core.config import HOST_RATE_LIMIT_RPS, HOST_RATE_LIMIT_BURST, HOST_RATE_LIMITS
+
+
+def _parse_overrides(spec: str):
+    """'example.com=0.5,news.site=2' -> {'example.com': 0.5, 'news.site': 2.0}"""
+    overrides = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        host, rate = item.split("=", 1)
+        try:
+            overrides[host.strip().lower()] = float(rate)
+        except ValueError:
+            print(f"⚠️ Ignoring bad HOST_RATE_LIMITS entry: {item}")
+    return overrides
+
+
+class _Bucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.requests = 0
+        self.total_delay = 0.0
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host, shared by every fetch path in the process.
+
+    A request takes one token; when the bucket is empty the caller is given
+    a reservation (the bucket goes negative) and waits until that token
+    would have been refilled. Waiting happens outside the lock, so unrelated
+    hosts never queue behind each other.
+    """
+
+    def __init__(self, default_rate=HOST_RATE_LIMIT_RPS, default_burst=HOST_RATE_LIMIT_BURST,
+                 overrides=None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.overrides = overrides if overrides is not None else _parse_overrides(HOST_RATE_LIMITS)
+        self._crawl_delays = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, host):
+        rate = self.overrides.get(host, self.default_rate)
+        burst = self.default_burst
+
+        # robots.txt Crawl-delay caps the rate and disables bursting
+        delay = self._crawl_delays.get(host)
+        if delay:
+            rate = min(rate, 1.0 / delay)
+            burst = 1
+
+        return rate, burst
+
+    def _reserve(self, url: str) -> float:
+        """Take a token for the URL's host, return how long to wait for it"""
+        host = urlparse(url).netloc.lower()
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = _Bucket(*self._limits_for(host))
+                self._buckets[host] = bucket
+
+            if bucket.rate <= 0:
+                return 0.0
+
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+
+            bucket.tokens -= 1
+            delay = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+
+            bucket.requests += 1
+            bucket.total_delay += delay
+            return delay
+
+    def acquire(self, url: str):
+        """Block the calling thread until the host may be hit again"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, url: str):
+        """Async version of acquire, yields to the event loop while waiting"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def set_crawl_delay(self, host: str, seconds):
+        """Honor a host's Crawl-delay (None clears it)"""
+        host = host.lower()
+        with self._lock:
+            if seconds:
+                self._crawl_delays[host] = float(seconds)
+            else:
+                self._crawl_delays.pop(host, None)
+
+            bucket = self._buckets.get(host)
+            if bucket is not None:
+                bucket.rate, bucket.burst = self._limits_for(host)
+                bucket.tokens = min(bucket.tokens, bucket.burst)
+
+    def stats(self):
+        """Per-host rates and how much waiting the limiter has imposed"""
+        with self._lock:
+            return {
+                "default_rate": self.default_rate,
+                "default_burst": self.default_burst,
+                "hosts": {
+                    host: {
+                        "rate": bucket.rate,
+                        "burst": bucket.burst,
+                        "crawl_delay": self._crawl_delays.get(host),
+                        "requests": bucket.requests,
+                        "total_delay_s": round(bucket.total_delay, 2),
+                    }
+                    for host, bucket in self._buckets.items()
+                },
+            }
+
+
+# Process-wide limiter: crawls, reminders and scheduled scrapes share it
+rate_limiter = HostRateLimiter()
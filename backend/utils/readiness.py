@@ -0,0 +1,117 @@
+# backend/utils/readiness.py
+
+import threading
+import time
+from urllib.parse import urlparse
+
+from backend.core.config import (
+    READINESS_DEFAULT_POLICY,
+    READINESS_TIMEOUT_MS,
+    READINESS_QUIET_MS,
+    READINESS_FIXED_MS,
+)
+
+POLICY_DOM_QUIET = "dom_quiet"
+POLICY_NETWORK_IDLE = "network_idle"
+POLICY_SELECTOR = "selector"
+POLICY_FIXED = "fixed"
+
+READINESS_POLICIES = [POLICY_DOM_QUIET, POLICY_NETWORK_IDLE, POLICY_SELECTOR, POLICY_FIXED]
+
+# Resolves once the DOM has had no mutations for `quietMs`, or after `timeoutMs`
+_DOM_QUIET_JS = """
+([quietMs, timeoutMs]) => new Promise((resolve) => {
+    let quietTimer = null;
+    let capTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve(true);
+    }
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(done, quietMs);
+    capTimer = setTimeout(done, timeoutMs);
+})
+"""
+
+# host -> {'pages', 'total_ms', 'max_ms', 'timeouts'}
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def resolve_policy(policy: str = None, selector: str = None) -> str:
+    """Pick the effective policy; unknown names fall back to the default"""
+    if policy == POLICY_SELECTOR and not selector:
+        return READINESS_DEFAULT_POLICY
+    if policy in READINESS_POLICIES:
+        return policy
+    return READINESS_DEFAULT_POLICY
+
+
+async def wait_until_ready(page, url: str, policy: str = None, selector: str = None,
+                           timeout_ms: int = READINESS_TIMEOUT_MS) -> float:
+    """
+    Wait after `domcontentloaded` until the page is ready to be read.
+
+    Policies:
+        dom_quiet     - no DOM mutations for READINESS_QUIET_MS
+        network_idle  - Playwright's networkidle load state
+        selector      - `selector` is attached to the DOM
+        fixed         - legacy fixed sleep of READINESS_FIXED_MS
+
+    Every policy is capped at `timeout_ms`; hitting the cap is not an
+    error, the page is read as-is. Returns the time actually waited in ms.
+    """
+    policy = resolve_policy(policy, selector)
+    started = time.perf_counter()
+    timed_out = False
+
+    try:
+        if policy == POLICY_DOM_QUIET:
+            await page.evaluate(_DOM_QUIET_JS, [READINESS_QUIET_MS, timeout_ms])
+        elif policy == POLICY_NETWORK_IDLE:
+            await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        elif policy == POLICY_SELECTOR:
+            await page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+        else:
+            await page.wait_for_timeout(READINESS_FIXED_MS)
+    except Exception as e:
+        # Timeouts, or a client-side redirect destroying the evaluate context
+        timed_out = True
+        print(f"⚠️ Readiness '{policy}' gave up on {url}: {str(e).splitlines()[0]}")
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _record(url, elapsed_ms, timed_out)
+    return round(elapsed_ms, 1)
+
+
+def _record(url: str, elapsed_ms: float, timed_out: bool):
+    host = urlparse(url).netloc.lower()
+    with _stats_lock:
+        entry = _stats.setdefault(host, {"pages": 0, "total_ms": 0.0, "max_ms": 0.0, "timeouts": 0})
+        entry["pages"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        if timed_out:
+            entry["timeouts"] += 1
+
+
+def get_readiness_stats():
+    """How long pages actually needed before they were read, per host"""
+    with _stats_lock:
+        return {
+            host: {
+                "pages": entry["pages"],
+                "avg_ms": round(entry["total_ms"] / entry["pages"], 1),
+                "max_ms": round(entry["max_ms"], 1),
+                "timeouts": entry["timeouts"],
+            }
+            for host, entry in _stats.items()
+        }
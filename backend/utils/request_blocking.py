@@ -0,0 +1,221 @@
+# backend/utils/request_blocking.py
+
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+
+from backend.core.config import (
+    THIRD_PARTY_POLICY,
+    REQUEST_BLOCKLIST,
+    THIRD_PARTY_ALLOWLIST,
+    BROWSER_DISK_CACHE_ENABLED,
+)
+from backend.utils.browser_cache import record_response
+
+# Never needed for text extraction, whoever serves them
+BLOCKED_RESOURCE_TYPES = {"stylesheet", "font", "image", "media"}
+
+# Analytics, ads, tag managers, session replay and chat widgets
+DEFAULT_BLOCKLIST = {
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "googleadservices.com", "doubleclick.net", "adservice.google.com",
+    "facebook.net", "connect.facebook.net", "analytics.twitter.com", "ads-twitter.com",
+    "snap.licdn.com", "bat.bing.com", "clarity.ms", "hotjar.com", "hotjar.io",
+    "fullstory.com", "mouseflow.com", "segment.com", "segment.io", "mixpanel.com",
+    "amplitude.com", "heap.io", "heapanalytics.com", "newrelic.com", "nr-data.net",
+    "sentry.io", "optimizely.com", "quantserve.com", "scorecardresearch.com",
+    "taboola.com", "outbrain.com", "criteo.com", "criteo.net", "adnxs.com",
+    "amazon-adsystem.com", "intercom.io", "intercomcdn.com", "drift.com",
+    "crisp.chat", "tawk.to", "zdassets.com", "livechatinc.com", "hs-scripts.com",
+    "hs-analytics.net", "onetrust.com", "cookielaw.org", "cookiebot.com",
+}
+
+# Public CDNs that sites load their own frameworks from
+DEFAULT_ALLOWLIST = {
+    "cdnjs.cloudflare.com", "cdn.jsdelivr.net", "unpkg.com", "ajax.googleapis.com",
+    "code.jquery.com", "stackpath.bootstrapcdn.com", "cdn.shopify.com",
+}
+
+POLICY_BLOCKLIST = "blocklist"  # resource types + blocklisted domains
+POLICY_SCRIPTS = "scripts"  # ... + every third-party script, XHR and frame
+POLICY_ALL = "all"  # ... + every third-party request
+
+# The same resource types by file extension, for URL-pattern blocking
+BLOCKED_EXTENSIONS = (
+    "css", "woff", "woff2", "ttf", "otf", "eot",
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "mp4", "webm", "mp3", "m4a", "ogg", "wav",
+)
+
+THIRD_PARTY_ACTIVE_TYPES = {"script", "xhr", "fetch", "websocket", "eventsource", "document"}
+
+# Second-level labels under which registrable domains take three labels
+_SHARED_SLDS = {"co", "com", "org", "net", "ac", "gov", "edu"}
+
+
+def _domains(setting: str):
+    return {d.strip().lower().lstrip(".") for d in setting.split(",") if d.strip()}
+
+
+BLOCKLIST = DEFAULT_BLOCKLIST | _domains(REQUEST_BLOCKLIST)
+ALLOWLIST = DEFAULT_ALLOWLIST | _domains(THIRD_PARTY_ALLOWLIST)
+
+# Chromium URL patterns for Network.setBlockedURLs
+EXTENSION_PATTERNS = [p for ext in BLOCKED_EXTENSIONS for p in (f"*.{ext}", f"*.{ext}?*")]
+BLOCKLIST_PATTERNS = [p for d in sorted(BLOCKLIST) for p in (f"*://{d}/*", f"*://*.{d}/*")]
+
+_stats_lock = threading.Lock()
+_stats = {"pages": 0, "requests": 0, "blocked": Counter(), "blocked_domains": Counter()}
+
+
+def site_of(host: str) -> str:
+    """Approximate registrable domain: example.com, example.co.uk"""
+    labels = host.lower().rstrip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SHARED_SLDS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _listed(host: str, domains) -> bool:
+    """host is a listed domain or a subdomain of one"""
+    labels = host.split(".")
+    return any(".".join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+
+def _is_main_document(request) -> bool:
+    """Top-level navigations (including cross-site redirects) always load"""
+    if not request.is_navigation_request():
+        return False
+    try:
+        return request.frame.parent_frame is None
+    except Exception:
+        # Service worker requests have no frame
+        return False
+
+
+class RequestBlocker:
+    """
+    Playwright route handler for one page.
+
+    Always drops stylesheets, fonts, images and media. Unless the agent's
+    config allows third-party scripts, it also drops blocklisted domains
+    and, depending on THIRD_PARTY_POLICY, third-party scripts / XHR or all
+    third-party requests. First party is the site of the page's URL.
+
+    Playwright routing turns off Chromium's HTTP cache, so with the
+    persistent disk cache enabled `attach()` blocks by URL pattern over
+    CDP instead: static file extensions and blocklisted domains only.
+    """
+
+    def __init__(self, page_url: str, allow_third_party: bool = False,
+                 policy: str = THIRD_PARTY_POLICY):
+        self.site = site_of(urlsplit(page_url).hostname or "")
+        self.allow_third_party = allow_third_party
+        self.policy = policy
+        self.requests = 0
+        self.blocked = Counter()  # reason -> count
+        self._page_blocked = 0
+        self._urls = {}  # CDP requestId -> URL, in disk cache mode
+
+    def _reason(self, request):
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            return "resource_type"
+        if self.allow_third_party:
+            return None
+
+        host = (urlsplit(request.url).hostname or "").lower()
+        if not host or site_of(host) == self.site:
+            return None
+        if _listed(host, BLOCKLIST):
+            return "blocklist"
+        if _listed(host, ALLOWLIST) or _is_main_document(request):
+            return None
+        if self.policy == POLICY_ALL:
+            return "third_party"
+        if self.policy == POLICY_SCRIPTS and request.resource_type in THIRD_PARTY_ACTIVE_TYPES:
+            return "third_party"
+        return None
+
+    async def attach(self, page):
+        """Start filtering the page's requests"""
+        if not BROWSER_DISK_CACHE_ENABLED:
+            await page.route("**/*", self.handle)
+            return
+
+        patterns = EXTENSION_PATTERNS if self.allow_third_party else EXTENSION_PATTERNS + BLOCKLIST_PATTERNS
+        session = await page.context.new_cdp_session(page)
+        session.on("Network.requestWillBeSent", self._on_request)
+        session.on("Network.responseReceived", self._on_response)
+        session.on("Network.loadingFailed", self._on_failed)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": patterns})
+
+    def _on_request(self, params):
+        self.requests += 1
+        self._urls[params["requestId"]] = params.get("request", {}).get("url", "")
+
+    def _on_response(self, params):
+        self._urls.pop(params["requestId"], None)
+        record_response(params.get("response", {}))
+
+    def _on_failed(self, params):
+        url = self._urls.pop(params["requestId"], "")
+        if not params.get("blockedReason"):
+            return
+        if params.get("type", "").lower() in BLOCKED_RESOURCE_TYPES:
+            reason = "resource_type"
+        else:
+            reason = "blocklist"
+            with _stats_lock:
+                _stats["blocked_domains"][urlsplit(url).hostname] += 1
+        self.blocked[reason] += 1
+        self._page_blocked += 1
+
+    async def handle(self, route):
+        request = route.request
+        self.requests += 1
+        reason = self._reason(request)
+        if reason is None:
+            await route.continue_()
+            return
+
+        self.blocked[reason] += 1
+        self._page_blocked += 1
+        if reason != "resource_type":
+            with _stats_lock:
+                _stats["blocked_domains"][urlsplit(request.url).hostname] += 1
+        await route.abort()
+
+    def take_page_count(self) -> int:
+        """
+        Requests blocked since the last call, i.e. for the page just loaded
+        when one handler serves several navigations. Also records the page
+        in the process-wide stats.
+        """
+        count, self._page_blocked = self._page_blocked, 0
+        with _stats_lock:
+            _stats["pages"] += 1
+            _stats["requests"] += self.requests
+            _stats["blocked"].update(self.blocked)
+        self.requests = 0
+        self.blocked = Counter()
+        return count
+
+
+def get_blocking_stats():
+    """Blocked requests by reason and the most blocked third-party domains"""
+    with _stats_lock:
+        pages = _stats["pages"]
+        blocked = dict(_stats["blocked"])
+        top_domains = _stats["blocked_domains"].most_common(20)
+        requests = _stats["requests"]
+    total = sum(blocked.values())
+    return {
+        "policy": THIRD_PARTY_POLICY,
+        "pages": pages,
+        "requests": requests,
+        "blocked": total,
+        "blocked_per_page": round(total / pages, 1) if pages else 0.0,
+        "blocked_by_reason": blocked,
+        "top_blocked_domains": dict(top_domains),
+    }
@@ -0,0 +1,139 @@
+# backend/utils/robots.py
+
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from backend.core.config import ROBOTS_ENABLED, ROBOTS_CACHE_TTL, ROBOTS_ERROR_TTL, ROBOTS_USER_AGENT
+from backend.utils.http_client import get_http_client
+from backend.utils.rate_limiter import rate_limiter
+
+
+class RobotsDisallowedError(Exception):
+    """Raised when robots.txt forbids fetching a URL"""
+
+
+class _RobotsEntry:
+    def __init__(self, parser, expires_at):
+        self.parser = parser
+        self.expires_at = expires_at
+
+
+class RobotsCache:
+    """
+    Per-host robots.txt cache shared by the crawler, scheduler and reminder
+    checks. Each host's file is fetched and parsed once per TTL; its
+    Crawl-delay is pushed into the shared rate limiter.
+
+    A missing robots.txt (4xx) allows everything. Network errors and 5xx
+    also allow everything, but are only cached for ROBOTS_ERROR_TTL so the
+    file is retried soon.
+    """
+
+    def __init__(self, ttl=ROBOTS_CACHE_TTL, error_ttl=ROBOTS_ERROR_TTL,
+                 user_agent=ROBOTS_USER_AGENT, enabled=ROBOTS_ENABLED):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self.enabled = enabled
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._host_locks = {}
+        self._stats = {"fetches": 0, "hits": 0, "disallowed": 0}
+
+    def _origin(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc.lower()}"
+
+    def _fetch(self, origin: str) -> _RobotsEntry:
+        robots_url = f"{origin}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        ttl = self.ttl
+
+        rate_limiter.acquire(robots_url)
+        try:
+            response = get_http_client().get(robots_url)
+            if response.status_code >= 500:
+                parser.parse([])
+                ttl = self.error_ttl
+            elif response.status_code >= 400:
+                parser.parse([])
+            else:
+                parser.parse(response.text.splitlines())
+        except httpx.HTTPError as e:
+            print(f"⚠️ Could not fetch {robots_url}: {e}")
+            parser.parse([])
+            ttl = self.error_ttl
+
+        with self._lock:
+            self._stats["fetches"] += 1
+
+        # Feed Crawl-delay into the per-host politeness limiter
+        rate_limiter.set_crawl_delay(urlsplit(origin).netloc, parser.crawl_delay(self.user_agent))
+
+        return _RobotsEntry(parser, time.monotonic() + ttl)
+
+    def _get(self, url: str) -> _RobotsEntry:
+        origin = self._origin(url)
+
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry and entry.expires_at > time.monotonic():
+                self._stats["hits"] += 1
+                return entry
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+
+        # One fetch per host at a time; other callers wait and reuse it
+        with host_lock:
+            with self._lock:
+                entry = self._entries.get(origin)
+                if entry and entry.expires_at > time.monotonic():
+                    return entry
+
+            entry = self._fetch(origin)
+            with self._lock:
+                self._entries[origin] = entry
+            return entry
+
+    def is_allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch `url`"""
+        if not self.enabled:
+            return True
+
+        allowed = self._get(url).parser.can_fetch(self.user_agent, url)
+        if not allowed:
+            with self._lock:
+                self._stats["disallowed"] += 1
+        return allowed
+
+    def check(self, url: str):
+        """Raise RobotsDisallowedError if robots.txt forbids `url`"""
+        if not self.is_allowed(url):
+            raise RobotsDisallowedError(f"Blocked by robots.txt: {url}")
+
+    def crawl_delay(self, url: str):
+        """Crawl-delay for the URL's host, or None"""
+        if not self.enabled:
+            return None
+        return self._get(url).parser.crawl_delay(self.user_agent)
+
+    def sitemaps(self, url: str):
+        """Sitemap URLs listed in the host's robots.txt"""
+        if not self.enabled:
+            return []
+        return self._get(url).parser.site_maps() or []
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "cached_hosts": len(self._entries),
+                **self._stats,
+            }
+
+
+# Process-wide cache
+robots_cache = RobotsCache()
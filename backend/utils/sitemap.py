@@ -0,0 +1,140 @@
+# backend/utils/sitemap.py
+
+import zlib
+from datetime import datetime
+from urllib.parse import urlsplit, urljoin
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+import httpx
+
+from backend.core.config import SITEMAP_MAX_DEPTH
+from backend.utils.http_client import get_http_client
+from backend.utils.rate_limiter import rate_limiter
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _local_name(tag: str) -> str:
+    """'{http://www.sitemaps.org/schemas/sitemap/0.9}loc' -> 'loc'"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_lastmod(value: str):
+    """
+    W3C datetime from <lastmod> as a naive local datetime (the format
+    last_crawled / last_scraped are stored in), or None if unparseable.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def default_sitemap_urls(start_url: str):
+    """Conventional sitemap locations for a site"""
+    parts = urlsplit(start_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    return [urljoin(origin, "/sitemap.xml"), urljoin(origin, "/sitemap_index.xml")]
+
+
+def _stream_entries(sitemap_url: str):
+    """
+    Stream one sitemap document, yielding ('url', loc, lastmod) and
+    ('sitemap', loc, lastmod) entries as they are parsed. Gzipped bodies
+    are inflated chunk by chunk; parsed elements are cleared right away
+    so memory stays flat on sitemaps with 50k entries.
+    """
+    parser = XMLPullParser(events=("end",))
+    inflater = None
+    first_chunk = True
+
+    rate_limiter.acquire(sitemap_url)
+    with get_http_client().stream("GET", sitemap_url) as response:
+        if response.status_code >= 400:
+            return
+
+        for chunk in response.iter_bytes():
+            if first_chunk:
+                first_chunk = False
+                # .xml.gz files are served raw, not as Content-Encoding: gzip
+                if chunk.startswith(GZIP_MAGIC):
+                    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+            parser.feed(inflater.decompress(chunk) if inflater else chunk)
+            yield from _drain(parser)
+
+        if inflater:
+            parser.feed(inflater.flush())
+        parser.close()
+        yield from _drain(parser)
+
+
+def _drain(parser):
+    for _, element in parser.read_events():
+        kind = _local_name(element.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+
+        loc = lastmod = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = parse_lastmod(child.text)
+
+        element.clear()
+        if loc:
+            yield kind, loc, lastmod
+
+
+def iter_sitemap_urls(sitemap_urls, since: datetime = None, max_depth: int = SITEMAP_MAX_DEPTH,
+                      stats: dict = None):
+    """
+    Yield page URLs from sitemaps and sitemap indexes.
+
+    Pages (and whole child sitemaps) whose <lastmod> is not newer than
+    `since` are skipped. Entries without <lastmod> are always yielded.
+    If given, `stats` is filled with 'sitemaps', 'urls' and
+    'skipped_unchanged' counters.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("sitemaps", 0)
+    stats.setdefault("urls", 0)
+    stats.setdefault("skipped_unchanged", 0)
+
+    pending = [(url, 0) for url in sitemap_urls]
+    seen = set()
+
+    while pending:
+        sitemap_url, depth = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+
+        try:
+            found = False
+            for kind, loc, lastmod in _stream_entries(sitemap_url):
+                found = True
+                if since and lastmod and lastmod <= since:
+                    stats["skipped_unchanged"] += 1
+                    continue
+
+                if kind == "sitemap":
+                    if depth < max_depth:
+                        pending.append((loc, depth + 1))
+                    continue
+
+                stats["urls"] += 1
+                yield loc
+
+            if found:
+                stats["sitemaps"] += 1
+        except (httpx.HTTPError, ParseError, zlib.error) as e:
+            print(f"⚠️ Could not read sitemap {sitemap_url}: {e}")
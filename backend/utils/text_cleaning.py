@@ -0,0 +1,111 @@
+# backend/utils/text_cleaning.py
+
+import re
+from functools import lru_cache
+
+# Only skip VERY obvious noise
+DEFAULT_NOISE_PATTERNS = (
+    "skip to content",
+    "skip to main",
+    "accept cookies",
+    "cookie policy",
+)
+
+
+class NoiseFilter:
+    """
+    Line cleaner behind clean_text_minimal: strips lines, drops empty ones,
+    drops lines containing any noise pattern (case-insensitive substring)
+    and collapses consecutive duplicates.
+
+    All patterns are compiled into one regex alternation, so whole strings
+    are scanned for noise in a single pass however many rules there are.
+    """
+
+    def __init__(self, extra_patterns=()):
+        patterns = []
+        for pattern in (*DEFAULT_NOISE_PATTERNS, *extra_patterns):
+            pattern = pattern.strip().lower()
+            # A pattern spanning lines could never match a single line
+            if pattern and "\n" not in pattern and pattern not in patterns:
+                patterns.append(pattern)
+        self.patterns = tuple(patterns)
+        self._noise = re.compile("|".join(re.escape(p) for p in self.patterns))
+
+    def clean_lines(self, lines, prev: str = ""):
+        """
+        Stream version: yields the kept lines of an iterable of lines.
+        `prev` is the last line kept before this stream, if any.
+        """
+        search = self._noise.search
+        for line in lines:
+            line = line.strip()
+
+            # Skip empty lines
+            if not line:
+                continue
+
+            # Skip obvious noise (case-insensitive substring)
+            if search(line.lower()):
+                continue
+
+            # Skip duplicate consecutive lines
+            if line == prev:
+                continue
+
+            yield line
+            prev = line
+
+    def clean_stream(self, chunks):
+        """
+        Clean text arriving in arbitrary pieces (lines may span chunks).
+        "\\n".join(clean_stream(chunks)) == clean("".join(chunks))
+        """
+        def lines():
+            partial = ""
+            for chunk in chunks:
+                parts = (partial + chunk).split("\n")
+                partial = parts.pop()
+                yield from parts
+            yield partial
+
+        return self.clean_lines(lines())
+
+    def clean(self, text: str) -> str:
+        if not text:
+            return ""
+
+        # Find noisy lines with one scan of the whole lowercased text.
+        # lower() never adds or removes newlines, so line numbers match.
+        lowered = text.lower()
+        noisy = set()
+        line_no, pos = 0, 0
+        for match in self._noise.finditer(lowered):
+            line_no += lowered.count("\n", pos, match.start())
+            pos = match.start()
+            noisy.add(line_no)
+
+        cleaned = []
+        prev = ""
+        for i, line in enumerate(text.split("\n")):
+            line = line.strip()
+            if not line or i in noisy or line == prev:
+                continue
+            cleaned.append(line)
+            prev = line
+        return "\n".join(cleaned)
+
+
+DEFAULT_NOISE_FILTER = NoiseFilter()
+
+
+@lru_cache(maxsize=128)
+def _filter_for(patterns: tuple) -> NoiseFilter:
+    return NoiseFilter(patterns)
+
+
+def noise_filter_for(extra_patterns=None) -> NoiseFilter:
+    """Default rules plus an agent's own patterns, compiled once per pattern set"""
+    if not extra_patterns:
+        return DEFAULT_NOISE_FILTER
+    return _filter_for(tuple(extra_patterns))